@@ -50,12 +50,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'front.middleware.StaticFilesMiddleware',
+    'front.middleware.MetricsMiddleware',
+    'front.middleware.InstrumentationMiddleware',
+    'front.middleware.QueryLogMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Oxirida turishi kerak - boshqa process_view lardan keyin view ni o'zi chaqiradi
+    'front.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -129,10 +135,54 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# collectstatic: minifikatsiya, xeshli nomlar, .gz/.br nusxalar (front/staticfiles.py)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'front.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
 # Media files (User uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache
+# Barcha workerlar bitta keshni ko'rishi kerak (versiyalangan kalitlar shunga tayanadi).
+# Redis/Memcached bo'lmasa fayl keshi bitta serverda yetarli.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'TIMEOUT': 3600,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Kesh versiyalari (front.cache): bir necha o'nta kalit, hech qachon tozalanmasin (cull)
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'versions',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+    },
+}
+
+# So'rovlarni o'lchash (front.instrumentation): Server-Timing va admin dagi "Unumdorlik".
+# Production da so'rovlarning 1% i o'lchanadi - qo'shimcha yuk sezilmaydi.
+INSTRUMENTATION_SAMPLE_RATE = 1.0 if DEBUG else 0.01
+
+# Sekin so'rovlar jurnali (front.querylog): SQL barmoq izlari, N+1, var/log/queries-<pid>.log
+QUERY_LOG_SLOW_MS = 100
+QUERY_LOG_N_PLUS_ONE = 10
+
+# Profilash (front.profiling): {'news_list': 100} - har 100-chi so'rov, var/profiles
+PROFILE_SAMPLE = {}
+
+# Prometheus (/metrics, front.metrics): workerlar var/metrics orqali yig'iladi.
+# Skreyp METRICS_TOKEN bilan (Authorization: Bearer ...) - token bo'sh bo'lsa /metrics yopiq.
+# METRICS_ALLOWED_IPS ni faqat Django to'g'ridan-to'g'ri tinglaganda to'ldiring: nginx
+# bir xostda turganda (MEDIA_ACCEL='x-accel-redirect' rejimi) REMOTE_ADDR har doim 127.0.0.1 -
+# loopback ruxsati /metrics ni hammaga ochib qo'yadi.
+METRICS_TOKEN = ''
+METRICS_ALLOWED_IPS = ()
+
 # ═══════════════════════════════════════════════════════════════
 # UNFOLD CONFIGURATION
 # ═══════════════════════════════════════════════════════════════
@@ -232,6 +282,10 @@ UNFOLD = {
                 "items": [
                     {"title": "Foydalanuvchilar", "icon": "person", "link": reverse_lazy("admin:front_user_changelist")},
                     {"title": "Guruhlar", "icon": "groups", "link": reverse_lazy("admin:auth_group_changelist")},
+                    {"title": "Fon vazifalari", "icon": "pending_actions", "link": reverse_lazy("admin:front_task_changelist")},
+                    {"title": "Unumdorlik", "icon": "speed", "link": reverse_lazy("admin:front_performance")},
+                    {"title": "Sekin so'rovlar", "icon": "database", "link": reverse_lazy("admin:front_query_log")},
+                    {"title": "Profilash", "icon": "local_fire_department", "link": reverse_lazy("admin:front_profiles")},
                 ],
             },
         ],
@@ -17,13 +17,14 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import include
 
+from front import media, metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # DEBUG dan tashqarida ham: Range, ETag, X-Accel-Redirect, yopiq fayllarga ruxsat
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", media.serve, name='media'),
+    path('metrics', metrics.view, name='metrics'),
     path('', include('front.urls')),
-]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
\ No newline at end of file
@@ -3,49 +3,98 @@ PolyglotLC Admin Panel
 Django Unfold Theme - Professional & Complete
 """
 
+from collections import Counter
+from datetime import datetime
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import PermissionDenied
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseRedirect
+from django.urls import Resolver404, path, resolve, reverse
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Count
+from django.views import View
+from django.views.generic import TemplateView
 
 from unfold.admin import ModelAdmin, TabularInline
 from unfold.contrib.filters.admin import (
     RangeDateFilter, RangeDateTimeFilter, RangeNumericFilter,
 )
 from unfold.decorators import display, action
+from unfold.views import UnfoldModelAdminViewMixin
 
 from import_export.admin import ImportExportModelAdmin
 from import_export import resources, fields
+from import_export.signals import post_export
 
+from . import exports, instrumentation, jobs, page_cache, profiling, querylog, sequences
+from .bulk_import import BulkModelResource, CachedForeignKeyWidget, slug_key
+from .tasks import stage_upload
+from .utils import invalidate_badge_counts
 from .models import (
     User, Subject, Teacher, Course, CourseEnrollment,
     Certificate, News, NewsGalleryImage, GalleryCategory, Gallery,
-    Contact, TeacherApplication, Testimonial, FAQCategory, FAQ, SiteSettings
+    Contact, TeacherApplication, Testimonial, FAQCategory, FAQ, SiteSettings, Task
 )
 
 
+def bulk_updated(queryset):
+    """queryset.update() signal yubormaydi - sahifa/fragment keshi va badge lar qo'lda eskirtiriladi"""
+    label = queryset.model._meta.label_lower
+
+    def invalidate():
+        page_cache.invalidate(label)
+        invalidate_badge_counts()
+    transaction.on_commit(invalidate)
+
+
 # ══════════════════════════════════════════════════════════════════
 #                    IMPORT/EXPORT RESOURCES
 # ══════════════════════════════════════════════════════════════════
 
-class TeacherResource(resources.ModelResource):
+class TeacherResource(BulkModelResource):
+    natural_key = slug_key('first_name', 'last_name')
+    
     class Meta:
         model = Teacher
-        fields = ('id', 'first_name', 'last_name', 'phone', 'email', 
+        fields = ('id', 'slug', 'first_name', 'last_name', 'phone', 'email', 
                   'education', 'ielts_score', 'experience_years', 'is_active')
+        import_id_fields = ('slug',)
 
-class CourseResource(resources.ModelResource):
+class CourseResource(BulkModelResource):
+    subject__name = fields.Field(attribute='subject', column_name='subject__name',
+                                 widget=CachedForeignKeyWidget(Subject, 'name'))
+    natural_key = slug_key('title')
+    
     class Meta:
         model = Course
-        fields = ('id', 'title', 'subject__name', 'level', 'price', 
+        fields = ('id', 'slug', 'title', 'subject__name', 'level', 'price', 
                   'discount_price', 'duration_months', 'is_active', 'is_featured')
+        import_id_fields = ('slug',)
 
-class CertificateResource(resources.ModelResource):
+class CertificateResource(BulkModelResource):
+    course__title = fields.Field(attribute='course', column_name='course__title',
+                                 widget=CachedForeignKeyWidget(Course, 'title'))
+    
     class Meta:
         model = Certificate
         fields = ('id', 'certificate_number', 'student_name', 'course__title',
                   'teacher__first_name', 'score', 'issue_date')
+        import_id_fields = ('certificate_number',)
+
+    def natural_keys(self, rows):
+        """Raqamsiz sertifikatlar: har yil uchun bitta tranzaksiyada blok band qilinadi"""
+        today = timezone.localdate()
+        issue_date = self.fields['issue_date']
+        years = [((issue_date.clean(row) if row.get(issue_date.column_name) else None) or today).year
+                 for row in rows]
+        blocks = {year: iter(sequences.reserve_numbers(count, year)) for year, count in Counter(years).items()}
+        return [next(blocks[year]) for year in years]
 
 class CourseEnrollmentResource(resources.ModelResource):
     class Meta:
@@ -53,6 +102,61 @@ class CourseEnrollmentResource(resources.ModelResource):
         fields = ('id', 'full_name', 'phone', 'email', 'course__title', 'status', 'created_at')
 
 
+class BackgroundImportMixin:
+    """Tasdiqlangan import fon vazifasiga beriladi (jobs.import_file) - katta fayl admin so'rovini band qilmaydi"""
+    
+    def process_import(self, request, **kwargs):
+        if not self.has_import_permission(request):
+            raise PermissionDenied
+        confirm_form = self.create_confirm_form(request)
+        if not confirm_form.is_valid():
+            return super().process_import(request, **kwargs)
+        
+        format_index = int(confirm_form.cleaned_data['format'])
+        input_format = self.get_import_formats()[format_index](encoding=self.from_encoding)
+        tmp_storage = self.get_tmp_storage_class()(
+            name=confirm_form.cleaned_data['import_file_name'],
+            encoding=None if input_format.is_binary() else self.from_encoding,
+            read_mode=input_format.get_read_mode(),
+            **self.get_tmp_storage_class_kwargs(),
+        )
+        data = tmp_storage.read()
+        tmp_storage.remove()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        file_name = confirm_form.cleaned_data.get('original_file_name') or 'import'
+        staged, _ = stage_upload(ContentFile(data, name=file_name))
+        jobs.import_file.delay(self.model._meta.label_lower, staged, format_index,
+                               self.get_resource_index(confirm_form), file_name, request.user.pk)
+        self.message_user(request, f'{file_name} importi navbatga qo\'yildi - natija "Fon vazifalari" bo\'limida.')
+        opts = self.model._meta
+        return HttpResponseRedirect(reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist',
+                                            current_app=self.admin_site.name))
+
+
+class StreamingExportMixin:
+    """CSV/JSON/XLSX eksporti front.exports orqali oqim bilan - qatorlar xotirada yig'ilmaydi"""
+    
+    def _do_file_export(self, file_format, request, queryset, export_form=None):
+        kind = exports.streaming_kind(file_format)
+        if kind is None:
+            return super()._do_file_export(file_format, request, queryset, export_form=export_form)
+        if not self.has_export_permission(request):
+            raise PermissionDenied
+        
+        resource_class = self.choose_export_resource_class(export_form, request)
+        resource = resource_class(**self.get_export_resource_kwargs(request, export_form=export_form))
+        response = exports.response(
+            kind, resource, queryset,
+            filename=self.get_export_filename(request, queryset, file_format),
+            selected_fields=self.get_export_resource_fields_from_form(export_form),
+            encoding=self.to_encoding or 'utf-8',
+        )
+        post_export.send(sender=None, model=self.model)
+        return response
+
+
 # ══════════════════════════════════════════════════════════════════
 #                         USER ADMIN
 # ══════════════════════════════════════════════════════════════════
@@ -134,14 +238,14 @@ class SubjectAdmin(ModelAdmin):
             return format_html('<i class="{}" style="font-size:24px;color:#3b82f6;"></i>', obj.icon)
         return "📚"
     
-    @display(description="Kurslar")
+    @display(description="Kurslar", ordering='active_courses_count')
     def courses_count(self, obj):
-        count = obj.courses.filter(is_active=True).count()
+        count = obj.active_courses_count
         return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">{}</span>', count)
     
-    @display(description="O'qituvchilar")
+    @display(description="O'qituvchilar", ordering='active_teachers_count')
     def teachers_count(self, obj):
-        count = obj.teachers.filter(is_active=True).count()
+        count = obj.active_teachers_count
         return format_html('<span style="background:#f0fdf4;color:#166534;padding:4px 12px;border-radius:20px;">{}</span>', count)
 
 
@@ -150,7 +254,7 @@ class SubjectAdmin(ModelAdmin):
 # ══════════════════════════════════════════════════════════════════
 
 @admin.register(Teacher)
-class TeacherAdmin(ModelAdmin, ImportExportModelAdmin):
+class TeacherAdmin(BackgroundImportMixin, StreamingExportMixin, ModelAdmin, ImportExportModelAdmin):
     resource_class = TeacherResource
     
     list_display = ('photo_display', 'full_name', 'phone', 'email_display', 'scores_display', 
@@ -198,9 +302,9 @@ class TeacherAdmin(ModelAdmin, ImportExportModelAdmin):
         c = '#10b981' if obj.experience_years >= 5 else '#f59e0b' if obj.experience_years >= 3 else '#6b7280'
         return format_html('<span style="background:{}20;color:{};padding:4px 10px;border-radius:20px;font-size:12px;">{} yil</span>', c, c, obj.experience_years)
     
-    @display(description="Kurslar")
+    @display(description="Kurslar", ordering='active_courses_count')
     def courses_count(self, obj):
-        return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">📚 {}</span>', obj.courses.filter(is_active=True).count())
+        return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">📚 {}</span>', obj.active_courses_count)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -208,7 +312,7 @@ class TeacherAdmin(ModelAdmin, ImportExportModelAdmin):
 # ══════════════════════════════════════════════════════════════════
 
 @admin.register(Course)
-class CourseAdmin(ModelAdmin, ImportExportModelAdmin):
+class CourseAdmin(BackgroundImportMixin, StreamingExportMixin, ModelAdmin, ImportExportModelAdmin):
     resource_class = CourseResource
     
     list_display = ('image_display', 'title', 'subject_badge', 'level_badge', 'price_display', 
@@ -225,7 +329,7 @@ class CourseAdmin(ModelAdmin, ImportExportModelAdmin):
     
     fieldsets = (
         ('📚 Asosiy', {'fields': ('title', 'slug', 'subject')}),
-        ('🖼️ Rasmlar', {'fields': ('main_image', 'thumbnail')}),
+        ('🖼️ Rasmlar', {'fields': ('main_image', 'thumbnail', 'certificate_template')}),
         ('📝 Tavsif', {'fields': ('short_description', 'full_description')}),
         ('⚙️ Parametrlar', {'fields': (('level', 'duration_months'), ('lessons_per_week', 'lesson_duration'), 'start_date')}),
         ('💰 Narx', {'fields': (('price', 'discount_price'),)}),
@@ -235,6 +339,9 @@ class CourseAdmin(ModelAdmin, ImportExportModelAdmin):
         ('📊 Statistika', {'fields': (('views_count', 'enrollments_count'), ('created_at', 'updated_at')), 'classes': ('collapse',)}),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('subject')
+    
     @display(description="")
     def image_display(self, obj):
         if obj.main_image:
@@ -272,7 +379,7 @@ class CourseAdmin(ModelAdmin, ImportExportModelAdmin):
 # ══════════════════════════════════════════════════════════════════
 
 @admin.register(CourseEnrollment)
-class CourseEnrollmentAdmin(ModelAdmin, ImportExportModelAdmin):
+class CourseEnrollmentAdmin(BackgroundImportMixin, StreamingExportMixin, ModelAdmin, ImportExportModelAdmin):
     resource_class = CourseEnrollmentResource
     
     list_display = ('id_display', 'full_name', 'phone_display', 'course_display', 'status_badge', 'created_at_display')
@@ -292,6 +399,9 @@ class CourseEnrollmentAdmin(ModelAdmin, ImportExportModelAdmin):
     
     actions = ['mark_contacted', 'mark_enrolled', 'mark_rejected']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('course')
+    
     @display(description="ID")
     def id_display(self, obj):
         return format_html('<span style="background:#f1f5f9;padding:4px 10px;border-radius:8px;font-family:monospace;">#{}</span>', obj.id)
@@ -325,14 +435,17 @@ class CourseEnrollmentAdmin(ModelAdmin, ImportExportModelAdmin):
     @action(description="📞 Aloqaga chiqildi")
     def mark_contacted(self, request, queryset):
         queryset.update(status='contacted')
+        bulk_updated(queryset)
     
     @action(description="✅ Yozildi")
     def mark_enrolled(self, request, queryset):
         queryset.update(status='enrolled')
+        bulk_updated(queryset)
     
     @action(description="❌ Rad etish")
     def mark_rejected(self, request, queryset):
         queryset.update(status='rejected')
+        bulk_updated(queryset)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -340,7 +453,7 @@ class CourseEnrollmentAdmin(ModelAdmin, ImportExportModelAdmin):
 # ══════════════════════════════════════════════════════════════════
 
 @admin.register(Certificate)
-class CertificateAdmin(ModelAdmin, ImportExportModelAdmin):
+class CertificateAdmin(BackgroundImportMixin, StreamingExportMixin, ModelAdmin, ImportExportModelAdmin):
     resource_class = CertificateResource
     
     list_display = ('cert_preview', 'certificate_number', 'student_name', 'course_display', 
@@ -350,6 +463,7 @@ class CertificateAdmin(ModelAdmin, ImportExportModelAdmin):
     list_editable = ('is_featured',)
     ordering = ('-is_featured', 'order', '-issue_date')
     date_hierarchy = 'issue_date'
+    actions = ['render_images']
     
     fieldsets = (
         ('👤 Talaba', {'fields': ('student_name', 'student_photo')}),
@@ -359,6 +473,9 @@ class CertificateAdmin(ModelAdmin, ImportExportModelAdmin):
         ('⚙️ Sozlamalar', {'fields': (('is_featured', 'order'),)}),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('course', 'teacher')
+    
     @display(description="")
     def cert_preview(self, obj):
         if obj.certificate_image:
@@ -378,6 +495,13 @@ class CertificateAdmin(ModelAdmin, ImportExportModelAdmin):
         if obj.score:
             return format_html('<span style="background:#10b98120;color:#10b981;padding:4px 12px;border-radius:20px;font-weight:700;">{}</span>', obj.score)
         return "—"
+    
+    @action(description="🖨️ Sertifikat rasmini yaratish")
+    def render_images(self, request, queryset):
+        ids = list(queryset.values_list('pk', flat=True))
+        if ids:
+            jobs.render_certificates.delay(ids, base_url=request.build_absolute_uri('/'))
+        self.message_user(request, f'{len(ids)} ta sertifikat rasmi navbatga qo\'yildi.')
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -424,6 +548,9 @@ class NewsAdmin(ModelAdmin):
             return format_html('<img src="{}" style="width:80px;height:50px;border-radius:8px;object-fit:cover;"/>', obj.main_image.url)
         return "📷"
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+    
     @display(description="Muallif")
     def author_display(self, obj):
         return obj.author.get_full_name() if obj.author else "—"
@@ -439,9 +566,9 @@ class GalleryCategoryAdmin(ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
     list_editable = ('order',)
     
-    @display(description="Rasmlar")
+    @display(description="Rasmlar", ordering='images_count')
     def images_count(self, obj):
-        return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">{}</span>', obj.images.count())
+        return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">{}</span>', obj.images_count)
 
 
 @admin.register(Gallery)
@@ -457,6 +584,9 @@ class GalleryAdmin(ModelAdmin):
         ('⚙️ Sozlamalar', {'fields': (('is_featured', 'order'),)}),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('category')
+    
     @display(description="")
     def image_preview(self, obj):
         if obj.image:
@@ -522,10 +652,12 @@ class ContactAdmin(ModelAdmin):
     @action(description="📖 O'qilgan deb belgilash")
     def mark_as_read(self, request, queryset):
         queryset.update(is_read=True)
+        bulk_updated(queryset)
     
     @action(description="✅ Tugallangan deb belgilash")
     def mark_completed(self, request, queryset):
         queryset.update(status='completed', is_read=True)
+        bulk_updated(queryset)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -553,6 +685,9 @@ class TeacherApplicationAdmin(ModelAdmin):
     
     actions = ['mark_reviewed', 'mark_accepted', 'mark_rejected', 'create_teacher']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('subject')
+    
     @display(description="")
     def photo_display(self, obj):
         if obj.photo:
@@ -587,29 +722,24 @@ class TeacherApplicationAdmin(ModelAdmin):
     @action(description="🔍 Ko'rildi")
     def mark_reviewed(self, request, queryset):
         queryset.update(status='reviewed', reviewed_at=timezone.now())
+        bulk_updated(queryset)
     
     @action(description="✅ Qabul qilish")
     def mark_accepted(self, request, queryset):
         queryset.update(status='accepted', reviewed_at=timezone.now())
+        bulk_updated(queryset)
     
     @action(description="❌ Rad etish")
     def mark_rejected(self, request, queryset):
         queryset.update(status='rejected', reviewed_at=timezone.now())
+        bulk_updated(queryset)
     
     @action(description="👨‍🏫 O'qituvchi yaratish")
     def create_teacher(self, request, queryset):
-        created = 0
-        for app in queryset.filter(status='accepted'):
-            teacher, is_new = Teacher.objects.get_or_create(
-                first_name=app.first_name, last_name=app.last_name,
-                defaults={'phone': app.phone, 'email': app.email, 'education': app.education,
-                         'experience_years': app.experience_years, 'bio': app.about_me[:500],
-                         'full_bio': app.about_me + '\n\n' + app.why_teach, 'photo': app.photo}
-            )
-            if is_new and app.subject:
-                teacher.specializations.add(app.subject)
-                created += 1
-        self.message_user(request, f'{created} ta o\'qituvchi yaratildi.')
+        ids = list(queryset.filter(status='accepted').values_list('pk', flat=True))
+        if ids:
+            jobs.create_teachers_from_applications.delay(ids)
+        self.message_user(request, f'{len(ids)} ta ariza bo\'yicha o\'qituvchi yaratish navbatga qo\'yildi.')
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -634,6 +764,9 @@ class TestimonialAdmin(ModelAdmin):
     
     actions = ['approve', 'unapprove']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('course')
+    
     @display(description="")
     def photo_display(self, obj):
         if obj.student_photo:
@@ -657,10 +790,12 @@ class TestimonialAdmin(ModelAdmin):
     @action(description="✅ Tasdiqlash")
     def approve(self, request, queryset):
         queryset.update(is_approved=True)
+        bulk_updated(queryset)
     
     @action(description="❌ Bekor qilish")
     def unapprove(self, request, queryset):
         queryset.update(is_approved=False)
+        bulk_updated(queryset)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -672,9 +807,9 @@ class FAQCategoryAdmin(ModelAdmin):
     list_display = ('name', 'faqs_count', 'order')
     list_editable = ('order',)
     
-    @display(description="Savollar")
+    @display(description="Savollar", ordering='active_faqs_count')
     def faqs_count(self, obj):
-        return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">{}</span>', obj.faqs.filter(is_active=True).count())
+        return format_html('<span style="background:#dbeafe;color:#1d4ed8;padding:4px 12px;border-radius:20px;">{}</span>', obj.active_faqs_count)
 
 
 @admin.register(FAQ)
@@ -691,6 +826,9 @@ class FAQAdmin(ModelAdmin):
         ('⚙️ Status', {'fields': ('is_active',)}),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('category')
+    
     @display(description="Savol")
     def question_display(self, obj):
         return obj.question[:80] + '...' if len(obj.question) > 80 else obj.question
@@ -702,6 +840,221 @@ class FAQAdmin(ModelAdmin):
         return "Umumiy"
 
 
+# ══════════════════════════════════════════════════════════════════
+#                      FON VAZIFALARI
+# ══════════════════════════════════════════════════════════════════
+
+@admin.register(Task)
+class TaskAdmin(ModelAdmin):
+    list_display = ('name', 'status_badge', 'priority', 'attempts_display', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'name', ('created_at', RangeDateTimeFilter))
+    search_fields = ('name', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('name', 'args', 'kwargs', 'status', 'attempts', 'max_attempts', 'last_error',
+                       'locked_by', 'locked_at', 'created_at', 'finished_at')
+    actions = ['retry']
+    
+    fieldsets = (
+        ('⚙️ Vazifa', {'fields': ('name', 'args', 'kwargs', ('priority', 'run_at'))}),
+        ('📊 Holat', {'fields': (('status', 'attempts', 'max_attempts'), ('locked_by', 'locked_at'), ('created_at', 'finished_at'))}),
+        ('❌ Xato', {'fields': ('last_error',), 'classes': ('collapse',)}),
+    )
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @display(description="Status")
+    def status_badge(self, obj):
+        colors = {'queued': ('#6b7280', '⏳'), 'running': ('#3b82f6', '⚙️'), 'done': ('#10b981', '✅'), 'failed': ('#ef4444', '❌')}
+        c, e = colors.get(obj.status, ('#6b7280', '?'))
+        return format_html('<span style="background:{}15;color:{};padding:6px 12px;border-radius:20px;font-size:12px;">{} {}</span>', c, c, e, obj.get_status_display())
+    
+    @display(description="Urinishlar")
+    def attempts_display(self, obj):
+        return f'{obj.attempts}/{obj.max_attempts}'
+    
+    @action(description="🔄 Qayta navbatga")
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None, last_error='',
+        )
+        bulk_updated(queryset)
+        self.message_user(request, f'{updated} ta vazifa qayta navbatga qo\'yildi.')
+    
+    def get_urls(self):
+        # Tizim sahifalari "Fon vazifalari" bo'limiga ulangan
+        return [
+            path('performance/', self.admin_site.admin_view(PerformanceView.as_view(model_admin=self)),
+                 name='front_performance'),
+            path('query-log/', self.admin_site.admin_view(QueryLogView.as_view(model_admin=self)),
+                 name='front_query_log'),
+            path('profiles/', self.admin_site.admin_view(ProfilesView.as_view(model_admin=self)),
+                 name='front_profiles'),
+            path('profiles/<str:profile_id>/', self.admin_site.admin_view(ProfileDetailView.as_view(model_admin=self)),
+                 name='front_profile_detail'),
+            path('profiles/<str:profile_id>/<str:kind>/', self.admin_site.admin_view(ProfileDownloadView.as_view(model_admin=self)),
+                 name='front_profile_download'),
+        ] + super().get_urls()
+
+
+# ══════════════════════════════════════════════════════════════════
+#                    TIZIM SAHIFALARI
+# ══════════════════════════════════════════════════════════════════
+
+class SuperuserViewMixin(UnfoldModelAdminViewMixin):
+    permission_required = ()
+    
+    def has_permission(self):
+        return self.request.user.is_superuser
+
+
+class PerformanceView(SuperuserViewMixin, TemplateView):
+    """front.instrumentation buferi: URL nomi bo'yicha p50/p95/p99 (shu jarayon)"""
+    title = "Unumdorlik"
+    template_name = 'admin/front/performance.html'
+    
+    def post(self, request, *args, **kwargs):
+        instrumentation.reset()
+        return HttpResponseRedirect(request.path)
+    
+    def get_context_data(self, **kwargs):
+        def percentiles(values):
+            return ' / '.join(f'{values[p]:.0f}' for p in ('p50', 'p95', 'p99'))
+        
+        rows = [
+            [row['name'], row['samples'], *(percentiles(row[metric]) for metric in instrumentation.METRICS)]
+            for row in instrumentation.summary()
+        ]
+        return super().get_context_data(**kwargs, sample_rate=instrumentation.SAMPLE_RATE, table={
+            'headers': ['View', 'Namunalar', 'Umumiy, ms', 'View, ms', 'DB, ms', 'SQL soni', 'Shablon, ms'],
+            'rows': rows,
+        })
+
+
+class QueryLogView(SuperuserViewMixin, TemplateView):
+    """front.querylog fayli: eng qimmat SQL izlari, N+1 lar va oxirgi sekin so'rovlar"""
+    title = "Sekin so'rovlar"
+    template_name = 'admin/front/query_log.html'
+    
+    def get_context_data(self, **kwargs):
+        def sql(text):
+            return format_html('<code title="{}">{}</code>', text, Truncator(text).chars(200))
+        
+        querylog.flush()
+        report = querylog.report()
+        fingerprints = {
+            'headers': ['SQL', 'Soni', 'Jami, ms', "O'rtacha, ms", 'Eng katta, ms'],
+            'rows': [[sql(row['fingerprint']), row['count'], f"{row['total']:.0f}", f"{row['avg']:.1f}", f"{row['max']:.1f}"]
+                     for row in report['fingerprints']],
+        }
+        n_plus_one = {
+            'headers': ['SQL', 'View', 'Chaqiruv joyi', "So'rovlar", 'Eng ko\'p takror'],
+            'rows': [[sql(row['fingerprint']), row.get('view') or '—', row.get('site') or '—', row['requests'], row['max_count']]
+                     for row in report['n_plus_one']],
+        }
+        slow = {
+            'headers': ['Vaqt', 'ms', 'SQL', 'View', 'Chaqiruv joyi'],
+            'rows': [[datetime.fromtimestamp(row['time'], tz=timezone.get_current_timezone()).strftime('%d.%m %H:%M:%S'),
+                      row['ms'], sql(row['fingerprint']), row.get('view') or '—', row.get('site') or '—']
+                     for row in report['slow']],
+        }
+        return super().get_context_data(**kwargs, fingerprints=fingerprints, n_plus_one=n_plus_one, slow=slow,
+                                        slow_ms=querylog.SLOW_MS, n_plus_one_threshold=querylog.N_PLUS_ONE)
+
+
+class ProfilesView(SuperuserViewMixin, TemplateView):
+    """front.profiling: imzoli havola, 1-in-N nishonlar va yozilgan profillar"""
+    title = "Profilash"
+    template_name = 'admin/front/profiles.html'
+    
+    def post(self, request, *args, **kwargs):
+        action_name = request.POST.get('action')
+        if action_name == 'token':
+            url = request.POST.get('url', '').strip()
+            try:
+                match = resolve(url.split('?')[0])
+            except Resolver404:
+                self.model_admin.message_user(request, f'{url} - bunday sahifa yo\'q.', level='error')
+            else:
+                separator = '&' if '?' in url else '?'
+                link = f'{url}{separator}{profiling.PARAM}={profiling.make_token(match.view_name)}'
+                self.model_admin.message_user(request, format_html(
+                    'Havola ({} daqiqa amal qiladi): <a href="{}" target="_blank">{}</a>',
+                    profiling.TOKEN_MAX_AGE // 60, link, link))
+        elif action_name == 'target':
+            view_name = request.POST.get('view_name', '').strip()
+            try:
+                every = max(1, int(request.POST.get('every') or 100))
+                minutes = max(1, int(request.POST.get('minutes') or 60))
+            except ValueError:
+                self.model_admin.message_user(request, 'N va daqiqa butun son bo\'lishi kerak.', level='error')
+            else:
+                profiling.set_target(view_name, every, minutes)
+                self.model_admin.message_user(request, f'{view_name}: har {every}-chi so\'rov, {minutes} daqiqa.')
+        elif action_name == 'remove':
+            profiling.remove_target(request.POST.get('view_name', ''))
+        return HttpResponseRedirect(request.path)
+    
+    def get_context_data(self, **kwargs):
+        rows = []
+        for meta in profiling.list_profiles():
+            detail = reverse('admin:front_profile_detail', args=[meta['id']])
+            rows.append([
+                format_html('<a href="{}" class="text-primary-600">{}</a>', detail,
+                            datetime.fromtimestamp(meta['time'], tz=timezone.get_current_timezone()).strftime('%d.%m %H:%M:%S')),
+                meta['view'], meta['path'], meta['status'], f"{meta['duration']:.0f}", meta['samples'],
+                'imzo' if meta['trigger'] == 'token' else 'namuna',
+            ])
+        return super().get_context_data(
+            **kwargs,
+            table={'headers': ['Vaqt', 'View', 'URL', 'Status', 'ms', 'Namunalar', 'Sabab'], 'rows': rows},
+            targets=sorted(profiling.get_targets().items()),
+            view_names=profiling_view_names(),
+        )
+
+
+def profiling_view_names():
+    from . import urls as front_urls
+    return sorted(pattern.name for pattern in front_urls.urlpatterns if getattr(pattern, 'name', None))
+
+
+class ProfileDetailView(SuperuserViewMixin, TemplateView):
+    """Bitta profil: flamegraph (collapsed steklardan) va pstats jadvali"""
+    template_name = 'admin/front/profile_detail.html'
+    sorts = ('cumulative', 'tottime', 'ncalls')
+    
+    @property
+    def title(self):
+        return f"Profil: {self.kwargs['profile_id']}"
+    
+    def get_context_data(self, **kwargs):
+        profile_id = self.kwargs['profile_id']
+        try:
+            meta = profiling.load_meta(profile_id)
+            stacks = profiling.load_collapsed(profile_id)
+            sort = self.request.GET.get('sort')
+            stats = profiling.stats_text(profile_id, sort=sort if sort in self.sorts else self.sorts[0])
+        except (OSError, ValueError, KeyError):
+            raise Http404
+        return super().get_context_data(
+            **kwargs, meta=meta, stats=stats, sorts=self.sorts,
+            flamegraph=mark_safe(profiling.flamegraph_svg(stacks)) if stacks else '',
+        )
+
+
+class ProfileDownloadView(SuperuserViewMixin, View):
+    """.prof (pstats) yoki .collapsed faylni yuklab olish"""
+    
+    def get(self, request, profile_id, kind):
+        if kind not in ('prof', 'collapsed'):
+            raise Http404
+        try:
+            fh = open(profiling.file_path(profile_id, f'.{kind}'), 'rb')
+        except OSError:
+            raise Http404
+        return FileResponse(fh, as_attachment=True, filename=f'{profile_id}.{kind}')
+
+
 # ══════════════════════════════════════════════════════════════════
 #                    ADMIN SITE CUSTOMIZATION
 # ══════════════════════════════════════════════════════════════════
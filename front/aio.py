@@ -0,0 +1,71 @@
+"""
+PolyglotLC - Async view yordamchilari
+Bir-biriga bog'liq bo'lmagan ORM o'qishlari ASYNC_FANOUT yoqilganda har biri
+alohida oqimda (o'z ulanishi bilan) bir vaqtda bajariladi, aks holda ketma-ket.
+WSGI ostida Django async view ni async_to_sync orqali o'zi ishga tushiradi -
+view kodi ikkala rejimda ham bir xil.
+"""
+import asyncio
+import inspect
+
+from asgiref.sync import sync_to_async
+from django import shortcuts
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import QuerySet
+
+
+def _load(loader):
+    """QuerySet -> list, sync funksiya -> natija"""
+    if isinstance(loader, QuerySet):
+        return list(loader)
+    return loader()
+
+
+def _load_isolated(loader):
+    """Umumiy bo'lmagan oqimda: ulanish shu oqimniki - ish tugagach yopiladi"""
+    try:
+        return _load(loader)
+    finally:
+        connections.close_all()
+
+
+async def evaluate(loader, isolated=False):
+    """
+    isolated=False: sync_to_async(thread_sensitive=True) - barcha so'rovlar bitta
+    umumiy oqimda navbat bilan. isolated=True: thread_sensitive=False - har loader
+    alohida oqimda, so'rovlar ustma-ust tushadi.
+    """
+    if inspect.isawaitable(loader):
+        return await loader
+    if isinstance(loader, QuerySet) or callable(loader):
+        if isolated:
+            return await sync_to_async(_load_isolated, thread_sensitive=False)(loader)
+        return await sync_to_async(_load)(loader)
+    return loader
+
+
+def fanout_enabled():
+    """
+    Standart holatda faqat tarmoqdagi bazalar uchun. SQLite jarayon ichida ishlaydi -
+    kutiladigan tarmoq I/O yo'q, har oqim uchun yangi ulanish esa faqat qo'shimcha xarajat.
+    ATOMIC_REQUESTS da boshqa oqimlar so'rov tranzaksiyasini ko'rmaydi - o'chiriladi.
+    """
+    if connection.settings_dict.get('ATOMIC_REQUESTS'):
+        return False
+    return getattr(settings, 'ASYNC_FANOUT', connection.vendor != 'sqlite')
+
+
+async def gather(loaders):
+    """{nom: loader} -> {nom: natija}"""
+    names = list(loaders)
+    if fanout_enabled():
+        results = await asyncio.gather(*(evaluate(loaders[name], isolated=True) for name in names))
+    else:
+        results = [await evaluate(loaders[name]) for name in names]
+    return dict(zip(names, results))
+
+
+async def render(request, template_name, context):
+    """Template lazy munosabatlarga murojaat qilishi mumkin - sync oqimda render qilinadi"""
+    return await sync_to_async(shortcuts.render)(request, template_name, context)
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class FrontConfig(AppConfig):
     name = 'front'
+
+    def ready(self):
+        from . import instrumentation, metrics, querylog, signals  # noqa: F401
+        instrumentation.install()
+        querylog.install()
+        metrics.install()
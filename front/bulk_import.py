@@ -0,0 +1,240 @@
+"""
+PolyglotLC - Ommaviy import
+django-import-export uchun tezkor rejim: mavjud qatorlar natural key
+(certificate_number, slug) bo'yicha bir necha IN so'rov bilan oldindan yuklanadi,
+yozish bulk_create/bulk_update bilan paketlab bajariladi, diff hisoblanmaydi.
+
+bulk_create/bulk_update signal yubormaydi - shuning uchun import tugagach
+hisoblagichlar, qidiruv indeksi va sahifa keshi shu yerda yangilanadi.
+"""
+import logging
+import time
+from collections import Counter
+
+from django.db import connections, router, transaction
+from django.utils.text import slugify
+from import_export import resources
+from import_export.instance_loaders import ModelInstanceLoader
+from import_export.widgets import ForeignKeyWidget
+
+from . import denorm, page_cache, search
+from .utils import invalidate_badge_counts
+
+logger = logging.getLogger(__name__)
+
+# SQLite ning eski versiyalarida so'rovdagi parametrlar chegarasi 999
+LOOKUP_CHUNK = 900
+
+
+class NaturalKeyInstanceLoader(ModelInstanceLoader):
+    """Fayldagi barcha natural key lar bo'yicha mavjud obyektlarni oldindan yuklaydi"""
+
+    def __init__(self, resource, dataset=None):
+        super().__init__(resource, dataset)
+        name, = resource.get_import_id_fields()
+        self.field = resource.fields[name]
+        self.instances = {}
+
+        keys = set()
+        if dataset is not None and self.field.column_name in (dataset.headers or ()):
+            for row in dataset.dict:
+                value = self.field.clean(row)
+                if value not in (None, ''):
+                    keys.add(value)
+        keys = list(keys)
+        queryset = self.get_queryset()
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            for instance in queryset.filter(**{f'{self.field.attribute}__in': chunk}):
+                self.instances[self.field.get_value(instance)] = instance
+
+    def get_instance(self, row):
+        return self.instances.get(self.field.clean(row))
+
+
+class CachedForeignKeyWidget(ForeignKeyWidget):
+    """
+    ForeignKeyWidget: bog'liq jadval import boshida bir marta o'qiladi.
+    Takroriy qiymatlarda eng kichik pk tanlanadi.
+    """
+
+    def __init__(self, model, field='pk', **kwargs):
+        super().__init__(model, field=field, **kwargs)
+        self._lookup = None
+
+    def reset(self):
+        self._lookup = None
+
+    def clean(self, value, row=None, **kwargs):
+        if value in (None, ''):
+            return None
+        if self._lookup is None:
+            queryset = self.get_queryset(value, row, **kwargs).only('pk', self.field).order_by('-pk')
+            self._lookup = {str(getattr(obj, self.field)): obj for obj in queryset}
+        obj = self._lookup.get(str(value).strip())
+        if obj is None:
+            raise ValueError(f"{self.model._meta.verbose_name}: '{value}' topilmadi")
+        return obj
+
+
+class BulkModelResource(resources.ModelResource):
+    """
+    Ommaviy import uchun ModelResource.
+    Meta.import_id_fields - bitta natural key maydon. Faylda bo'lmasa yoki bo'sh
+    bo'lsa `natural_key(row)` bilan to'ldiriladi (masalan ismlardan slug).
+    `course__title` kabi ichma-ich ustunlar faqat eksport qilinadi.
+    """
+
+    class Meta:
+        use_bulk = True
+        batch_size = 500
+        skip_diff = True
+        instance_loader_class = NaturalKeyInstanceLoader
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        import_ids = set(self.get_import_id_fields())
+        pk_name = self._meta.model._meta.pk.name
+        for name, field in self.fields.items():
+            nested = field.attribute and '__' in field.attribute and not isinstance(field.widget, ForeignKeyWidget)
+            # Natural key bo'yicha ishlaganda fayldagi id yangi qatorlarga yozilmasin
+            if nested or (field.attribute == pk_name and name not in import_ids):
+                field.readonly = True
+        self.saved_instances = []
+        self.started = None
+
+    def natural_key(self, row):
+        """Faylda natural key bo'lmagan qator uchun qiymat (None - yangi qator)"""
+        return None
+
+    def natural_keys(self, rows):
+        """Natural key siz qatorlar uchun qiymatlar - blok bilan band qilish uchun qayta yoziladi"""
+        return [self.natural_key(row) for row in rows]
+
+    def get_bulk_update_fields(self):
+        import_ids = set(self.get_import_id_fields())
+        pk_name = self._meta.model._meta.pk.name
+        names = [
+            field.attribute for name, field in self.fields.items()
+            if name not in import_ids and not field.readonly
+            and field.attribute and field.attribute != pk_name and '__' not in field.attribute
+        ]
+        # bulk_update auto_now ni o'zi yangilamaydi - updated_at ham yoziladi
+        names += [f.name for f in self._meta.model._meta.concrete_fields
+                  if getattr(f, 'auto_now', False) and f.name not in names]
+        return names
+
+    def import_instance(self, instance, row, **kwargs):
+        """Mavjud obyekt o'zgarmagan bo'lsa qator o'tkazib yuboriladi (diff siz, arzon taqqoslash)"""
+        fields = None if instance.pk is None else self._update_fields()
+        before = [f.value_from_object(instance) for f in fields] if fields else None
+        super().import_instance(instance, row, **kwargs)
+        self.unchanged = before is not None and before == [f.value_from_object(instance) for f in fields]
+
+    def skip_row(self, instance, original, row, import_validation_errors=None):
+        if not import_validation_errors and getattr(self, 'unchanged', False):
+            return True
+        return super().skip_row(instance, original, row, import_validation_errors)
+
+    def _update_fields(self):
+        model_fields = self._meta.model._meta
+        return [model_fields.get_field(name) for name in self.get_bulk_update_fields()
+                if not getattr(model_fields.get_field(name), 'auto_now', False)]
+
+    # ==================== IMPORT BOSQICHLARI ====================
+    def before_import(self, dataset, **kwargs):
+        self.started = time.perf_counter()
+        self.saved_instances = []
+        for field in self.fields.values():
+            if isinstance(field.widget, CachedForeignKeyWidget):
+                field.widget.reset()
+        self._fill_natural_keys(dataset)
+        super().before_import(dataset, **kwargs)
+
+    def _fill_natural_keys(self, dataset):
+        name, = self.get_import_id_fields()
+        column = self.fields[name].column_name
+        headers = dataset.headers or []
+        current = dataset[column] if column in headers else [None] * len(dataset)
+        values = list(current)
+        missing = [i for i, value in enumerate(values) if value in (None, '')]
+        if missing:
+            rows = dataset.dict
+            for i, value in zip(missing, self.natural_keys([rows[i] for i in missing])):
+                values[i] = value
+        counts = Counter(v for v in values if v not in (None, ''))
+        duplicates = sorted(str(v) for v, n in counts.items() if n > 1)
+        if duplicates:
+            raise ValueError(f"Faylda takroriy {column}: {', '.join(duplicates[:20])}")
+        if values != list(current):
+            if column in headers:
+                del dataset[column]
+            dataset.append_col(values, header=column)
+
+    def bulk_create(self, using_transactions, dry_run, raise_errors, batch_size=None, result=None):
+        self.saved_instances.extend(self.create_instances)
+        super().bulk_create(using_transactions, dry_run, raise_errors, batch_size=batch_size, result=result)
+
+    def bulk_update(self, using_transactions, dry_run, raise_errors, batch_size=None, result=None):
+        """
+        QuerySet.bulk_update har paket uchun CASE WHEN ifodasi quradi - Python tomonda
+        sekin. O'rniga bitta UPDATE ... WHERE pk = %s executemany bilan bajariladi.
+        """
+        if not self.update_instances or not (using_transactions or not dry_run):
+            return
+        self.saved_instances.extend(self.update_instances)
+        try:
+            update_rows(self._meta.model, self.update_instances, self.get_bulk_update_fields())
+        except Exception as e:
+            self.handle_import_error(result, e, raise_errors)
+        finally:
+            self.update_instances.clear()
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        elapsed = time.perf_counter() - (self.started or time.perf_counter())
+        result.elapsed = elapsed
+        result.rows_per_second = result.total_rows / elapsed if elapsed else 0.0
+        if not self._is_dry_run(kwargs) and not result.has_errors():
+            refresh_derived(self._meta.model, self.saved_instances)
+        logger.info('%s import: %s qator, %.2f s, %.0f qator/s',
+                    self._meta.model._meta.label_lower, result.total_rows, elapsed, result.rows_per_second)
+
+
+def update_rows(model, instances, field_names):
+    opts = model._meta
+    fields = [opts.get_field(name) for name in field_names]
+    if not fields:
+        return
+    connection = connections[router.db_for_write(model)]
+    qn = connection.ops.quote_name
+    assignments = ', '.join(f'{qn(field.column)} = %s' for field in fields)
+    sql = f'UPDATE {qn(opts.db_table)} SET {assignments} WHERE {qn(opts.pk.column)} = %s'
+    params = [
+        [field.get_db_prep_save(field.pre_save(obj, add=False), connection) for field in fields] + [obj.pk]
+        for obj in instances
+    ]
+    with connection.cursor() as c:
+        c.executemany(sql, params)
+
+
+def refresh_derived(model, instances):
+    """Signallar o'rniga: hisoblagichlar, qidiruv indeksi, sahifa keshi"""
+    tallies = denorm.tallies_for(model)
+    if tallies:
+        denorm.reconcile(tallies)
+    label = model._meta.label_lower
+    if label in search.REGISTRY:
+        search.index_objects(instances)
+
+    def invalidate():
+        page_cache.invalidate(label)
+        invalidate_badge_counts()
+    transaction.on_commit(invalidate)
+
+
+def slug_key(*names):
+    """Model.save() dagi slug bilan bir xil: slugify(ism-familiya)"""
+    def natural_key(self, row):
+        return slugify('-'.join(str(row.get(name) or '') for name in names)) or None
+    return natural_key
@@ -0,0 +1,127 @@
+"""
+PolyglotLC - Kesh qatlami
+Ikki bosqichli kesh: jarayon ichidagi (L1) va Django cache backend (L2).
+Kalitlar versiyalangan - versiya oshirilsa barcha workerlar eski
+qiymatni keyingi so'rovdayoq tashlab yuboradi.
+
+Versiyalar alohida, tozalanmaydigan (cull) kesh alias ida turadi (CACHE_VERSIONS_ALIAS).
+Versiya kaliti baribir yo'qolsa, yangisi joriy vaqtdan (ms) boshlanadi - versiya
+hech qachon orqaga qaytmaydi va eski L2 yozuvlari qayta ko'rinmaydi.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.connection import ConnectionProxy
+
+from . import metrics
+
+
+KEY_PREFIX = 'plc'
+SCHEMA_VERSION = 1  # Pickle tuzilmasi o'zgarsa oshiring
+VERSIONS_ALIAS = getattr(settings, 'CACHE_VERSIONS_ALIAS', 'versions')
+
+versions_cache = ConnectionProxy(caches, VERSIONS_ALIAS if VERSIONS_ALIAS in settings.CACHES else 'default')
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def version_key(namespace):
+    """Namespace versiyasi saqlanadigan kalit"""
+    return f'{KEY_PREFIX}:v{SCHEMA_VERSION}:{namespace}:version'
+
+
+def initial_version():
+    """Yangi (yoki yo'qolgan) versiya - avval berilganlaridan katta bo'lishi uchun vaqt (ms)"""
+    return time.time_ns() // 1_000_000
+
+
+def versioned_key(namespace, version, *parts):
+    """Versiyalangan kesh kaliti"""
+    suffix = ':'.join(str(p) for p in parts)
+    key = f'{KEY_PREFIX}:v{SCHEMA_VERSION}:{namespace}:{version}'
+    return f'{key}:{suffix}' if suffix else key
+
+
+def get_version(namespace):
+    """Namespace ning joriy versiyasini qaytaradi"""
+    version = versions_cache.get(version_key(namespace))
+    if version is None:
+        initial = initial_version()
+        versions_cache.add(version_key(namespace), initial, None)
+        version = versions_cache.get(version_key(namespace), initial)
+    return version
+
+
+def get_versions(namespaces):
+    """Bir nechta namespace versiyalari - bitta cache.get_many bilan"""
+    keys = {version_key(ns): ns for ns in namespaces}
+    found = versions_cache.get_many(list(keys))
+    missing = [key for key in keys if key not in found]
+    for key in missing:
+        initial = initial_version()
+        versions_cache.add(key, initial, None)
+        found[key] = versions_cache.get(key, initial)
+    return {keys[key]: found[key] for key in keys}
+
+
+def bump_version(namespace):
+    """Namespace versiyasini oshiradi - eski kalitlar o'z-o'zidan eskiradi"""
+    try:
+        version = versions_cache.incr(version_key(namespace))
+    except ValueError:
+        initial = initial_version()
+        versions_cache.add(version_key(namespace), initial, None)
+        version = versions_cache.get(version_key(namespace), initial)
+    with _local_lock:
+        _local.pop(namespace, None)
+    return version
+
+
+def get_or_load(namespace, loader, timeout=3600):
+    """
+    Qiymatni L1 -> L2 -> loader tartibida oladi.
+    Har chaqiruvda faqat versiya kaliti L2 dan o'qiladi (bitta cache.get).
+    """
+    version = get_version(namespace)
+
+    cached = _local.get(namespace)
+    if cached is not None and cached[0] == version:
+        metrics.cache_event('l1', namespace, 'hit')
+        return cached[1]
+
+    key = versioned_key(namespace, version)
+    value = cache.get(key)
+    if value is None:
+        metrics.cache_event('l2', namespace, 'miss')
+        value = loader()
+        cache.set(key, value, timeout)
+    else:
+        metrics.cache_event('l2', namespace, 'hit')
+
+    with _local_lock:
+        _local[namespace] = (version, value)
+    return value
+
+
+def clear_local():
+    """Jarayon ichidagi keshni tozalaydi (testlar uchun)"""
+    with _local_lock:
+        _local.clear()
+
+
+# ==================== SAYT SOZLAMALARI ====================
+SITE_SETTINGS_NAMESPACE = 'site_settings'
+
+
+def get_site_settings():
+    """Sayt sozlamalarini oladi (ikki bosqichli kesh)"""
+    from front.models import SiteSettings
+    return get_or_load(SITE_SETTINGS_NAMESPACE, SiteSettings.load)
+
+
+def invalidate_site_settings():
+    """Sayt sozlamalari keshini bekor qiladi"""
+    return bump_version(SITE_SETTINGS_NAMESPACE)
@@ -0,0 +1,257 @@
+"""
+PolyglotLC - Sertifikat rasmlarini yaratish
+Kurs shabloni (Course.certificate_template) ustiga talaba ismi, kurs, ball, sana,
+sertifikat raqami va tekshirish sahifasiga olib boruvchi QR kod Pillow bilan yoziladi.
+Natija certificates/%Y/%m/ ga saqlanadi.
+
+Sertifikatlar pk bo'yicha bo'laklab o'qiladi va paketlar spawn qilingan jarayonlar
+pool iga beriladi - bir vaqtda faqat bir necha paket xotirada turadi.
+QR kod uchun `qrcode` paketi kerak; o'rnatilmagan bo'lsa QR siz chiziladi.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.urls import reverse
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 25
+QUALITY = getattr(settings, 'CERTIFICATE_JPEG_QUALITY', 88)
+# Kursda shablon bo'lmasa ishlatiladigan storage fayli
+DEFAULT_TEMPLATE = getattr(settings, 'CERTIFICATE_TEMPLATE', '')
+FONT = getattr(settings, 'CERTIFICATE_FONT', None)
+
+# Joylashuv - shablon o'lchamiga nisbatan: xy markaz, size shrift (balandlikdan), max_width
+LAYOUT = {
+    'student_name': {'xy': (0.5, 0.45), 'size': 0.075, 'max_width': 0.8},
+    'course': {'xy': (0.5, 0.56), 'size': 0.04, 'max_width': 0.8},
+    'score': {'xy': (0.5, 0.64), 'size': 0.035, 'max_width': 0.6},
+    'issue_date': {'xy': (0.25, 0.86), 'size': 0.028, 'max_width': 0.3},
+    'certificate_number': {'xy': (0.55, 0.86), 'size': 0.028, 'max_width': 0.3},
+    'qr': {'xy': (0.86, 0.82), 'size': 0.18},
+}
+LAYOUT.update(getattr(settings, 'CERTIFICATE_LAYOUT', {}))
+TEXT_COLOR = getattr(settings, 'CERTIFICATE_TEXT_COLOR', '#1f2937')
+
+
+def _image_field():
+    return apps.get_model('front', 'Certificate')._meta.get_field('certificate_image')
+
+
+# ==================== CHIZISH ====================
+@lru_cache(maxsize=8)
+def _template(name):
+    """Shablon jarayon ichida bir marta o'qiladi (yangi yuklangan shablon yangi nom oladi)"""
+    with _image_field().storage.open(name, 'rb') as fh:
+        image = Image.open(fh)
+        image.load()
+    return image.convert('RGB')
+
+
+@lru_cache(maxsize=64)
+def _font(size):
+    return ImageFont.truetype(FONT, size) if FONT else ImageFont.load_default(size)
+
+
+def _fit(draw, text, size, max_width):
+    """Matn kenglikka sig'maguncha shrift kichraytiriladi"""
+    font = _font(size)
+    while size > 8 and draw.textlength(text, font=font) > max_width:
+        size = int(size * 0.9)
+        font = _font(size)
+    return font
+
+
+@lru_cache(maxsize=1)
+def _qrcode():
+    try:
+        import qrcode
+    except ImportError:
+        logger.warning("qrcode o'rnatilmagan - sertifikatlar QR kodsiz chiziladi")
+        return None
+    return qrcode
+
+
+def qr_image(data, size):
+    qrcode = _qrcode()
+    if qrcode is None:
+        return None
+    code = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=2)
+    code.add_data(data)
+    code.make(fit=True)
+    image = code.make_image(fill_color='black', back_color='white').get_image().convert('RGB')
+    return image.resize((size, size), Image.NEAREST)
+
+
+def render(template, values, qr_data=None, layout=LAYOUT):
+    """Shablon nusxasiga matnlar va QR kodni yozadi (PIL Image)"""
+    image = _template(template).copy()
+    width, height = image.size
+    draw = ImageDraw.Draw(image)
+    for key, spec in layout.items():
+        text = values.get(key)
+        if key == 'qr' or not text:
+            continue
+        font = _fit(draw, text, round(spec['size'] * height), spec.get('max_width', 0.9) * width)
+        draw.text((spec['xy'][0] * width, spec['xy'][1] * height), text,
+                  font=font, fill=spec.get('color', TEXT_COLOR), anchor='mm')
+
+    spec = layout.get('qr')
+    code = qr_image(qr_data, round(spec['size'] * height)) if spec and qr_data else None
+    if code is not None:
+        image.paste(code, (round(spec['xy'][0] * width - code.width / 2),
+                           round(spec['xy'][1] * height - code.height / 2)))
+    return image
+
+
+def encode(image):
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=QUALITY)
+    return buffer.getvalue()
+
+
+# ==================== PAKETLAR ====================
+def render_batch(jobs):
+    """
+    Jarayon ichida: har bir sertifikatni chizib storage ga saqlaydi.
+    Natija: [(pk, yangi nom, eski nom, xato)]
+    """
+    field = _image_field()
+    results = []
+    for job in jobs:
+        try:
+            image = render(job['template'], job['values'], job['qr'])
+            filename = f"{job['values']['certificate_number'] or job['pk']}.jpg"
+            name = field.storage.save(field.generate_filename(None, filename), ContentFile(encode(image)))
+            results.append((job['pk'], name, job['previous'], None))
+        except (OSError, ValueError) as exc:
+            results.append((job['pk'], None, None, f'{type(exc).__name__}: {exc}'))
+    return results
+
+
+def verify_url(number, base_url=''):
+    return f"{base_url.rstrip('/')}{reverse('certificate_verify')}?{urlencode({'number': number})}"
+
+
+def iter_jobs(queryset, base_url='', stats=None, chunk_size=500):
+    """
+    Sertifikatlar pk bo'yicha bo'laklab (keyset) o'qiladi: xotira barqaror, yozish
+    paytida ochiq cursor qolmaydi. Shablonsiz sertifikatlar o'tkazib yuboriladi.
+    """
+    stats = stats if stats is not None else Counter()
+    queryset = queryset.order_by('pk').values(
+        'pk', 'student_name', 'course__title', 'course__certificate_template', 'score',
+        'issue_date', 'certificate_number', 'certificate_image',
+    )
+    last = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last)[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1]['pk']
+        for row in rows:
+            template = row['course__certificate_template'] or DEFAULT_TEMPLATE
+            if not template:
+                stats['skipped'] += 1
+                continue
+            number = row['certificate_number']
+            yield {
+                'pk': row['pk'],
+                'template': template,
+                'previous': row['certificate_image'] or None,
+                'qr': verify_url(number, base_url) if number else None,
+                'values': {
+                    'student_name': row['student_name'],
+                    'course': row['course__title'] or '',
+                    'score': row['score'],
+                    'issue_date': row['issue_date'].strftime('%d.%m.%Y') if row['issue_date'] else '',
+                    'certificate_number': number,
+                },
+            }
+
+
+def _batches(jobs, size):
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _store(results, stats):
+    """Paket natijasini bazaga yozadi - save() siz, signal va auto_now ishlamaydi"""
+    from .bulk_import import update_rows
+
+    Certificate = apps.get_model('front', 'Certificate')
+    storage = _image_field().storage
+    done = [(pk, name, previous) for pk, name, previous, error in results if error is None]
+    for pk, _, _, error in results:
+        if error is not None:
+            stats['failed'] += 1
+            logger.warning('Sertifikat #%s chizilmadi: %s', pk, error)
+    if not done:
+        return
+    update_rows(Certificate, [Certificate(pk=pk, certificate_image=name) for pk, name, _ in done],
+                ['certificate_image'])
+    stats['rendered'] += len(done)
+    for _, name, previous in done:
+        if previous and previous != name:
+            storage.delete(previous)
+
+
+def _init_process():
+    # spawn qilingan jarayon Django ni noldan yuklaydi
+    import django
+    django.setup()
+
+
+def render_queryset(queryset, processes=None, batch_size=BATCH_SIZE, base_url=''):
+    """
+    Sertifikat rasmlarini yaratadi: {'rendered', 'skipped', 'failed', 'elapsed'}.
+    processes=0 - joriy jarayonda (kichik paketlar, testlar uchun).
+    """
+    from . import page_cache
+
+    stats = Counter()
+    started = time.perf_counter()
+    batches = _batches(iter_jobs(queryset, base_url, stats), batch_size)
+    processes = (os.cpu_count() or 1) if processes is None else processes
+
+    if processes == 0:
+        for batch in batches:
+            _store(render_batch(batch), stats)
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_process) as executor:
+            pending = set()
+            for batch in batches:
+                # Navbatda ko'pi bilan 2 x jarayon paket - qolganlari hali o'qilmagan
+                if len(pending) >= processes * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        _store(future.result(), stats)
+                pending.add(executor.submit(render_batch, batch))
+            for future in pending:
+                _store(future.result(), stats)
+
+    if stats['rendered']:
+        transaction.on_commit(lambda: page_cache.invalidate('front.certificate'))
+    result = {key: stats[key] for key in ('rendered', 'skipped', 'failed')}
+    result['elapsed'] = time.perf_counter() - started
+    logger.info('Sertifikatlar: %s, %.2f s', result, result['elapsed'])
+    return result
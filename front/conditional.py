@@ -0,0 +1,132 @@
+"""
+PolyglotLC - Shartli GET (ETag / Last-Modified / 304)
+View ishlashidan oldin arzon validator hisoblanadi: sahifa bog'liq modellarning
+MAX(updated_at) qiymatlari (indeks bo'yicha) va detail sahifalarda asosiy obyektning
+updated_at i - hammasi bitta SELECT da. updated_at i yo'q modellar (Subject, FAQ ...)
+va o'chirishlar sahifa keshi versiyalari orqali (ETag da) hisobga olinadi, sayt
+sozlamalari esa SiteSettings.updated_at orqali. Last-Modified faqat barcha modellarida
+updated_at bor sahifalarga beriladi - aks holda If-Modified-Since o'zgarishni ko'rmaydi.
+
+If-None-Match / If-Modified-Since mos kelsa view umuman ishlamaydi - 304.
+ETag ga CSRF siri ham qo'shiladi: 304 faqat joriy cookie ga mos token li sahifaga.
+"""
+import hashlib
+from datetime import timezone as dt_timezone
+from functools import cache, wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+from .cache import get_site_settings
+from .page_cache import ALWAYS_DEPENDS_ON, dependency_stamp, is_cacheable_request, normalize_query
+
+
+def _has_updated_at(model):
+    return any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+
+
+@cache
+def tracks_time(depends_on):
+    """Sahifaning barcha modellarida updated_at bor - Last-Modified ishonchli"""
+    return all(_has_updated_at(apps.get_model(label)) for label in depends_on)
+
+
+def _to_datetime(value):
+    """Xom so'rov natijasi: backend ga qarab satr yoki naive datetime bo'lishi mumkin"""
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if value is not None and value.tzinfo is None and settings.USE_TZ:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    return value
+
+
+def fingerprint(depends_on, lookup=None):
+    """
+    (obyekt pk, [updated_at qiymatlari]) - bitta so'rov.
+    lookup berilgan, lekin obyekt topilmasa None (view o'zi 404 qaytaradi).
+    """
+    models = [apps.get_model(label) for label in depends_on]
+    connection = connections[router.db_for_read(models[0] if models else lookup.model)]
+    qn = connection.ops.quote_name
+    parts, params = [], []
+    if lookup is not None:
+        for field in ('pk', 'updated_at'):
+            query = lookup.order_by().values_list(field)[:1].query
+            sql, query_params = query.get_compiler(connection=connection).as_sql()
+            parts.append(f'({sql})')
+            params.extend(query_params)
+    for model in models:
+        if _has_updated_at(model):
+            column = model._meta.get_field('updated_at').column
+            parts.append(f'(SELECT MAX({qn(column)}) FROM {qn(model._meta.db_table)})')
+    if not parts:
+        return None, []
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT ' + ', '.join(parts), params)
+        row = list(cursor.fetchone())
+    pk = None
+    if lookup is not None:
+        pk = row.pop(0)
+        if pk is None:
+            return None
+    return pk, [_to_datetime(value) for value in row]
+
+
+def conditional_page(*depends_on, lookup=None, on_not_modified=None):
+    """
+    Anonim GET/HEAD so'rovlariga ETag va Last-Modified, mos kelsa 304.
+    depends_on - sahifa ko'rsatadigan modellar (cache_page dagi kabi).
+    lookup(**kwargs) -> QuerySet - detail sahifaning asosiy obyekti.
+    on_not_modified(pk) - 304 da ham bajariladigan ish (masalan ko'rishlar hisoblagichi).
+    @cache_page dan tashqarida (ustida) qo'llanadi.
+    """
+    def decorator(view):
+        view_name = view.__name__
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            result = fingerprint(depends_on, lookup(**kwargs) if lookup else None)
+            if result is None:
+                return view(request, *args, **kwargs)
+            pk, stamps = result
+            site_settings = get_site_settings()
+            stamps.append(site_settings.updated_at if site_settings else None)
+
+            source = '|'.join([
+                view_name, request.path, normalize_query(request.GET), str(pk),
+                # Sahifadagi forma CSRF tokeni shu sirdan - sir o'zgarsa eski HTML (304) ishlatilmasin
+                request.META.get('CSRF_COOKIE', ''),
+                dependency_stamp(ALWAYS_DEPENDS_ON + depends_on),
+                *(value.isoformat() if value else '-' for value in stamps),
+            ])
+            etag = f'W/"{hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()}"'
+            # updated_at i yo'q modellar o'zgarishi vaqtni siljitmaydi - bunday sahifada faqat ETag
+            known = [value for value in stamps if value]
+            last_modified = int(max(known).timestamp()) if known and tracks_time(depends_on) else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                if on_not_modified and pk is not None:
+                    on_not_modified(pk)
+            else:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            if not response.has_header('ETag'):
+                response['ETag'] = etag
+            if last_modified and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+            # Brauzer har safar tekshirsin - javob odatda arzon 304
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        return wrapper
+    return decorator
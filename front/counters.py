@@ -0,0 +1,95 @@
+"""
+PolyglotLC - Ko'rishlar hisoblagichi (write-behind)
+Har bir GET da bazaga yozish o'rniga oshirishlar xotirada yig'iladi va
+fon oqimi ularni davriy ravishda F() ifodali UPDATE lar bilan yozadi.
+"""
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, 'COUNTERS_FLUSH_INTERVAL', 30)  # soniya
+MAX_PENDING = getattr(settings, 'COUNTERS_MAX_PENDING', 1000)
+
+# {(model, field): {pk: delta}}
+_pending = defaultdict(lambda: defaultdict(int))
+_lock = threading.Lock()
+_flush_event = threading.Event()
+_worker = None
+
+
+def increment(instance, field='views_count', amount=1):
+    """Hisoblagichni xotirada oshiradi - bazaga darhol yozilmaydi"""
+    with _lock:
+        bucket = _pending[(type(instance), field)]
+        bucket[instance.pk] += amount
+        size = sum(len(b) for b in _pending.values())
+    _ensure_worker()
+    if size >= MAX_PENDING:
+        _flush_event.set()
+
+
+def pending(instance, field='views_count'):
+    """Hali yozilmagan oshirishlar soni"""
+    with _lock:
+        bucket = _pending.get((type(instance), field))
+        return bucket.get(instance.pk, 0) if bucket else 0
+
+
+def get_count(instance, field='views_count'):
+    """Bazadagi qiymat + yozilmagan oshirishlar"""
+    return getattr(instance, field) + pending(instance, field)
+
+
+def flush():
+    """Yig'ilgan oshirishlarni bazaga yozadi. Yozilgan qatorlar sonini qaytaradi."""
+    global _pending
+    with _lock:
+        batch, _pending = _pending, defaultdict(lambda: defaultdict(int))
+
+    updated = 0
+    try:
+        with transaction.atomic():
+            for (model, field), deltas in batch.items():
+                # Bir xil delta li qatorlar bitta UPDATE ... WHERE id IN (...) bilan
+                by_delta = defaultdict(list)
+                for pk, delta in deltas.items():
+                    by_delta[delta].append(pk)
+                for delta, pks in by_delta.items():
+                    updated += model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+    except Exception:
+        logger.exception('Hisoblagichlarni yozib bo\'lmadi, keyingi safar qayta uriniladi')
+        _restore(batch)
+        return 0
+    return updated
+
+
+def _restore(batch):
+    with _lock:
+        for key, deltas in batch.items():
+            for pk, delta in deltas.items():
+                _pending[key][pk] += delta
+
+
+def _run():
+    while True:
+        _flush_event.wait(FLUSH_INTERVAL)
+        _flush_event.clear()
+        flush()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name='counters-flush', daemon=True)
+            _worker.start()
+            atexit.register(flush)
@@ -0,0 +1,312 @@
+"""
+PolyglotLC - Denormallashgan hisoblagichlar
+Bog'liq qatorlar soni (fandagi faol kurslar, kategoriyadagi rasmlar ...) maqsad
+modelning maydonida saqlanadi va save/delete/m2m_changed signallarida F() bilan
+yangilanadi - sahifalar COUNT so'rovi yubormaydi. Maydonlar modelning
+COUNTER_FIELDS ida - oddiy save() ularni yozmaydi (models.CounterFieldsModel).
+Signalni chetlab o'tgan o'zgarishlar (queryset.update, raw SQL, loaddata)
+`manage.py reconcile_counts` bilan tuzatiladi.
+"""
+from dataclasses import dataclass
+from functools import cache
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+
+
+@dataclass(frozen=True)
+class Tally:
+    """
+    source modelning `condition` ga mos qatorlari soni.
+    relation - source dagi FK yoki M2M maydon: son target modelning `field` iga yoziladi.
+    relation=None - umumiy hisoblagich: son SiteCounter(key=field) da saqlanadi.
+    """
+    source: str
+    relation: str | None
+    target: str | None
+    field: str
+    condition: tuple = ()
+
+    @property
+    def source_model(self):
+        return apps.get_model(self.source)
+
+    @property
+    def target_model(self):
+        return apps.get_model(self.target)
+
+    @property
+    def is_global(self):
+        return self.relation is None
+
+    @property
+    def is_m2m(self):
+        return not self.is_global and self.source_model._meta.get_field(self.relation).many_to_many
+
+    def matches(self, values):
+        return all(values.get(name) == expected for name, expected in self.condition)
+
+
+ACTIVE = (('is_active', True),)
+
+TALLIES = (
+    Tally('front.courseenrollment', 'course', 'front.course', 'enrollments_count'),
+    Tally('front.course', 'subject', 'front.subject', 'active_courses_count', ACTIVE),
+    Tally('front.teacher', 'specializations', 'front.subject', 'active_teachers_count', ACTIVE),
+    Tally('front.course', 'teachers', 'front.teacher', 'active_courses_count', ACTIVE),
+    Tally('front.gallery', 'category', 'front.gallerycategory', 'images_count'),
+    Tally('front.faq', 'category', 'front.faqcategory', 'active_faqs_count', ACTIVE),
+    Tally('front.teacher', None, None, 'active_teachers', ACTIVE),
+    Tally('front.course', None, None, 'active_courses', ACTIVE),
+)
+
+
+@cache
+def tallies_for(model):
+    label = model._meta.label_lower
+    return tuple(tally for tally in TALLIES if tally.source == label)
+
+
+# ==================== O'QISH ====================
+def get_counters(*keys):
+    """Umumiy hisoblagichlar {kalit: qiymat} - bitta so'rov"""
+    SiteCounter = apps.get_model('front.sitecounter')
+    values = dict(SiteCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+    return {key: values.get(key, 0) for key in keys}
+
+
+async def aget_counters(*keys):
+    SiteCounter = apps.get_model('front.sitecounter')
+    values = {key: value async for key, value in SiteCounter.objects.filter(key__in=keys).values_list('key', 'value')}
+    return {key: values.get(key, 0) for key in keys}
+
+
+# ==================== YOZISH ====================
+def bump(tally, pks, delta):
+    """target qatorlari (yoki umumiy hisoblagich) ni F() bilan o'zgartiradi"""
+    if not delta:
+        return
+    if tally.is_global:
+        _bump_global(tally.field, delta)
+        return
+    pks = [pk for pk in pks if pk is not None]
+    if pks:
+        tally.target_model._default_manager.filter(pk__in=pks).update(**{tally.field: F(tally.field) + delta})
+
+
+def _bump_global(key, delta):
+    SiteCounter = apps.get_model('front.sitecounter')
+    if SiteCounter.objects.filter(key=key).update(value=F('value') + delta):
+        return
+    try:
+        with transaction.atomic():
+            SiteCounter.objects.create(key=key, value=delta)
+    except IntegrityError:
+        SiteCounter.objects.filter(key=key).update(value=F('value') + delta)
+
+
+# ==================== HOLAT ====================
+@cache
+def _fields(model):
+    """Source model uchun kuzatiladigan maydonlar (attname)"""
+    names = set()
+    for tally in tallies_for(model):
+        names.update(name for name, _ in tally.condition)
+        if not tally.is_global and not tally.is_m2m:
+            names.add(model._meta.get_field(tally.relation).attname)
+    return tuple(sorted(names))
+
+
+def snapshot(instance):
+    """Bazadagi holat: {attname: qiymat}. Deferred maydon bo'lsa None."""
+    values = {}
+    for name in _fields(type(instance)):
+        if name not in instance.__dict__:
+            return None
+        values[name] = instance.__dict__[name]
+    return values
+
+
+def _db_state(instance):
+    return type(instance)._default_manager.filter(pk=instance.pk).values(*_fields(type(instance))).first()
+
+
+def _stored_state(instance):
+    """post_init dagi holat; qator .only() bilan yuklangan bo'lsa bazadan o'qiladi"""
+    state = getattr(instance, '_denorm_state', None)
+    if state is None and instance.pk is not None:
+        state = _db_state(instance)
+    return state
+
+
+def _m2m_targets(tally, source_pk):
+    through = tally.source_model._meta.get_field(tally.relation).remote_field.through
+    source_fk, target_fk = _through_fields(tally)
+    return list(through._default_manager.filter(**{source_fk: source_pk}).values_list(target_fk, flat=True))
+
+
+def _through_fields(tally):
+    field = tally.source_model._meta.get_field(tally.relation)
+    return f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+
+
+# ==================== SIGNALLAR ====================
+def instance_loaded(sender, instance, **kwargs):
+    instance._denorm_state = snapshot(instance) if instance.pk is not None else None
+
+
+def instance_pre_save(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._denorm_old = None
+    else:
+        instance._denorm_old = _stored_state(instance)
+
+
+def instance_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else instance._denorm_old
+    new = snapshot(instance) or _db_state(instance)
+    for tally in tallies_for(sender):
+        was = bool(old) and tally.matches(old)
+        now = tally.matches(new)
+        if tally.is_global:
+            bump(tally, (), now - was)
+        elif tally.is_m2m:
+            # Yangi obyektning M2M bog'lanishlari hali yo'q - ular m2m_changed da sanaladi
+            if not created and was != now:
+                bump(tally, _m2m_targets(tally, instance.pk), now - was)
+        else:
+            attname = sender._meta.get_field(tally.relation).attname
+            old_target = old.get(attname) if old else None
+            new_target = new.get(attname)
+            if (was, old_target) != (now, new_target):
+                bump(tally, [old_target], -was)
+                bump(tally, [new_target], now)
+    instance._denorm_state = new
+
+
+def instance_pre_delete(sender, instance, **kwargs):
+    # M2M bog'lanishlar obyektdan oldin o'chiriladi - maqsadlarni oldindan eslab qolamiz
+    instance._denorm_old = _stored_state(instance)
+    instance._denorm_m2m = {
+        tally: _m2m_targets(tally, instance.pk)
+        for tally in tallies_for(sender) if tally.is_m2m
+    }
+
+
+def instance_deleted(sender, instance, **kwargs):
+    old = getattr(instance, '_denorm_old', None)
+    if not old:
+        return
+    for tally in tallies_for(sender):
+        if not tally.matches(old):
+            continue
+        if tally.is_global:
+            bump(tally, (), -1)
+        elif tally.is_m2m:
+            bump(tally, instance._denorm_m2m.get(tally, ()), -1)
+        else:
+            bump(tally, [old.get(sender._meta.get_field(tally.relation).attname)], -1)
+
+
+def relation_changed(sender, instance, action, reverse, model, pk_set, tally, **kwargs):
+    through = sender
+    source_fk, target_fk = _through_fields(tally)
+
+    if action in ('pre_remove', 'pre_clear'):
+        # remove() ga bog'lanmagan id lar ham berilishi mumkin - faqat mavjudlarini sanaymiz
+        lookup = {target_fk if reverse else source_fk: instance.pk}
+        if pk_set is not None:
+            lookup[f'{source_fk if reverse else target_fk}__in'] = pk_set
+        column = source_fk if reverse else target_fk
+        instance._denorm_removed = list(through._default_manager.filter(**lookup).values_list(column, flat=True))
+        return
+    if action == 'post_add':
+        pks, delta = pk_set or (), 1
+    elif action in ('post_remove', 'post_clear'):
+        pks, delta = getattr(instance, '_denorm_removed', ()), -1
+    else:
+        return
+    if not pks:
+        return
+
+    if not reverse:
+        # instance - source (masalan teacher.specializations.add(subject))
+        state = getattr(instance, '_denorm_state', None) or _stored_state(instance)
+        if state and tally.matches(state):
+            bump(tally, pks, delta)
+    else:
+        # instance - target (masalan subject.teachers.add(teacher))
+        matching = tally.source_model._default_manager.filter(pk__in=pks, **dict(tally.condition)).count()
+        bump(tally, [instance.pk], delta * matching)
+
+
+def connect():
+    for label in {tally.source for tally in TALLIES}:
+        model = apps.get_model(label)
+        uid = f'denorm_{label}'
+        post_init.connect(instance_loaded, sender=model, dispatch_uid=f'{uid}_init')
+        pre_save.connect(instance_pre_save, sender=model, dispatch_uid=f'{uid}_pre_save')
+        post_save.connect(instance_saved, sender=model, dispatch_uid=f'{uid}_saved')
+        pre_delete.connect(instance_pre_delete, sender=model, dispatch_uid=f'{uid}_pre_delete')
+        post_delete.connect(instance_deleted, sender=model, dispatch_uid=f'{uid}_deleted')
+
+    for tally in TALLIES:
+        if tally.is_m2m:
+            through = tally.source_model._meta.get_field(tally.relation).remote_field.through
+
+            def receiver(sender, tally=tally, **kwargs):
+                relation_changed(sender, tally=tally, **kwargs)
+
+            m2m_changed.connect(receiver, sender=through, weak=False,
+                                dispatch_uid=f'denorm_{tally.source}_{tally.relation}')
+
+
+# ==================== TUZATISH ====================
+def actual_counts(tally, app_registry=apps):
+    """Haqiqiy sonlar: {target_pk: son} (umumiy hisoblagich uchun {None: son})"""
+    source = app_registry.get_model(tally.source)
+    condition = dict(tally.condition)
+    if tally.is_global:
+        return {None: source._default_manager.filter(**condition).count()}
+
+    field = source._meta.get_field(tally.relation)
+    if field.many_to_many:
+        through = field.remote_field.through
+        source_name, target_name = field.m2m_field_name(), field.m2m_reverse_field_name()
+        queryset = through._default_manager.filter(**{f'{source_name}__{k}': v for k, v in condition.items()})
+        column = f'{target_name}_id'
+    else:
+        queryset = source._default_manager.filter(**condition).exclude(**{f'{field.attname}__isnull': True})
+        column = field.attname
+    return dict(queryset.order_by().values(column).annotate(n=Count('*')).values_list(column, 'n'))
+
+
+def reconcile(tallies=TALLIES, dry_run=False, batch_size=500, app_registry=apps):
+    """Barcha hisoblagichlarni qayta sanaydi. {tally: tuzatilgan qatorlar soni} qaytaradi."""
+    result = {}
+    for tally in tallies:
+        actual = actual_counts(tally, app_registry)
+        if tally.is_global:
+            SiteCounter = app_registry.get_model('front', 'SiteCounter')
+            stored = SiteCounter.objects.filter(key=tally.field).values_list('value', flat=True).first()
+            drifted = int(stored != actual[None])
+            if drifted and not dry_run:
+                SiteCounter.objects.update_or_create(key=tally.field, defaults={'value': actual[None]})
+            result[tally] = drifted
+            continue
+
+        target = app_registry.get_model(tally.target)
+        changed = []
+        for obj in target._default_manager.only('pk', tally.field).order_by().iterator(chunk_size=batch_size):
+            expected = actual.get(obj.pk, 0)
+            if getattr(obj, tally.field) != expected:
+                setattr(obj, tally.field, expected)
+                changed.append(obj)
+        if changed and not dry_run:
+            target._default_manager.bulk_update(changed, [tally.field], batch_size=batch_size)
+        result[tally] = len(changed)
+    return result
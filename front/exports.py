@@ -0,0 +1,130 @@
+"""
+PolyglotLC - Oqimli eksport
+django-import-export resource qatorlari iterator(chunk_size) bilan o'qiladi va
+CSV/JSON ga bo'laklab StreamingHttpResponse orqali, XLSX ga esa vaqtinchalik
+faylga yoziladi - tablib Dataset butun jadvalni xotirada yig'maydi.
+Bog'liq maydonlar (course__title) select_related bilan bitta so'rovda olinadi.
+"""
+import csv
+import json
+import tempfile
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.encoding import force_str
+from import_export.formats import base_formats
+from import_export.widgets import ForeignKeyWidget
+
+CHUNK_SIZE = 2000
+
+# Oqim bilan yoziladigan formatlar - qolganlari odatiy tablib eksportida qoladi
+STREAMING_FORMATS = {
+    base_formats.CSV: 'csv',
+    base_formats.JSON: 'json',
+    base_formats.XLSX: 'xlsx',
+}
+
+
+def streaming_kind(file_format):
+    return STREAMING_FORMATS.get(type(file_format))
+
+
+# ==================== QATORLAR ====================
+def related_paths(model, fields):
+    """`course__title` kabi atributlar va ForeignKeyWidget maydonlari uchun select_related yo'llari"""
+    paths = set()
+    for field in fields:
+        parts = (field.attribute or '').split('__')
+        if not isinstance(field.widget, ForeignKeyWidget):
+            parts = parts[:-1]
+        current, path = model, []
+        for name in parts:
+            try:
+                relation = current._meta.get_field(name)
+            except FieldDoesNotExist:
+                break
+            if not (relation.many_to_one or relation.one_to_one) or relation.related_model is None:
+                break
+            path.append(name)
+            current = relation.related_model
+        if path:
+            paths.add('__'.join(path))
+    return sorted(paths)
+
+
+def iter_rows(resource, queryset, selected_fields=None, chunk_size=CHUNK_SIZE, **kwargs):
+    """Avval sarlavha, keyin har bir obyekt uchun qiymatlar ro'yxati"""
+    resource.before_export(queryset, **kwargs)
+    queryset = resource.filter_export(queryset, **kwargs)
+    fields = resource.get_export_fields(selected_fields)
+
+    paths = related_paths(queryset.model, fields)
+    if paths:
+        queryset = queryset.select_related(*paths)
+    if not queryset.query.order_by and not queryset.model._meta.ordering:
+        queryset = queryset.order_by('pk')
+
+    yield [force_str(field.column_name) for field in fields]
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        yield [resource.export_field(field, obj, **kwargs) for field in fields]
+
+
+# ==================== FORMATLAR ====================
+class _Echo:
+    """csv.writer uchun: yozilgan qatorni qaytaradi"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, encoding='utf-8'):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(['' if value is None else value for value in row]).encode(encoding)
+
+
+def stream_json(rows, encoding='utf-8'):
+    """tablib JSON bilan bir xil: [{sarlavha: qiymat}, ...]"""
+    headers = next(rows)
+    yield b'['
+    separator = b''
+    for row in rows:
+        yield separator + json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder,
+                                     ensure_ascii=False).encode(encoding)
+        separator = b','
+    yield b']'
+
+
+def write_xlsx(rows):
+    """
+    openpyxl write_only rejimi qatorlarni diskka yozib boradi.
+    Natija - yopilganda o'chadigan vaqtinchalik fayl.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in rows:
+        sheet.append(row)
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+# ==================== JAVOB ====================
+def response(kind, resource, queryset, filename, selected_fields=None, encoding='utf-8'):
+    if kind == 'xlsx':
+        rows = iter_rows(resource, queryset, selected_fields, force_native_type=True)
+        return FileResponse(write_xlsx(rows), as_attachment=True, filename=filename,
+                            content_type=base_formats.XLSX().get_content_type())
+
+    rows = iter_rows(resource, queryset, selected_fields)
+    if kind == 'csv':
+        content, content_type = stream_csv(rows, encoding), f'text/csv; charset={encoding}'
+    else:
+        content, content_type = stream_json(rows, encoding), f'application/json; charset={encoding}'
+    result = StreamingHttpResponse(content, content_type=content_type)
+    result['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return result
@@ -0,0 +1,218 @@
+"""
+PolyglotLC - Rasm derivativlari
+Yuklangan rasmlardan bir nechta kenglikdagi AVIF/WebP/JPEG nusxalarni
+Pillow bilan tayyorlaydi va `derivatives/` ostida saqlaydi.
+"""
+import logging
+import os
+import posixpath
+import re
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+ROOT = 'derivatives'
+WIDTHS = getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (160, 320, 640, 1024))
+LAZY = getattr(settings, 'IMAGE_DERIVATIVES_LAZY', True)
+QUALITY = {'avif': 55, 'webp': 78, 'jpeg': 82, 'png': None}
+
+# Modelga biriktirilgan rasm maydonlari: upload bo'lganda derivativlar yasaladi
+IMAGE_FIELDS = {
+    'front.course': ('main_image',),
+    'front.news': ('main_image',),
+    'front.teacher': ('photo',),
+    'front.gallery': ('image',),
+    'front.testimonial': ('student_photo',),
+    'front.newsgalleryimage': ('image',),
+    'front.certificate': ('certificate_image',),
+}
+
+# Bo'sh turgan thumbnail maydonlari: manba maydon -> thumbnail maydon
+THUMBNAIL_FIELDS = {
+    'front.course': ('main_image', 'thumbnail'),
+    'front.news': ('main_image', 'thumbnail'),
+}
+THUMBNAIL_WIDTH = 640
+# Biz yasagan thumbnail: <manba>-thumb.jpg (storage nom to'qnashuvida _abc1234 qo'shadi).
+# Belgisiz fayl qo'lda yuklangan - uni qayta yozmaymiz
+THUMBNAIL_MARKER = '-thumb'
+_GENERATED_THUMBNAIL = re.compile(rf'{re.escape(THUMBNAIL_MARKER)}(_[A-Za-z0-9]{{7}})?$')
+
+_variants = {}
+_variants_lock = threading.Lock()
+
+
+def modern_formats():
+    formats = []
+    if features.check('avif'):
+        formats.append('avif')
+    if features.check('webp'):
+        formats.append('webp')
+    return formats
+
+
+def fallback_format(name):
+    """Eski brauzerlar uchun format: shaffof PNG o'zicha, qolgani JPEG"""
+    return 'png' if name.lower().endswith('.png') else 'jpeg'
+
+
+def _ext(fmt):
+    return 'jpg' if fmt == 'jpeg' else fmt
+
+
+def derivative_dir(name):
+    stem, _ = posixpath.splitext(name)
+    return posixpath.join(ROOT, stem)
+
+
+def derivative_name(name, width, fmt):
+    return posixpath.join(derivative_dir(name), f'{width}.{_ext(fmt)}')
+
+
+def _encode(image, fmt):
+    if fmt == 'jpeg' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    options = {'optimize': True} if fmt in ('jpeg', 'png') else {}
+    if QUALITY.get(fmt):
+        options['quality'] = QUALITY[fmt]
+    image.save(buffer, format=fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def generate(fieldfile, force=False):
+    """Bitta rasm uchun barcha derivativlarni yasaydi. Yozilgan fayllar sonini qaytaradi."""
+    if not fieldfile:
+        return 0
+    storage = fieldfile.storage
+    name = fieldfile.name
+    written = 0
+
+    with storage.open(name, 'rb') as fh:
+        source = ImageOps.exif_transpose(Image.open(fh))
+        source.load()
+
+    if source.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        source = source.convert('RGBA' if 'transparency' in source.info else 'RGB')
+
+    # Kattalashtirmaymiz: asl o'lchamdan kichik kengliklar + asl kenglik o'zi
+    widths = [w for w in WIDTHS if w < source.width]
+    if source.width <= WIDTHS[-1]:
+        widths.append(source.width)
+
+    formats = modern_formats() + [fallback_format(name)]
+    for width in widths:
+        resized = source
+        if source.width > width:
+            height = round(source.height * width / source.width)
+            resized = source.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            target = derivative_name(name, width, fmt)
+            if not force and storage.exists(target):
+                continue
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(_encode(resized, fmt)))
+            written += 1
+
+    with _variants_lock:
+        _variants.pop(name, None)
+    return written
+
+
+def generate_safely(fieldfile, force=False):
+    """Upload jarayonini buzmasdan derivativ yasaydi"""
+    try:
+        return generate(fieldfile, force=force)
+    except FileNotFoundError:
+        logger.warning('Rasm fayli topilmadi: %s', fieldfile.name)
+        return 0
+    except (OSError, ValueError):
+        logger.exception('Derivativ yasab bo\'lmadi: %s', fieldfile.name)
+        return 0
+
+
+def ensure(fieldfile):
+    """Derivativlar hali yo'q bo'lsa yasaydi (har save da rasmni qayta o'qimaslik uchun)"""
+    if not fieldfile or fieldfile.storage.exists(derivative_dir(fieldfile.name)):
+        return 0
+    return generate_safely(fieldfile)
+
+
+def variants(fieldfile):
+    """
+    {format: [(kenglik, url), ...]} - mavjud derivativlar.
+    LAZY rejimida yo'q bo'lsa birinchi so'rovda yasaladi. Natija jarayon ichida keshlanadi.
+    """
+    name = fieldfile.name
+    cached = _variants.get(name)
+    if cached is not None:
+        return cached
+
+    storage = fieldfile.storage
+    directory = derivative_dir(name)
+    try:
+        files = storage.listdir(directory)[1] if storage.exists(directory) else []
+    except (OSError, NotImplementedError):
+        files = []
+    if not files and LAZY:
+        if generate_safely(fieldfile):
+            files = storage.listdir(directory)[1]
+
+    result = {}
+    for filename in files:
+        stem, ext = os.path.splitext(filename)
+        if not stem.isdigit():
+            continue
+        fmt = 'jpeg' if ext == '.jpg' else ext.lstrip('.')
+        url = storage.url(posixpath.join(directory, filename))
+        result.setdefault(fmt, []).append((int(stem), url))
+    for entries in result.values():
+        entries.sort()
+
+    with _variants_lock:
+        _variants[name] = result
+    return result
+
+
+def is_generated_thumbnail(name):
+    return bool(_GENERATED_THUMBNAIL.search(posixpath.splitext(posixpath.basename(name or ''))[0]))
+
+
+def make_thumbnail(instance, source_field, thumb_field, force=False):
+    """
+    Course/News uchun bo'sh thumbnail maydonini to'ldiradi. O'zimiz yasagan thumbnail
+    asosiy rasm almashganda (yoki force) yangilanadi, qo'lda yuklangani tegilmaydi.
+    """
+    source = getattr(instance, source_field)
+    thumbnail = getattr(instance, thumb_field)
+    if not source:
+        return False
+    source_stem = posixpath.splitext(posixpath.basename(source.name))[0]
+    old_name = thumbnail.name if thumbnail else None
+    if old_name:
+        if not is_generated_thumbnail(old_name):
+            return False
+        is_stale = not posixpath.basename(old_name).startswith(source_stem + THUMBNAIL_MARKER)
+        if not is_stale and not force:
+            return False
+
+    with source.storage.open(source.name, 'rb') as fh:
+        image = ImageOps.exif_transpose(Image.open(fh))
+        image.load()
+    image.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_WIDTH * 4), Image.LANCZOS)
+
+    fmt = fallback_format(source.name)
+    filename = f'{source_stem}{THUMBNAIL_MARKER}.{_ext(fmt)}'
+    thumbnail.save(filename, ContentFile(_encode(image, fmt)), save=False)
+    # save() chaqirmaymiz - signal va auto_now qayta ishlamasin
+    type(instance)._default_manager.filter(pk=instance.pk).update(**{thumb_field: thumbnail.name})
+    if old_name and old_name != thumbnail.name:
+        # Eski (o'zimiz yasagan) fayl yetim qolmasin
+        thumbnail.storage.delete(old_name)
+    return True
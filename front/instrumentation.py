@@ -0,0 +1,168 @@
+"""
+PolyglotLC - So'rovlar narxini o'lchash
+Tanlangan (sample) so'rovlar uchun SQL soni, DB vaqti, shablon va view vaqti
+yig'iladi: Server-Timing sarlavhasi va URL nomi bo'yicha halqa buferi (jarayon
+ichida). Admin dagi "Unumdorlik" sahifasi buferdan p50/p95/p99 ni ko'rsatadi.
+
+Tanlanmagan so'rovlarga qo'shimcha ish - bitta random() va ContextVar.get().
+Ulanishlarga execute_wrapper bir marta o'rnatiladi va joriy o'lchov ContextVar
+da turadi - sync_to_async oqimlariga ham o'tadi.
+"""
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+SAMPLE_RATE = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 1.0 if settings.DEBUG else 0.01)
+BUFFER_SIZE = getattr(settings, 'INSTRUMENTATION_BUFFER_SIZE', 500)
+# True - hamma so'rovlarga, False - faqat xodimlarga (staff)
+SERVER_TIMING_PUBLIC = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING_PUBLIC', settings.DEBUG)
+METRICS = ('total', 'view', 'db', 'queries', 'template')
+UNRESOLVED = '<unresolved>'
+
+_current = ContextVar('instrumentation', default=None)
+_buffers = {}
+_lock = threading.Lock()
+
+
+class Timings:
+    """Bitta so'rovning o'lchovlari (vaqtlar - millisekund)"""
+
+    __slots__ = ('start', 'view_start', 'total', 'view', 'db', 'queries', 'template')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = None
+        self.total = self.view = self.db = self.template = 0.0
+        self.queries = 0
+
+    def finish(self):
+        now = time.perf_counter()
+        self.total = (now - self.start) * 1000
+        if self.view_start is not None:
+            self.view = (now - self.view_start) * 1000
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db:.1f};desc="{self.queries} SQL"',
+            f'tpl;dur={self.template:.1f}',
+            f'view;dur={self.view:.1f}',
+            f'total;dur={self.total:.1f}',
+        ])
+
+
+def should_sample():
+    return SAMPLE_RATE >= 1 or (SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE)
+
+
+def start():
+    timings = Timings()
+    return timings, _current.set(timings)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+# ==================== SQL ====================
+def _execute_wrapper(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    began = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += (time.perf_counter() - began) * 1000
+        timings.queries += 1
+
+
+def _attach(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+# ==================== SHABLONLAR ====================
+def _patch_templates():
+    """Backend Template.render - har bir render() uchun bir marta (include lar ichida)"""
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, 'instrumented', False):
+        return
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return original(self, context, request)
+        began = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            timings.template += (time.perf_counter() - began) * 1000
+
+    render.instrumented = True
+    Template.render = render
+
+
+def install():
+    """FrontConfig.ready dan chaqiriladi"""
+    connection_created.connect(_attach, dispatch_uid='front.instrumentation')
+    for connection in connections.all(initialized_only=True):
+        _attach(connection)
+    _patch_templates()
+
+
+# ==================== HALQA BUFERI ====================
+def record(name, timings):
+    sample = tuple(getattr(timings, metric) for metric in METRICS)
+    # summary() nusxa olayotganda deque o'zgarmasligi kerak
+    with _lock:
+        buffer = _buffers.get(name)
+        if buffer is None:
+            buffer = _buffers[name] = deque(maxlen=BUFFER_SIZE)
+        buffer.append(sample)
+
+
+def percentile(values, fraction):
+    """Eng yaqin rang usuli - values saralangan bo'lishi kerak"""
+    if not values:
+        return 0
+    index = max(0, min(len(values), math.ceil(fraction * len(values))) - 1)
+    return values[index]
+
+
+def summary():
+    """[{'name', 'samples', 'total': {'p50', 'p95', 'p99'}, ...}] - p95 bo'yicha kamayish tartibida"""
+    with _lock:
+        snapshot = {name: list(buffer) for name, buffer in _buffers.items()}
+    rows = []
+    for name, samples in snapshot.items():
+        if not samples:
+            continue
+        row = {'name': name, 'samples': len(samples)}
+        for position, metric in enumerate(METRICS):
+            values = sorted(sample[position] for sample in samples)
+            row[metric] = {
+                'p50': percentile(values, 0.50),
+                'p95': percentile(values, 0.95),
+                'p99': percentile(values, 0.99),
+            }
+        rows.append(row)
+    rows.sort(key=lambda row: row['total']['p95'], reverse=True)
+    return rows
+
+
+def reset():
+    with _lock:
+        _buffers.clear()
@@ -0,0 +1,106 @@
+"""
+PolyglotLC - Fon vazifalari
+`manage.py runworker` bajaradi (front.tasks).
+"""
+import logging
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
+from import_export.signals import post_import
+
+from . import certificate_render
+from .models import Certificate, Teacher, TeacherApplication
+from .tasks import staging_storage, task
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== O'QITUVCHI ARIZALARI ====================
+@task(priority=10, max_attempts=5)
+def attach_application_files(application_id, files):
+    """
+    Staging dagi fayllarni arizaga biriktiradi.
+    files: {maydon: [staging nomi, asl nomi]}
+    """
+    application = TeacherApplication.objects.filter(pk=application_id).first()
+    if application is not None:
+        for field, (staged, original) in files.items():
+            with staging_storage.open(staged, 'rb') as fh:
+                getattr(application, field).save(original, File(fh), save=False)
+        application.save(update_fields=list(files))
+    else:
+        logger.warning('Ariza topilmadi: %s', application_id)
+    for staged, _ in files.values():
+        staging_storage.delete(staged)
+
+
+@task
+def create_teachers_from_applications(application_ids):
+    """Qabul qilingan arizalardan o'qituvchi yaratadi. Yaratilganlar sonini qaytaradi."""
+    created = 0
+    applications = TeacherApplication.objects.filter(pk__in=application_ids, status='accepted')
+    for app in applications.select_related('subject'):
+        with transaction.atomic():
+            teacher, is_new = Teacher.objects.get_or_create(
+                first_name=app.first_name, last_name=app.last_name,
+                defaults={'phone': app.phone, 'email': app.email, 'education': app.education,
+                          'experience_years': app.experience_years, 'bio': app.about_me[:500],
+                          'full_bio': app.about_me + '\n\n' + app.why_teach, 'photo': app.photo}
+            )
+            if is_new and app.subject:
+                teacher.specializations.add(app.subject)
+                created += 1
+    return created
+
+
+# ==================== SERTIFIKATLAR ====================
+@task(max_attempts=1)
+def render_certificates(certificate_ids, base_url='', processes=None):
+    """Tanlangan sertifikatlar rasmini kurs shablonidan yaratadi"""
+    return certificate_render.render_queryset(
+        Certificate.objects.filter(pk__in=certificate_ids), processes=processes, base_url=base_url,
+    )
+
+
+# ==================== IMPORT ====================
+@task(max_attempts=1)
+def import_file(model_label, staged, format_index, resource_index, file_name, user_id):
+    """
+    Admin da tasdiqlangan importni bajaradi (BackgroundImportMixin navbatga qo'yadi).
+    Xatoli qatorlar bo'lsa tranzaksiya qaytariladi va vazifa xato bilan tugaydi.
+    """
+    model = apps.get_model(model_label)
+    model_admin = admin.site._registry[model]
+    try:
+        input_format = model_admin.get_import_formats()[format_index](encoding='utf-8')
+        with staging_storage.open(staged, 'rb') as fh:
+            data = fh.read()
+        if not input_format.is_binary():
+            data = data.decode('utf-8')
+        dataset = input_format.create_dataset(data)
+
+        resource_class = model_admin.get_import_resource_classes(None)[resource_index]
+        resource = resource_class(**model_admin.get_import_resource_kwargs(None))
+        user = get_user_model().objects.filter(pk=user_id).first()
+        result = resource.import_data(
+            dataset, dry_run=False, file_name=file_name, user=user,
+            retain_instance_in_row_result=True,
+        )
+    finally:
+        staging_storage.delete(staged)
+
+    if result.has_errors() or result.has_validation_errors():
+        errors = [f'{line}: {error.error!r}' for line, row_errors in result.row_errors() for error in row_errors]
+        errors += [f'{row.number}: {row.error_dict}' for row in result.invalid_rows]
+        raise ValueError(f'{file_name}: import bekor qilindi\n' + '\n'.join(errors[:50]))
+
+    if user is not None:
+        # Admin tarixi uchun: generate_log_entries faqat request.user ni o'qiydi
+        model_admin.generate_log_entries(result, SimpleNamespace(user=user))
+    post_import.send(sender=None, model=model)
+    logger.info('Import tugadi: %s %s, %.0f qator/s', file_name, dict(result.totals),
+                getattr(result, 'rows_per_second', 0.0))
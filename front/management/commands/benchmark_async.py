@@ -0,0 +1,87 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+
+from front import page_cache
+
+
+def summary(latencies, elapsed):
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+    return {
+        'mean': statistics.fmean(ordered) * 1000,
+        'p50': pct(0.50), 'p95': pct(0.95), 'p99': pct(0.99),
+        'rps': len(ordered) / elapsed,
+    }
+
+
+class Command(BaseCommand):
+    help = ("Async view larni ASGI (parallel va ketma-ket ORM o'qishlari) hamda "
+            "WSGI ostida bir vaqtdagi so'rovlar bilan o'lchaydi")
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', default=['/', '/biz-haqimizda/'])
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=500, help="Har bir rejim uchun so'rovlar soni")
+
+    def handle(self, *args, **options):
+        concurrency, total = options['concurrency'], options['requests']
+        # Sahifa keshi o'lchovni buzmasin - har so'rov view ni to'liq bajaradi
+        enabled, page_cache.ENABLED = page_cache.ENABLED, False
+        try:
+            for url in options['urls']:
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f'{url}  ({total} so\'rov, bir vaqtda {concurrency})'
+                ))
+                self.stdout.write(f'  {"Rejim":<16} {"mean":>9} {"p50":>9} {"p95":>9} {"p99":>9} {"req/s":>8}')
+                self.report('ASGI parallel', asyncio.run(self.run_asgi(url, concurrency, total, fanout=True)))
+                self.report('ASGI ketma-ket', asyncio.run(self.run_asgi(url, concurrency, total, fanout=False)))
+                self.report('WSGI', self.run_wsgi(url, concurrency, total))
+        finally:
+            page_cache.ENABLED = enabled
+
+    def report(self, mode, result):
+        self.stdout.write(
+            f'  {mode:<16} {result["mean"]:>7.1f}ms {result["p50"]:>7.1f}ms '
+            f'{result["p95"]:>7.1f}ms {result["p99"]:>7.1f}ms {result["rps"]:>8.1f}'
+        )
+
+    async def run_asgi(self, url, concurrency, total, fanout):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.status_code
+
+        with override_settings(ASYNC_FANOUT=fanout):
+            await client.get(url)  # isitish
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            elapsed = time.perf_counter() - started
+        return summary(latencies, elapsed)
+
+    def run_wsgi(self, url, concurrency, total):
+        def one(_):
+            client = Client()
+            started = time.perf_counter()
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - started
+
+        Client().get(url)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(one, range(total)))
+        return summary(latencies, time.perf_counter() - started)
@@ -0,0 +1,269 @@
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import AddIndex
+from django.utils import timezone
+
+from front.models import (
+    User, Subject, Teacher, Course, Certificate, News, GalleryCategory, Gallery,
+    Testimonial, FAQCategory, FAQ,
+)
+
+
+# O'lchanadigan indekslar - baza oxirigacha migratsiya qilinadi (modellar bilan bir xil
+# sxema), shu migratsiyadagi indekslar olib tashlanib, o'lchovdan keyin qayta yaratiladi
+INDEX_MIGRATION = '0006_hot_query_indexes'
+
+# Jami qatorlarning modellar bo'yicha ulushi
+SHARES = {
+    'teachers': 0.05, 'courses': 0.20, 'news': 0.25, 'gallery': 0.20,
+    'certificates': 0.20, 'testimonials': 0.08, 'faqs': 0.02,
+}
+
+
+def hot_queries():
+    """
+    front/views.py dagi issiq so'rovlar: (nom, queryset).
+    Nomi `count` bilan tugaganlari Paginator/about dagi COUNT(*) sifatida o'lchanadi.
+    """
+    subject = Subject.objects.filter(is_active=True).first()
+    course = Course.objects.filter(is_active=True).first()
+    teacher = Teacher.objects.filter(is_active=True).first()
+    category = GalleryCategory.objects.first()
+    courses = Course.objects.filter(is_active=True)
+    news = News.objects.filter(is_published=True)
+    return [
+        ('home: popular_courses', courses.filter(is_popular=True)[:6]),
+        ('home: featured_teachers', Teacher.objects.filter(is_active=True, is_featured=True)[:4]),
+        ('home: testimonials', Testimonial.objects.filter(is_approved=True, is_featured=True)[:6]),
+        ('home: latest_news', news.order_by('-publish_date')[:3]),
+        ('courses_list', courses.order_by('-created_at')[:12]),
+        ('courses_list: count', courses.order_by().values('pk')),
+        ('courses_list: subject', courses.filter(subject__slug=subject.slug).order_by('-created_at')[:12]),
+        ('course_detail: related', courses.filter(subject=course.subject).exclude(id=course.id)[:3]),
+        ('course_detail: testimonials', Testimonial.objects.filter(course=course, is_approved=True)[:6]),
+        ('teachers_list', Teacher.objects.filter(is_active=True)[:12]),
+        ('teacher_detail: courses', courses.filter(teachers=teacher)[:6]),
+        ('news_list', news.order_by('-publish_date')[:9]),
+        ('news_list: count', news.order_by().values('pk')),
+        ('news_list: featured', news.filter(is_featured=True)[:3]),
+        ('news_detail: related', news.exclude(id=1).order_by('-publish_date')[:3]),
+        ('gallery', Gallery.objects.order_by('-created_at')[:24]),
+        ('gallery: category', Gallery.objects.filter(category__slug=category.slug).order_by('-created_at')[:24]),
+        ('about: teachers_count', Teacher.objects.filter(is_active=True).order_by().values('pk')),
+        ('faq', FAQ.objects.filter(is_active=True)),
+        ('certificates', Certificate.objects.order_by('-issue_date')[:12]),
+        ('certificates: course', Certificate.objects.filter(course__slug=course.slug).order_by('-issue_date')[:12]),
+        ('subjects', Subject.objects.filter(is_active=True)),
+    ]
+
+
+def to_sql(name, queryset):
+    sql, params = queryset.query.sql_with_params()
+    if is_count(name):
+        sql = f'SELECT COUNT(*) FROM ({sql}) subquery'
+    return sql, params
+
+
+def is_count(name):
+    return name.endswith('count')
+
+
+def explain(name, queryset):
+    sql, params = to_sql(name, queryset)
+    with connection.cursor() as c:
+        c.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in c.fetchall()]
+
+
+def timed(name, queryset, repeat=5):
+    """Eng yaxshi natija (ms)"""
+    sql, params = to_sql(name, queryset)
+    best = None
+    with connection.cursor() as c:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            c.execute(sql, params)
+            c.fetchall()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def hot_query_indexes():
+    """INDEX_MIGRATION dagi indekslar: [(model, index)] - joriy model ta'rifi bo'yicha"""
+    migration = MigrationLoader(None, ignore_no_migrations=True).get_migration('front', INDEX_MIGRATION)
+    names = {(op.model_name, op.index.name) for op in migration.operations if isinstance(op, AddIndex)}
+    return [
+        (model, index)
+        for model in apps.get_app_config('front').get_models()
+        for index in model._meta.indexes
+        if (model._meta.model_name, index.name) in names
+    ]
+
+
+def is_full_scan(detail):
+    """`SCAN jadval` - indekssiz, butun jadval o'qiladi"""
+    return detail.startswith('SCAN front_') and 'INDEX' not in detail
+
+
+class Command(BaseCommand):
+    help = ("Vaqtinchalik SQLite bazaga ko'p qator yozib, issiq so'rovlarning "
+            "EXPLAIN QUERY PLAN natijasini indekslardan oldin va keyin ko'rsatadi")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help="Jami qatorlar soni")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--keep', action='store_true', help="Vaqtinchalik bazani o'chirmaslik")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Benchmark faqat SQLite uchun")
+
+        workdir = tempfile.mkdtemp(prefix='plc-benchmark-')
+        original_name = connection.settings_dict['NAME']
+        connection.close()
+        connection.settings_dict['NAME'] = os.path.join(workdir, 'benchmark.sqlite3')
+        try:
+            self.run(options)
+        finally:
+            connection.close()
+            connection.settings_dict['NAME'] = original_name
+            if options['keep']:
+                self.stdout.write(f'Baza saqlandi: {workdir}')
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    def run(self, options):
+        call_command('migrate', 'front', verbosity=0)
+        indexes = hot_query_indexes()
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.remove_index(model, index)
+        started = time.perf_counter()
+        total = self.seed(options['rows'], random.Random(options['seed']))
+        self.stdout.write(f'{total} qator yozildi ({time.perf_counter() - started:.1f} s)\n')
+
+        before = self.measure()
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+        after = self.measure()
+
+        scans = 0
+        for name in before:
+            plan_before, ms_before = before[name]
+            plan_after, ms_after = after[name]
+            full = any(is_full_scan(d) for d in plan_after)
+            if full and is_count(name):
+                # COUNT(*) mos keladigan barcha qatorlarni baribir sanaydi
+                status = self.style.WARNING('COUNT')
+            elif full:
+                scans += 1
+                status = self.style.ERROR('FULL SCAN')
+            else:
+                status = self.style.SUCCESS('OK')
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name}  [{status}]'))
+            self.stdout.write(f'  oldin ({ms_before:.2f} ms):')
+            for detail in plan_before:
+                self.stdout.write(f'    {detail}')
+            self.stdout.write(f'  keyin ({ms_after:.2f} ms):')
+            for detail in plan_after:
+                self.stdout.write(f'    {detail}')
+
+        if scans:
+            self.stdout.write(self.style.WARNING(f'\n{scans} ta so\'rov hali ham to\'liq skan qiladi'))
+        else:
+            self.stdout.write(self.style.SUCCESS('\nBirorta issiq so\'rov to\'liq skan qilmaydi'))
+
+    def measure(self):
+        with connection.cursor() as c:
+            c.execute('ANALYZE')
+        return {name: (explain(name, qs), timed(name, qs)) for name, qs in hot_queries()}
+
+    def seed(self, rows, rnd):
+        """bulk_create bilan yozadi - signallar (kesh, qidiruv, rasmlar) ishlamaydi"""
+        counts = {key: max(1, int(rows * share)) for key, share in SHARES.items()}
+        batch = 2000
+        now = timezone.now()
+
+        def past(days):
+            return now - datetime.timedelta(days=rnd.randint(0, days), seconds=rnd.randint(0, 86400))
+
+        author = User.objects.create(username='benchmark')
+        subjects = Subject.objects.bulk_create(
+            Subject(name=f'Fan {i}', slug=f'fan-{i}', order=i, is_active=rnd.random() < 0.9)
+            for i in range(40)
+        )
+        categories = GalleryCategory.objects.bulk_create(
+            GalleryCategory(name=f'Kategoriya {i}', slug=f'kategoriya-{i}', order=i) for i in range(30)
+        )
+        faq_categories = FAQCategory.objects.bulk_create(FAQCategory(name=f'FAQ {i}', order=i) for i in range(10))
+
+        teachers = Teacher.objects.bulk_create((
+            Teacher(
+                first_name=f'Ism{i}', last_name='Familiya', slug=f'teacher-{i}', photo='teachers/t.jpg',
+                phone='+998900000000', education='TSUL', experience_years=rnd.randint(0, 20),
+                bio='bio', full_bio='bio', order=rnd.randint(0, 50),
+                is_active=rnd.random() < 0.9, is_featured=rnd.random() < 0.05,
+            ) for i in range(counts['teachers'])
+        ), batch_size=batch)
+
+        courses = Course.objects.bulk_create((
+            Course(
+                title=f'Kurs {i}', slug=f'course-{i}', subject=rnd.choice(subjects), main_image='courses/c.jpg',
+                short_description='qisqa', full_description='to\'liq', duration_months=rnd.randint(1, 12),
+                price=rnd.randint(100, 2000) * 1000, what_you_learn='w', target_audience='t',
+                order=rnd.randint(0, 50), is_active=rnd.random() < 0.9,
+                is_featured=rnd.random() < 0.05, is_popular=rnd.random() < 0.05,
+            ) for i in range(counts['courses'])
+        ), batch_size=batch)
+        Course.teachers.through.objects.bulk_create((
+            Course.teachers.through(course_id=course.pk, teacher_id=rnd.choice(teachers).pk)
+            for course in courses
+        ), batch_size=batch)
+
+        News.objects.bulk_create((
+            News(
+                title=f'Yangilik {i}', slug=f'news-{i}', main_image='news/n.jpg', short_description='qisqa',
+                content='matn', author=author, publish_date=past(1500),
+                is_published=rnd.random() < 0.9, is_featured=rnd.random() < 0.03,
+            ) for i in range(counts['news'])
+        ), batch_size=batch)
+
+        Gallery.objects.bulk_create((
+            Gallery(image='gallery/g.jpg', category=rnd.choice(categories), is_featured=rnd.random() < 0.05)
+            for _ in range(counts['gallery'])
+        ), batch_size=batch)
+
+        Certificate.objects.bulk_create((
+            Certificate(
+                student_name=f'Talaba {i}', course=rnd.choice(courses), teacher=rnd.choice(teachers),
+                certificate_image='certificates/c.jpg', certificate_number=f'PLC-BENCH-{i:07d}',
+                issue_date=past(1500).date(),
+            ) for i in range(counts['certificates'])
+        ), batch_size=batch)
+
+        Testimonial.objects.bulk_create((
+            Testimonial(
+                student_name=f'Talaba {i}', course=rnd.choice(courses), comment='sharh',
+                is_approved=rnd.random() < 0.7, is_featured=rnd.random() < 0.05,
+            ) for i in range(counts['testimonials'])
+        ), batch_size=batch)
+
+        FAQ.objects.bulk_create((
+            FAQ(category=rnd.choice(faq_categories), question='Savol?', answer='Javob',
+                order=rnd.randint(0, 100), is_active=rnd.random() < 0.9)
+            for _ in range(counts['faqs'])
+        ), batch_size=batch)
+
+        return sum(counts.values())
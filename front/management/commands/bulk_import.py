@@ -0,0 +1,76 @@
+import os
+import time
+
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from import_export.formats import base_formats
+from import_export.instance_loaders import ModelInstanceLoader
+from import_export.results import RowResult
+
+FORMATS = {'csv': base_formats.CSV, 'json': base_formats.JSON, 'xlsx': base_formats.XLSX}
+
+
+def per_row(resource_class):
+    """Taqqoslash uchun: odatiy import (har qator alohida qidiriladi va saqlanadi, diff bilan)"""
+    meta = type('Meta', (), {'use_bulk': False, 'skip_diff': False, 'instance_loader_class': ModelInstanceLoader})
+    return type(f'PerRow{resource_class.__name__}', (resource_class,), {'Meta': meta})
+
+
+class Command(BaseCommand):
+    help = ("Faylni admin resource (TeacherResource, CourseResource, CertificateResource ...) "
+            "orqali import qiladi va tezlikni (qator/s) ko'rsatadi")
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="Masalan: certificate yoki front.certificate")
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=sorted(FORMATS), help="Standart: fayl kengaytmasidan")
+        parser.add_argument('--dry-run', action='store_true', help="Import qilib, tranzaksiyani qaytarish")
+        parser.add_argument('--per-row', action='store_true', help="Ommaviy rejimsiz (taqqoslash uchun)")
+
+    def handle(self, *args, **options):
+        label = options['model'] if '.' in options['model'] else f"front.{options['model']}"
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            raise CommandError(f'Model topilmadi: {label}')
+        model_admin = admin.site._registry.get(model)
+        if model_admin is None or not hasattr(model_admin, 'get_import_resource_classes'):
+            raise CommandError(f'{label} uchun import resource yo\'q')
+
+        fmt = options['format'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if fmt not in FORMATS:
+            raise CommandError(f'Noma\'lum format: {fmt}')
+        input_format = FORMATS[fmt]()
+        with open(options['path'], 'rb') as fh:
+            data = fh.read()
+        if not input_format.is_binary():
+            data = data.decode('utf-8-sig')
+        dataset = input_format.create_dataset(data)
+
+        resource_class = model_admin.get_import_resource_classes(None)[0]
+        if options['per_row']:
+            resource_class = per_row(resource_class)
+
+        started = time.perf_counter()
+        result = resource_class().import_data(dataset, dry_run=options['dry_run'], use_transactions=True)
+        elapsed = time.perf_counter() - started
+
+        for line, errors in result.row_errors():
+            for error in errors:
+                self.stderr.write(f'{line}-qator: {error.error!r}')
+        for row in result.invalid_rows:
+            self.stderr.write(f'{row.number}-qator: {row.error_dict}')
+        for error in result.base_errors:
+            self.stderr.write(repr(error.error))
+
+        totals = result.totals
+        self.stdout.write(
+            f"{result.total_rows} qator: {totals[RowResult.IMPORT_TYPE_NEW]} yangi, "
+            f"{totals[RowResult.IMPORT_TYPE_UPDATE]} yangilandi, {totals[RowResult.IMPORT_TYPE_SKIP]} o'tkazildi, "
+            f"{totals[RowResult.IMPORT_TYPE_ERROR] + totals[RowResult.IMPORT_TYPE_INVALID]} xato"
+        )
+        rate = result.total_rows / elapsed if elapsed else 0
+        style = self.style.ERROR if result.has_errors() or result.has_validation_errors() else self.style.SUCCESS
+        suffix = ' (dry-run, qaytarildi)' if options['dry_run'] else ''
+        self.stdout.write(style(f'{elapsed:.2f} s, {rate:.0f} qator/s{suffix}'))
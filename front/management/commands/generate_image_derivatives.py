@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from front import images
+
+
+class Command(BaseCommand):
+    help = "Mavjud media/ rasmlari uchun derivativlar va thumbnaillarni yasaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help="Masalan: front.course front.gallery (bo'sh - hammasi)")
+        parser.add_argument('--force', action='store_true', help="Mavjud derivativlarni qayta yasash")
+
+    def handle(self, *args, **options):
+        labels = options['models'] or list(images.IMAGE_FIELDS)
+        unknown = set(labels) - set(images.IMAGE_FIELDS)
+        if unknown:
+            raise CommandError(f"Noma'lum model: {', '.join(sorted(unknown))}")
+
+        for label in labels:
+            model = apps.get_model(label)
+            written = thumbs = failed = 0
+            for obj in model._default_manager.order_by('pk').iterator(chunk_size=200):
+                for field in images.IMAGE_FIELDS[label]:
+                    fieldfile = getattr(obj, field)
+                    if not fieldfile:
+                        continue
+                    try:
+                        written += images.generate(fieldfile, force=options['force'])
+                    except (OSError, ValueError) as exc:
+                        failed += 1
+                        self.stderr.write(f'{label} #{obj.pk} {fieldfile.name}: {exc}')
+                if label in images.THUMBNAIL_FIELDS:
+                    try:
+                        thumbs += images.make_thumbnail(obj, *images.THUMBNAIL_FIELDS[label], force=options['force'])
+                    except OSError:
+                        pass
+            self.stdout.write(f'{label}: {written} fayl, {thumbs} thumbnail, {failed} xato')
+        self.stdout.write(self.style.SUCCESS('Tayyor'))
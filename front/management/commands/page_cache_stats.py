@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from front import page_cache
+
+
+class Command(BaseCommand):
+    help = "Sahifa keshi statistikasi (hit/miss/bypass)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Statistikani nolga tushirish")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            page_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Statistika tozalandi'))
+            return
+
+        totals = page_cache.stats()
+        if not totals:
+            self.stdout.write('Hali ma\'lumot yo\'q')
+            return
+        self.stdout.write(f'{"View":<20} {"Hit":>8} {"Miss":>8} {"Bypass":>8} {"Hit %":>7}')
+        for view_name, entry in sorted(totals.items()):
+            self.stdout.write(
+                f'{view_name:<20} {entry["hit"]:>8} {entry["miss"]:>8} {entry["bypass"]:>8} '
+                f'{entry["hit_ratio"] * 100:>6.1f}%'
+            )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from front import search
+
+
+class Command(BaseCommand):
+    help = "Qidiruv indeksini (FTS5) noldan qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help="Masalan: front.course front.news (bo'sh - hammasi)")
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            raise CommandError("Qidiruv indeksi faqat SQLite da ishlaydi")
+        unknown = set(options['models']) - set(search.REGISTRY)
+        if unknown:
+            raise CommandError(f"Noma'lum model: {', '.join(sorted(unknown))}")
+
+        counts = search.rebuild(options['models'] or None, chunk_size=options['chunk_size'])
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS('Indeks qayta qurildi'))
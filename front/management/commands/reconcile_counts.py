@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from front import denorm
+
+
+class Command(BaseCommand):
+    help = "Denormallashgan hisoblagichlarni qayta sanaydi va farqlarni tuzatadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Faqat farqlarni ko'rsatish")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            result = denorm.reconcile(dry_run=options['dry_run'], batch_size=options['batch_size'])
+
+        total = 0
+        for tally, drifted in result.items():
+            target = tally.field if tally.is_global else f'{tally.target}.{tally.field}'
+            self.stdout.write(f'{target:<45} {drifted:>6}')
+            total += drifted
+        verb = 'farq topildi' if options['dry_run'] else 'qator tuzatildi'
+        self.stdout.write(self.style.SUCCESS(f'Jami: {total} {verb}'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from front import certificate_render
+from front.models import Certificate
+
+
+class Command(BaseCommand):
+    help = "Sertifikat rasmlarini kurs shablonidan yaratadi (standart: rasmi yo'q sertifikatlar)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', help="Kurs slug i")
+        parser.add_argument('--force', action='store_true', help="Rasmi bor sertifikatlarni ham qayta chizish")
+        parser.add_argument('--processes', type=int, help="Jarayonlar soni (0 - joriy jarayonda)")
+        parser.add_argument('--batch-size', type=int, default=certificate_render.BATCH_SIZE)
+        parser.add_argument('--base-url', default='', help="QR kod uchun sayt manzili, masalan https://example.uz")
+
+    def handle(self, *args, **options):
+        queryset = Certificate.objects.all()
+        if options['course']:
+            queryset = queryset.filter(course__slug=options['course'])
+        if not options['force']:
+            queryset = queryset.filter(certificate_image='')
+
+        result = certificate_render.render_queryset(
+            queryset, processes=options['processes'], batch_size=options['batch_size'],
+            base_url=options['base_url'],
+        )
+        rate = result['rendered'] / result['elapsed'] if result['elapsed'] else 0
+        style = self.style.ERROR if result['failed'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{result['rendered']} ta chizildi, {result['skipped']} ta shablonsiz, {result['failed']} xato - "
+            f"{result['elapsed']:.2f} s, {rate:.0f} ta/s"
+        ))
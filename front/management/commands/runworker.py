@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from front.tasks import Worker
+
+
+class Command(BaseCommand):
+    help = ("Fon vazifalari navbatini (front.tasks) bajaradi. "
+            "SIGINT/SIGTERM da boshlangan vazifalarni tugatib to'xtaydi")
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--concurrency', type=int, default=2, help="Bir vaqtda bajariladigan vazifalar")
+        parser.add_argument('--processes', action='store_true',
+                            help="Oqimlar o'rniga alohida jarayonlar (CPU talab qiladigan vazifalar uchun)")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Navbat bo'sh bo'lganda kutish (s)")
+        parser.add_argument('--burst', action='store_true', help="Navbat bo'shagach to'xtash")
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=max(1, options['concurrency']),
+            processes=options['processes'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+        )
+        mode = 'jarayon' if worker.processes else 'oqim'
+        self.stdout.write(f'Worker {worker.id}: {worker.concurrency} ta {mode}')
+        processed = worker.run()
+        self.stdout.write(self.style.SUCCESS(f'{processed} ta vazifa bajarildi'))
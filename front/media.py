@@ -0,0 +1,181 @@
+"""
+PolyglotLC - Media fayllarni berish
+DEBUG dan tashqarida ham MEDIA_URL ostidagi fayllar shu view orqali beriladi:
+ETag/Last-Modified (304), bitta oraliqli Range so'rovlari (206), sanali
+yo'llarga (courses/2026/01/...) uzoq muddatli kesh.
+
+MEDIA_ACCEL sozlansa baytlarni Django emas, oldidagi proksi yuboradi:
+'x-accel-redirect' (nginx, MEDIA_ACCEL_PREFIX - internal location) yoki
+'x-sendfile' (Apache/lighttpd). Ruxsat tekshiruvi baribir shu yerda bajariladi.
+
+Yopiq fayllar (o'qituvchi arizalari: CV, sertifikatlar) faqat tegishli
+ruxsati bor xodimlarga ko'rinadi, qolganlarga 404.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from . import images
+from .middleware import IMMUTABLE
+
+MAX_AGE = getattr(settings, 'MEDIA_MAX_AGE', 86400)
+# Yo'l prefiksi -> ko'rish uchun kerakli ruxsat
+PRIVATE_PREFIXES = getattr(settings, 'MEDIA_PRIVATE_PREFIXES', {
+    'teacher_applications/': 'front.view_teacherapplication',
+})
+ACCEL = getattr(settings, 'MEDIA_ACCEL', None)
+ACCEL_PREFIX = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+CHUNK_SIZE = 64 * 1024
+
+# upload_to='.../%Y/%m/' - storage bir xil nomni qayta yozmaydi, fayl o'zgarmaydi
+DATED_PATH = re.compile(r'(^|/)\d{4}/\d{2}/')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# ==================== RUXSAT ====================
+def required_permission(name):
+    for prefix, permission in PRIVATE_PREFIXES.items():
+        if name.startswith(prefix):
+            return permission
+    return None
+
+
+def can_view(user, name):
+    permission = required_permission(name)
+    return permission is None or (user.is_active and user.is_staff and user.has_perm(permission))
+
+
+def cache_control(name):
+    if required_permission(name):
+        return 'private, no-cache'
+    # Derivativlar --force bilan shu nomda qayta yasalishi mumkin
+    if DATED_PATH.search(name) and not name.startswith(f'{images.ROOT}/'):
+        return IMMUTABLE
+    return f'public, max-age={MAX_AGE}'
+
+
+# ==================== RANGE ====================
+def parse_range(header, size):
+    """
+    'bytes=0-99' -> (0, 100), 'bytes=-100' -> oxirgi 100 bayt.
+    None - butun fayl beriladi (bir nechta oraliq yoki noto'g'ri sarlavha),
+    ValueError - oraliq fayldan tashqarida (416).
+    """
+    match = RANGE.match(header.strip())
+    if not match or not (match[1] or match[2]):
+        return None
+    if match[1]:
+        start = int(match[1])
+        end = min(int(match[2]) + 1, size) if match[2] else size
+        if start >= size:
+            raise ValueError(header)
+        if end <= start:
+            return None
+    else:
+        suffix = int(match[2])
+        if suffix == 0:
+            raise ValueError(header)
+        start, end = max(0, size - suffix), size
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    """If-Range bo'lmasa yoki fayl o'zgarmagan bo'lsa True"""
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+def iter_range(fh, start, end):
+    try:
+        fh.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = fh.read(min(CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        fh.close()
+
+
+# ==================== VIEW ====================
+def _body(request, path, name, size, content_type, etag, last_modified):
+    if ACCEL == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = ACCEL_PREFIX.rstrip('/') + '/' + quote(name)
+        return response
+    if ACCEL == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+        return response
+
+    byte_range = None
+    header = request.headers.get('Range')
+    if header and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(iter_range(open(path, 'rb'), start, end), content_type=content_type)
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    if byte_range:
+        start, end = byte_range
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end - 1}/{size}'
+        response['Content-Length'] = end - start
+    else:
+        response['Content-Length'] = size
+    return response
+
+
+@require_safe
+def serve(request, path):
+    """MEDIA_ROOT dagi faylni beradi (config/urls.py da MEDIA_URL ga ulangan)"""
+    name = posixpath.normpath(path).lstrip('/')
+    if name.startswith('..') or not can_view(request.user, name):
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+        info = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not stat.S_ISREG(info.st_mode):
+        raise Http404
+
+    etag = f'"{info.st_size:x}-{info.st_mtime_ns:x}"'
+    last_modified = int(info.st_mtime)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _body(request, full_path, name, info.st_size, content_type, etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control(name)
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,327 @@
+"""
+PolyglotLC - Prometheus metrikalari (/metrics)
+So'rovlar (view nomi bo'yicha kechikish gistogrammasi, status kodlar), kesh
+(L1/L2/sahifa keshi hit/miss), SQL (so'rov vaqti va so'rovdagi SQL soni) va biznes
+ko'rsatkichlari (kutilayotgan arizalar, yangi xabarlar, fon vazifalari).
+
+Har bir worker qiymatlarni o'z xotirasida yig'adi (qulf + dict - mikrosekundlar)
+va FLUSH_INTERVAL da bir marta METRICS_DIR/<pid>-<id>.json ga to'liq holatini
+atomik yozadi. Fork dan keyin bola jarayon bo'sh holat va o'z faylidan boshlaydi.
+/metrics barcha fayllarni qo'shib chiqaradi; to'xtagan jarayonlar fayllari
+_archive.json ga qo'shib yuboriladi - hisoblagichlar kamaymaydi.
+Biznes ko'rsatkichlari skreyp paytida hisoblanadi (badge lar bilan bitta SQL).
+
+Kirish: 'Authorization: Bearer <METRICS_TOKEN>'. METRICS_ALLOWED_IPS standart holatda
+bo'sh - bir xostdagi reverse proxy ortida REMOTE_ADDR har doim 127.0.0.1 bo'ladi.
+"""
+import atexit
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+
+ENABLED = getattr(settings, 'METRICS_ENABLED', True)
+DIR = str(getattr(settings, 'METRICS_DIR', settings.BASE_DIR / 'var' / 'metrics'))
+FLUSH_INTERVAL = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+ALLOWED_IPS = getattr(settings, 'METRICS_ALLOWED_IPS', ())
+TOKEN = getattr(settings, 'METRICS_TOKEN', '')
+PREFIX = 'polyglot_'
+ARCHIVE = '_archive.json'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Boshqa metodlar 'other' - label qiymatlari soni cheklangan bo'lsin
+KNOWN_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+_values = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_file_name = None
+_queries = ContextVar('metrics_queries', default=None)
+
+
+def _after_fork():
+    """Oldindan yuklangan (preload) master dan fork qilingan worker o'z holati va fayli bilan boshlaydi"""
+    global _values, _lock, _last_flush, _file_name
+    _values = {}
+    _lock = threading.Lock()
+    _last_flush = time.monotonic()
+    _file_name = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+# ==================== METRIKALAR ====================
+class Metric:
+    def __init__(self, name, kind, help_text, labels=(), buckets=None):
+        self.name = PREFIX + name
+        self.kind = kind
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        REGISTRY[self.name] = self
+
+    def inc(self, *label_values, amount=1):
+        key = (self.name, label_values)
+        with _lock:
+            _values[key] = _values.get(key, 0) + amount
+
+    def observe(self, value, *label_values):
+        """Gistogramma: [bucket1, ..., bucketN, +Inf, sum] (har bir bucket o'zinikigina)"""
+        key = (self.name, label_values)
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            entry = _values.get(key)
+            if entry is None:
+                entry = _values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+
+REGISTRY = {}
+
+REQUESTS = Metric('http_requests_total', 'counter', "HTTP so'rovlar soni", ('view', 'method', 'status'))
+LATENCY = Metric('http_request_duration_seconds', 'histogram', "So'rovni bajarish vaqti", ('view',),
+                 (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+REQUEST_QUERIES = Metric('http_request_db_queries', 'histogram', "Bitta so'rovdagi SQL soni", ('view',),
+                         (0, 1, 2, 5, 10, 20, 50, 100))
+DB_QUERY = Metric('db_query_duration_seconds', 'histogram', "SQL so'rov vaqti", ('alias',),
+                  (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1))
+CACHE = Metric('cache_requests_total', 'counter', "Kesh murojaatlari (layer: l1/l2/page)", ('layer', 'name', 'result'))
+
+
+def cache_event(layer, name, result):
+    if ENABLED:
+        CACHE.inc(layer, name, result)
+
+
+# ==================== SQL ====================
+def _execute_wrapper(execute, sql, params, many, context):
+    began = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        DB_QUERY.observe(time.perf_counter() - began, context['connection'].alias)
+        counter = _queries.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+def _attach(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def install():
+    """FrontConfig.ready dan chaqiriladi"""
+    if not ENABLED:
+        return
+    connection_created.connect(_attach, dispatch_uid='front.metrics')
+    for connection in connections.all(initialized_only=True):
+        _attach(connection)
+    atexit.register(flush)
+
+
+def begin_request():
+    return time.perf_counter(), _queries.set([0])
+
+
+def end_request(request, response, state):
+    started, token = state
+    counter = _queries.get()
+    _queries.reset(token)
+    match = getattr(request, 'resolver_match', None)
+    view_name = match.view_name if match else '<unresolved>'
+    REQUESTS.inc(view_name, request.method if request.method in KNOWN_METHODS else 'other', str(response.status_code))
+    LATENCY.observe(time.perf_counter() - started, view_name)
+    REQUEST_QUERIES.observe(counter[0], view_name)
+    maybe_flush()
+
+
+# ==================== FAYLLAR ====================
+def _snapshot():
+    with _lock:
+        return [[name, list(labels), list(value) if isinstance(value, list) else value]
+                for (name, labels), value in _values.items()]
+
+
+def own_file():
+    """Jarayon fayli: <pid>-<id>.json (birinchi yozishda, fork dan keyin qaytadan)"""
+    global _file_name
+    if _file_name is None:
+        _file_name = f'{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+    return _file_name
+
+
+def _write(path, data):
+    fd, temp = tempfile.mkstemp(dir=DIR, prefix='.tmp-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh)
+    os.replace(temp, path)
+
+
+def flush():
+    """Jarayonning to'liq holati o'z fayliga (qayta yozish - takroriy qo'shilmaydi)"""
+    global _last_flush
+    _last_flush = time.monotonic()
+    try:
+        os.makedirs(DIR, exist_ok=True)
+        _write(os.path.join(DIR, own_file()), {'pid': os.getpid(), 'values': _snapshot()})
+    except OSError:
+        pass
+
+
+def maybe_flush():
+    if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _add(totals, values):
+    for name, labels, value in values:
+        key = (name, tuple(labels))
+        current = totals.get(key)
+        if current is None:
+            totals[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            totals[key] = [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = current + value
+
+
+def collect():
+    """Barcha jarayonlar yig'indisi; to'xtaganlari arxivga ko'chiriladi"""
+    flush()
+    totals = {}
+    with open(os.path.join(DIR, '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(DIR, ARCHIVE)
+        archive = (_read(archive_path) or {}).get('values', [])
+        dead = []
+        for name in os.listdir(DIR):
+            if not name.endswith('.json') or name == ARCHIVE:
+                continue
+            data = _read(os.path.join(DIR, name))
+            if data is None:
+                continue
+            if name != own_file() and not _alive(data['pid']):
+                dead.append((name, data['values']))
+            else:
+                _add(totals, data['values'])
+        if dead:
+            merged = {}
+            _add(merged, archive)
+            for _, values in dead:
+                _add(merged, values)
+            archive = [[name, list(labels), value] for (name, labels), value in merged.items()]
+            _write(archive_path, {'pid': 0, 'values': archive})
+            for name, _ in dead:
+                os.remove(os.path.join(DIR, name))
+    _add(totals, archive)
+    return totals
+
+
+# ==================== BIZNES ====================
+def business_gauges():
+    """[(nom, yordam, [(label dict, qiymat)])] - skreyp paytida"""
+    from django.db.models import Count
+
+    from .models import Task
+    from .utils import get_badge_counts
+
+    badges = get_badge_counts()
+    tasks = dict(Task.objects.order_by().values_list('status').annotate(count=Count('pk')))
+    return [
+        ('courses_active', 'Faol kurslar', [({}, badges['courses'])]),
+        ('enrollments_pending', "Kutilayotgan kursga yozilishlar", [({}, badges['pending_enrollments'])]),
+        ('teacher_applications_pending', "Kutilayotgan o'qituvchi arizalari", [({}, badges['pending_applications'])]),
+        ('contact_messages_new', 'Yangi xabarlar', [({}, badges['new_messages'])]),
+        ('tasks', 'Fon vazifalari holati bo\'yicha',
+         [({'status': status}, tasks.get(status, 0)) for status, _ in Task.STATUS_CHOICES]),
+    ]
+
+
+# ==================== EKSPOZITSIYA ====================
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) or abs(value) >= 1e15 else str(int(value))
+    return str(value)
+
+
+def render(totals, gauges=()):
+    lines = []
+    for metric in REGISTRY.values():
+        series = sorted((labels, value) for (name, labels), value in totals.items() if name == metric.name)
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for label_values, value in series:
+            pairs = list(zip(metric.labels, label_values))
+            if metric.kind != 'histogram':
+                lines.append(f'{metric.name}{_labels(pairs)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(list(metric.buckets) + ['+Inf'], value[:-1]):
+                cumulative += count
+                lines.append(f'{metric.name}_bucket{_labels(pairs + [("le", _number(bound))])} {cumulative}')
+            lines.append(f'{metric.name}_sum{_labels(pairs)} {_number(value[-1])}')
+            lines.append(f'{metric.name}_count{_labels(pairs)} {cumulative}')
+    for name, help_text, samples in gauges:
+        lines.append(f'# HELP {PREFIX}{name} {help_text}')
+        lines.append(f'# TYPE {PREFIX}{name} gauge')
+        for labels, value in samples:
+            lines.append(f'{PREFIX}{name}{_labels(sorted(labels.items()))} {_number(value or 0)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _authorized(request):
+    header = request.headers.get('Authorization', '')
+    if TOKEN and header.startswith('Bearer ') and constant_time_compare(header[7:], TOKEN):
+        return True
+    return request.META.get('REMOTE_ADDR') in ALLOWED_IPS
+
+
+@require_safe
+def view(request):
+    """Prometheus matn formati (config/urls.py da /metrics)"""
+    if not ENABLED or not _authorized(request):
+        raise Http404
+    return HttpResponse(render(collect(), business_gauges()), content_type=CONTENT_TYPE)
@@ -0,0 +1,283 @@
+"""
+PolyglotLC - Middleware
+"""
+import mimetypes
+import os
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from . import instrumentation, metrics, profiling, querylog
+
+
+# ==================== STATIK FAYLLAR ====================
+IMMUTABLE = 'public, max-age=31536000, immutable'
+STATIC_MAX_AGE = getattr(settings, 'STATIC_MAX_AGE', 3600)
+# (Accept-Encoding nomi, fayl qo'shimchasi) - afzallik tartibida
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """'gzip, deflate, br;q=0' -> {'gzip', 'deflate'}"""
+    accepted = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q=') and quality[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class StaticFile:
+    """Diskdagi fayl va uning .br/.gz nusxalari (stat jarayon ichida bir marta)"""
+
+    def __init__(self, path, name, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'image/svg+xml'):
+            self.content_type += '; charset=utf-8'
+        self.last_modified = int(stat.st_mtime)
+        self.cache_control = IMMUTABLE if immutable else f'public, max-age={STATIC_MAX_AGE}'
+        self.variants = {None: (path, stat.st_size)}
+        for encoding, suffix in ENCODINGS:
+            if os.path.isfile(path + suffix):
+                self.variants[encoding] = (path + suffix, os.path.getsize(path + suffix))
+        self.etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def pick(self, accept_encoding):
+        accepted = accepted_encodings(accept_encoding) if len(self.variants) > 1 else ()
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return None
+
+
+class StaticFilesMiddleware:
+    """
+    STATIC_ROOT dagi fayllarni Django o'zi beradi (nginx siz ham):
+    Accept-Encoding bo'yicha .br/.gz nusxa, xeshli nomlarga `immutable` kesh,
+    qolganlariga STATIC_MAX_AGE. Topilmagan fayl keyingi handler ga o'tadi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL or ''
+        if not self.prefix.startswith('/') or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.root = str(settings.STATIC_ROOT)
+        self.files = {}
+        self.lock = threading.Lock()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.serve(request)
+        return self.get_response(request) if response is None else response
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        return await self.get_response(request) if response is None else response
+
+    def _hashed_names(self):
+        if not hasattr(self, '_hashed'):
+            self._hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        return self._hashed
+
+    def find(self, name):
+        static_file = self.files.get(name)
+        if static_file is not None:
+            return static_file
+        try:
+            path = safe_join(self.root, name)
+        except (SuspiciousFileOperation, ValueError):
+            return None
+        if not os.path.isfile(path):
+            return None
+        static_file = StaticFile(path, name, name in self._hashed_names())
+        # Faqat mavjud fayllar keshlanadi - 404 lar xotirani to'ldirmasin
+        with self.lock:
+            self.files[name] = static_file
+        return static_file
+
+    def serve(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        static_file = self.find(request.path[len(self.prefix):])
+        if static_file is None:
+            return None
+
+        encoding = static_file.pick(request.headers.get('Accept-Encoding', ''))
+        path, size = static_file.variants[encoding]
+        etag = static_file.etag if encoding is None else f'{static_file.etag[:-1]}-{encoding}"'
+        response = get_conditional_response(request, etag=etag, last_modified=static_file.last_modified)
+        if response is None:
+            if request.method == 'HEAD':
+                response = HttpResponse(content_type=static_file.content_type)
+            else:
+                response = FileResponse(open(path, 'rb'), content_type=static_file.content_type)
+            response['Content-Length'] = size
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(static_file.last_modified)
+        response['Cache-Control'] = static_file.cache_control
+        if len(static_file.variants) > 1:
+            response['Vary'] = 'Accept-Encoding'
+        return response
+
+
+# ==================== METRIKALAR ====================
+class MetricsMiddleware:
+    """Har bir so'rov: status hisoblagichi, kechikish va SQL soni gistogrammalari (front.metrics)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not metrics.ENABLED:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = metrics.begin_request()
+        response = self.get_response(request)
+        metrics.end_request(request, response, state)
+        return response
+
+    async def __acall__(self, request):
+        state = metrics.begin_request()
+        response = await self.get_response(request)
+        metrics.end_request(request, response, state)
+        return response
+
+
+# ==================== O'LCHOV ====================
+class InstrumentationMiddleware:
+    """
+    Tanlangan so'rovlarda SQL soni/vaqti, shablon, view va umumiy vaqt o'lchanadi
+    (front.instrumentation). Natija URL nomi bo'yicha buferga yoziladi va
+    Server-Timing sarlavhasida qaytadi (DEBUG da hammaga, aks holda xodimlarga).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if instrumentation.SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not instrumentation.should_sample():
+            return self.get_response(request)
+        timings, token = instrumentation.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.stop(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        if not instrumentation.should_sample():
+            return await self.get_response(request)
+        timings, token = instrumentation.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.stop(token)
+        return self.finish(request, response, timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = instrumentation.current()
+        if timings is not None:
+            timings.view_start = time.perf_counter()
+
+    def finish(self, request, response, timings):
+        timings.finish()
+        match = getattr(request, 'resolver_match', None)
+        instrumentation.record(match.view_name if match else instrumentation.UNRESOLVED, timings)
+        user = getattr(request, 'user', None)
+        if instrumentation.SERVER_TIMING_PUBLIC or (user is not None and user.is_staff):
+            response['Server-Timing'] = timings.server_timing()
+        return response
+
+
+# ==================== SQL JURNALI ====================
+class QueryLogMiddleware:
+    """So'rov (request) doirasi: sekin SQL uchun view nomi va N+1 aniqlash (front.querylog)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not querylog.ENABLED:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = querylog.begin(request)
+        try:
+            return self.get_response(request)
+        finally:
+            querylog.end(token)
+
+    async def __acall__(self, request):
+        token = querylog.begin(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            querylog.end(token)
+
+
+# ==================== PROFILASH ====================
+class ProfilingMiddleware:
+    """
+    MIDDLEWARE ro'yxatida oxirgi turadi: imzoli ?_profile= yoki tanlangan URL ning
+    har N-chi so'rovida view ni profiler ostida o'zi chaqiradi (front.profiling).
+    ASGI rejimida ishlamaydi - sync view ni hodisalar siklida chaqirib bo'lmaydi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_async or not profiling.should_profile(request, view_func):
+            return None
+        return profiling.profile_view(request, view_func, view_args, view_kwargs)
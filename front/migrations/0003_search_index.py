@@ -0,0 +1,61 @@
+import re
+
+from django.db import migrations
+
+# Migratsiya vaqtidagi holat - front.search keyin o'zgarsa ham shu ko'rinishda qoladi
+TABLE = 'front_search_index'
+
+REGISTRY = {
+    'front.course': (('title',), ('short_description', 'full_description'), 'is_active'),
+    'front.teacher': (('first_name', 'last_name'), ('education', 'bio'), 'is_active'),
+    'front.news': (('title',), ('short_description', 'content'), 'is_published'),
+    'front.faq': (('question',), ('answer',), 'is_active'),
+    'front.certificate': (('student_name', 'certificate_number'), ('score',), None),
+}
+
+APOSTROPHES = re.compile('[\'`´‘’ʻʼ]')
+
+
+def normalize(text):
+    return APOSTROPHES.sub('', str(text or '')).lower()
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+        "model UNINDEXED, object_id UNINDEXED, visible UNINDEXED, title, body, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    rows = []
+    for label, (title_fields, body_fields, visible_field) in REGISTRY.items():
+        for obj in apps.get_model(label)._default_manager.order_by().iterator():
+            rows.append((
+                label, obj.pk,
+                ' '.join(normalize(getattr(obj, f)) for f in title_fields),
+                ' '.join(normalize(getattr(obj, f)) for f in body_fields),
+                int(bool(getattr(obj, visible_field))) if visible_field else 1,
+            ))
+    with schema_editor.connection.cursor() as c:
+        c.executemany(
+            f'INSERT INTO {TABLE} (model, object_id, title, body, visible) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0002_alter_news_author'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,30 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gallery',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Yangilangan'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='teacher',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Yangilangan'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='testimonial',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Yangilangan'),
+            preserve_default=False,
+        ),
+    ]
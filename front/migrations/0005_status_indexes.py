@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0004_version_stamps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['status', '-created_at'], name='front_contact_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseenrollment',
+            index=models.Index(fields=['status', '-created_at'], name='front_enroll_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacherapplication',
+            index=models.Index(fields=['status', '-created_at'], name='front_teachapp_status_idx'),
+        ),
+    ]
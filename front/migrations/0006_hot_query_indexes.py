@@ -0,0 +1,81 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0005_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['-issue_date'], name='front_cert_issued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['course', '-issue_date'], name='front_cert_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='front_course_active_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', 'order', '-created_at'], name='front_course_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_popular', True)), fields=['-is_featured', 'order', '-created_at'], name='front_course_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['subject', '-is_featured', 'order', '-created_at'], name='front_course_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['subject', '-created_at'], name='front_course_subject_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faq',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='front_faq_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['-created_at'], name='front_gallery_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['category', '-created_at'], name='front_gallery_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-publish_date', '-created_at'], name='front_news_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['-publish_date', '-created_at'], name='front_news_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subject',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='front_subject_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'first_name'], name='front_teacher_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['order', 'first_name'], name='front_teacher_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_approved', True), ('is_featured', True)), fields=['-is_featured', 'order', '-created_at'], name='front_testim_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['course', '-is_featured', 'order', '-created_at'], name='front_testim_course_idx'),
+        ),
+    ]
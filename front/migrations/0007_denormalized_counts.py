@@ -0,0 +1,95 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Migratsiya vaqtidagi front.denorm.TALLIES: (source, relation, target, field, condition)
+ACTIVE = {'is_active': True}
+TALLIES = (
+    ('front.courseenrollment', 'course', 'front.course', 'enrollments_count', {}),
+    ('front.course', 'subject', 'front.subject', 'active_courses_count', ACTIVE),
+    ('front.teacher', 'specializations', 'front.subject', 'active_teachers_count', ACTIVE),
+    ('front.course', 'teachers', 'front.teacher', 'active_courses_count', ACTIVE),
+    ('front.gallery', 'category', 'front.gallerycategory', 'images_count', {}),
+    ('front.faq', 'category', 'front.faqcategory', 'active_faqs_count', ACTIVE),
+    ('front.teacher', None, None, 'active_teachers', ACTIVE),
+    ('front.course', None, None, 'active_courses', ACTIVE),
+)
+
+
+def fill_counts(apps, schema_editor):
+    SiteCounter = apps.get_model('front', 'SiteCounter')
+    for source, relation, target, field, condition in TALLIES:
+        source_model = apps.get_model(source)
+        if relation is None:
+            value = source_model._default_manager.filter(**condition).count()
+            SiteCounter.objects.update_or_create(key=field, defaults={'value': value})
+            continue
+
+        relation_field = source_model._meta.get_field(relation)
+        if relation_field.many_to_many:
+            queryset = relation_field.remote_field.through._default_manager.filter(
+                **{f'{relation_field.m2m_field_name()}__{k}': v for k, v in condition.items()})
+            column = f'{relation_field.m2m_reverse_field_name()}_id'
+        else:
+            queryset = source_model._default_manager.filter(**condition).exclude(
+                **{f'{relation_field.attname}__isnull': True})
+            column = relation_field.attname
+
+        # Bir xil son - bitta UPDATE ... WHERE id IN (...)
+        pks_by_count = {}
+        for pk, count in queryset.order_by().values(column).annotate(n=Count('*')).values_list(column, 'n'):
+            pks_by_count.setdefault(count, []).append(pk)
+        targets = apps.get_model(target)._default_manager
+        targets.update(**{field: 0})
+        for count, pks in pks_by_count.items():
+            for start in range(0, len(pks), 900):
+                targets.filter(pk__in=pks[start:start + 900]).update(**{field: count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0006_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True, verbose_name='Kalit')),
+                ('value', models.IntegerField(default=0, verbose_name='Qiymat')),
+            ],
+            options={
+                'verbose_name': 'Hisoblagich',
+                'verbose_name_plural': 'Hisoblagichlar',
+            },
+        ),
+        migrations.AddField(
+            model_name='faqcategory',
+            name='active_faqs_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Faol savollar'),
+        ),
+        migrations.AddField(
+            model_name='gallerycategory',
+            name='images_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Rasmlar'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='active_courses_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Faol kurslar'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='active_teachers_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name="Faol o'qituvchilar"),
+        ),
+        migrations.AddField(
+            model_name='teacher',
+            name='active_courses_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Faol kurslar'),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0007_denormalized_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Vazifa')),
+                ('args', models.JSONField(blank=True, default=list, verbose_name='Argumentlar')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='Nomli argumentlar')),
+                ('priority', models.SmallIntegerField(default=0, help_text='Kattasi oldin bajariladi', verbose_name='Muhimlik')),
+                ('status', models.CharField(choices=[('queued', 'Navbatda'), ('running', 'Bajarilmoqda'), ('done', 'Bajarildi'), ('failed', 'Xato')], default='queued', max_length=20, verbose_name='Holat')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Urinishlar')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Maksimal urinishlar')),
+                ('last_error', models.TextField(blank=True, verbose_name='Oxirgi xato')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Bajarish vaqti')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Olingan')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Tugagan')),
+            ],
+            options={
+                'verbose_name': 'Fon vazifasi',
+                'verbose_name_plural': 'Fon vazifalari',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['-priority', 'run_at', 'id'], name='front_task_queue_idx'), models.Index(fields=['status', 'locked_at'], name='front_task_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:40
+
+import re
+
+from django.db import migrations, models
+
+# Migratsiya vaqtidagi front.sequences formati
+PATTERN = re.compile(r'^PLC-(\d{4})-(\d+)$')
+
+
+def seed_sequences(apps, schema_editor):
+    # Mavjud PLC-YYYY-NNNN raqamlaridan davom ettiriladi
+    Certificate = apps.get_model('front', 'Certificate')
+    Sequence = apps.get_model('front', 'CertificateSequence')
+    last = {}
+    numbers = Certificate.objects.filter(certificate_number__startswith='PLC-')
+    for number in numbers.values_list('certificate_number', flat=True).iterator():
+        match = PATTERN.match(number)
+        if match:
+            year, value = int(match.group(1)), int(match.group(2))
+            last[year] = max(last.get(year, 0), value)
+    for year, value in last.items():
+        Sequence.objects.update_or_create(year=year, defaults={'last_value': value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0008_task_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(unique=True, verbose_name='Yil')),
+                ('last_value', models.PositiveIntegerField(default=0, verbose_name='Oxirgi raqam')),
+            ],
+            options={
+                'verbose_name': 'Sertifikat raqamlari',
+                'verbose_name_plural': 'Sertifikat raqamlari',
+            },
+        ),
+        migrations.AlterField(
+            model_name='certificate',
+            name='certificate_number',
+            field=models.CharField(blank=True, help_text="Bo'sh qoldirilsa avtomatik beriladi", max_length=50, unique=True, verbose_name='Sertifikat raqami'),
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
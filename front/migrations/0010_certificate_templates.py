@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0009_certificate_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='certificate_template',
+            field=models.ImageField(blank=True, help_text="Bo'sh sertifikat rasmi - matn va QR kod ustiga yoziladi", null=True, upload_to='courses/certificates/', verbose_name='Sertifikat shabloni'),
+        ),
+        migrations.AlterField(
+            model_name='certificate',
+            name='certificate_image',
+            field=models.ImageField(blank=True, help_text="Bo'sh qoldirilsa kurs shablonidan yaratiladi", upload_to='certificates/%Y/%m/', verbose_name='Sertifikat rasmi'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0010_certificate_templates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['updated_at'], name='front_course_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['updated_at'], name='front_gallery_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['updated_at'], name='front_news_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['updated_at'], name='front_teacher_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['updated_at'], name='front_testim_updated_idx'),
+        ),
+    ]
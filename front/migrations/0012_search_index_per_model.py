@@ -0,0 +1,85 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:20
+
+import re
+
+from django.db import migrations
+
+# Umumiy jadvalda object_id UNINDEXED edi - har DELETE indeksni to'liq o'qirdi.
+# Endi har model o'z jadvalida, rowid = pk. Migratsiya vaqtidagi holat:
+OLD_TABLE = 'front_search_index'
+TABLE_PREFIX = 'front_search_'
+
+REGISTRY = {
+    'front.course': (('title',), ('short_description', 'full_description'), 'is_active'),
+    'front.teacher': (('first_name', 'last_name'), ('education', 'bio'), 'is_active'),
+    'front.news': (('title',), ('short_description', 'content'), 'is_published'),
+    'front.faq': (('question',), ('answer',), 'is_active'),
+    'front.certificate': (('student_name', 'certificate_number'), ('score',), None),
+}
+
+APOSTROPHES = re.compile('[\'`´‘’ʻʼ]')
+
+
+def normalize(text):
+    return APOSTROPHES.sub('', str(text or '')).lower()
+
+
+def documents(apps, label):
+    """[(pk, sarlavha, matn, ko'rinadimi)]"""
+    title_fields, body_fields, visible_field = REGISTRY[label]
+    return [
+        (
+            obj.pk,
+            ' '.join(normalize(getattr(obj, f)) for f in title_fields),
+            ' '.join(normalize(getattr(obj, f)) for f in body_fields),
+            int(bool(getattr(obj, visible_field))) if visible_field else 1,
+        )
+        for obj in apps.get_model(label)._default_manager.order_by().iterator()
+    ]
+
+
+def split_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as c:
+        for label in REGISTRY:
+            table = TABLE_PREFIX + label.split('.')[1]
+            c.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                "visible UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            c.execute(f'DELETE FROM {table}')
+            c.executemany(
+                f'INSERT INTO {table} (rowid, title, body, visible) VALUES (%s, %s, %s, %s)',
+                documents(apps, label),
+            )
+        c.execute(f'DROP TABLE IF EXISTS {OLD_TABLE}')
+
+
+def merge_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as c:
+        c.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {OLD_TABLE} USING fts5("
+            "model UNINDEXED, object_id UNINDEXED, visible UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        c.execute(f'DELETE FROM {OLD_TABLE}')
+        for label in REGISTRY:
+            c.executemany(
+                f'INSERT INTO {OLD_TABLE} (model, object_id, title, body, visible) VALUES (%s, %s, %s, %s, %s)',
+                [(label, *row) for row in documents(apps, label)],
+            )
+            c.execute(f'DROP TABLE IF EXISTS {TABLE_PREFIX}{label.split(".")[1]}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0011_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_index, merge_index),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
 
@@ -36,8 +37,30 @@ class User(AbstractUser):
         return self.get_full_name() or self.username
 
 
+# ==================== HISOBLAGICHLAR ====================
+class CounterFieldsModel(models.Model):
+    """
+    COUNTER_FIELDS faqat F() bilan yangilanadi (front.denorm, front.counters).
+    Mavjud obyektning oddiy save() i ularni yozmaydi - xotiradagi eski qiymat
+    bazadagi oshirishlarni bosib ketmasin.
+    """
+    COUNTER_FIELDS = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if (not self._state.adding and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
 # ==================== FAN / SUBJECT ====================
-class Subject(models.Model):
+class Subject(CounterFieldsModel):
     """Fanlar - IELTS, English, Matematika va h.k."""
     name = models.CharField('Fan nomi', max_length=100, unique=True)
     slug = models.SlugField('Slug', max_length=120, unique=True, blank=True)
@@ -48,10 +71,19 @@ class Subject(models.Model):
     is_active = models.BooleanField('Faolmi?', default=True)
     created_at = models.DateTimeField('Yaratilgan', auto_now_add=True)
     
+    # Hisoblagichlar (front.denorm yangilaydi)
+    active_courses_count = models.IntegerField('Faol kurslar', default=0, editable=False)
+    active_teachers_count = models.IntegerField('Faol o\'qituvchilar', default=0, editable=False)
+    COUNTER_FIELDS = ('active_courses_count', 'active_teachers_count')
+    
     class Meta:
         verbose_name = 'Fan'
         verbose_name_plural = 'Fanlar'
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], name='front_subject_active_idx',
+                         condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return self.name
@@ -63,7 +95,7 @@ class Subject(models.Model):
 
 
 # ==================== O'QITUVCHI ====================
-class Teacher(models.Model):
+class Teacher(CounterFieldsModel):
     """O'qituvchilar"""
     first_name = models.CharField('Ism', max_length=100)
     last_name = models.CharField('Familiya', max_length=100)
@@ -111,11 +143,24 @@ class Teacher(models.Model):
     is_featured = models.BooleanField('Asosiy sahifada ko\'rsatish?', default=False)
     order = models.IntegerField('Tartib', default=0)
     created_at = models.DateTimeField('Qo\'shilgan', auto_now_add=True)
+    updated_at = models.DateTimeField('Yangilangan', auto_now=True)
+    
+    # Hisoblagich (front.denorm yangilaydi)
+    active_courses_count = models.IntegerField('Faol kurslar', default=0, editable=False)
+    COUNTER_FIELDS = ('active_courses_count',)
     
     class Meta:
         verbose_name = 'O\'qituvchi'
         verbose_name_plural = 'O\'qituvchilar'
         ordering = ['order', 'first_name']
+        indexes = [
+            # teachers_list va bosh sahifa (is_featured)
+            models.Index(fields=['order', 'first_name'], name='front_teacher_active_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['order', 'first_name'], name='front_teacher_featured_idx',
+                         condition=models.Q(is_active=True, is_featured=True)),
+            models.Index(fields=['updated_at'], name='front_teacher_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -134,7 +179,7 @@ class Teacher(models.Model):
 
 
 # ==================== KURS ====================
-class Course(models.Model):
+class Course(CounterFieldsModel):
     """Kurslar"""
     
     LEVEL_CHOICES = [
@@ -154,6 +199,9 @@ class Course(models.Model):
     # Rasmlar
     main_image = models.ImageField('Asosiy rasm', upload_to='courses/%Y/%m/')
     thumbnail = models.ImageField('Kichik rasm (thumbnail)', upload_to='courses/thumbs/%Y/%m/', blank=True, null=True)
+    certificate_template = models.ImageField('Sertifikat shabloni', upload_to='courses/certificates/',
+                                             blank=True, null=True,
+                                             help_text='Bo\'sh sertifikat rasmi - matn va QR kod ustiga yoziladi')
     
     # Tavsif
     short_description = models.CharField('Qisqacha tavsif', max_length=300)
@@ -207,6 +255,7 @@ class Course(models.Model):
     # Statistika
     views_count = models.IntegerField('Ko\'rishlar soni', default=0, editable=False)
     enrollments_count = models.IntegerField('Yozilganlar soni', default=0, editable=False)
+    COUNTER_FIELDS = ('views_count', 'enrollments_count')
     
     # Sanalar
     start_date = models.DateField('Boshlanish sanasi', blank=True, null=True)
@@ -217,6 +266,21 @@ class Course(models.Model):
         verbose_name = 'Kurs'
         verbose_name_plural = 'Kurslar'
         ordering = ['-is_featured', 'order', '-created_at']
+        indexes = [
+            # courses_list (standart saralash), bosh sahifa, o'xshash kurslar
+            models.Index(fields=['-created_at'], name='front_course_active_new_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['-is_featured', 'order', '-created_at'], name='front_course_active_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['-is_featured', 'order', '-created_at'], name='front_course_popular_idx',
+                         condition=models.Q(is_active=True, is_popular=True)),
+            models.Index(fields=['subject', '-is_featured', 'order', '-created_at'],
+                         name='front_course_subject_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['subject', '-created_at'], name='front_course_subject_new_idx',
+                         condition=models.Q(is_active=True)),
+            # Shartli GET validatori: MAX(updated_at)
+            models.Index(fields=['updated_at'], name='front_course_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -273,6 +337,9 @@ class CourseEnrollment(models.Model):
         verbose_name = 'Kursga yozilish so\'rovi'
         verbose_name_plural = 'Kursga yozilish so\'rovlari'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='front_enroll_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.full_name} - {self.course.title}"
@@ -292,8 +359,10 @@ class Certificate(models.Model):
                                verbose_name='O\'qituvchi', related_name='certificates')
     
     # Sertifikat
-    certificate_image = models.ImageField('Sertifikat rasmi', upload_to='certificates/%Y/%m/')
-    certificate_number = models.CharField('Sertifikat raqami', max_length=50, unique=True)
+    certificate_image = models.ImageField('Sertifikat rasmi', upload_to='certificates/%Y/%m/', blank=True,
+                                          help_text='Bo\'sh qoldirilsa kurs shablonidan yaratiladi')
+    certificate_number = models.CharField('Sertifikat raqami', max_length=50, unique=True, blank=True,
+                                          help_text='Bo\'sh qoldirilsa avtomatik beriladi')
     
     # Ball / Natija
     score = models.CharField('Ball / Natija', max_length=50, blank=True, 
@@ -312,13 +381,36 @@ class Certificate(models.Model):
         verbose_name = 'Sertifikat'
         verbose_name_plural = 'Sertifikatlar'
         ordering = ['-is_featured', 'order', '-issue_date']
+        indexes = [
+            models.Index(fields=['-issue_date'], name='front_cert_issued_idx'),
+            models.Index(fields=['course', '-issue_date'], name='front_cert_course_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student_name} - {self.certificate_number}"
+    
+    def save(self, *args, **kwargs):
+        if not self.certificate_number:
+            from .sequences import next_number
+            self.certificate_number = next_number(self.issue_date.year if self.issue_date else None)
+        super().save(*args, **kwargs)
+
+
+class CertificateSequence(models.Model):
+    """Yil bo'yicha oxirgi berilgan sertifikat raqami - front.sequences band qiladi"""
+    year = models.PositiveSmallIntegerField('Yil', unique=True)
+    last_value = models.PositiveIntegerField('Oxirgi raqam', default=0)
+    
+    class Meta:
+        verbose_name = 'Sertifikat raqamlari'
+        verbose_name_plural = 'Sertifikat raqamlari'
+    
+    def __str__(self):
+        return f"{self.year}: {self.last_value}"
 
 
 # ==================== YANGILIKLAR ====================
-class News(models.Model):
+class News(CounterFieldsModel):
     """Yangiliklar va blog"""
     
     title = models.CharField('Sarlavha', max_length=200)
@@ -349,6 +441,7 @@ class News(models.Model):
     
     # Statistika
     views_count = models.IntegerField('Ko\'rishlar', default=0, editable=False)
+    COUNTER_FIELDS = ('views_count',)
     
     # Sanalar
     publish_date = models.DateTimeField('Nashr sanasi', blank=True, null=True)
@@ -359,6 +452,13 @@ class News(models.Model):
         verbose_name = 'Yangilik'
         verbose_name_plural = 'Yangiliklar'
         ordering = ['-publish_date', '-created_at']
+        indexes = [
+            models.Index(fields=['-publish_date', '-created_at'], name='front_news_published_idx',
+                         condition=models.Q(is_published=True)),
+            models.Index(fields=['-publish_date', '-created_at'], name='front_news_featured_idx',
+                         condition=models.Q(is_published=True, is_featured=True)),
+            models.Index(fields=['updated_at'], name='front_news_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -388,13 +488,17 @@ class NewsGalleryImage(models.Model):
 
 
 # ==================== GALEREYA ====================
-class GalleryCategory(models.Model):
+class GalleryCategory(CounterFieldsModel):
     """Galereya kategoriyalari"""
     name = models.CharField('Kategoriya nomi', max_length=100)
     slug = models.SlugField('Slug', unique=True, blank=True)
     description = models.TextField('Tavsif', blank=True)
     order = models.IntegerField('Tartib', default=0)
     
+    # Hisoblagich (front.denorm yangilaydi)
+    images_count = models.IntegerField('Rasmlar', default=0, editable=False)
+    COUNTER_FIELDS = ('images_count',)
+    
     class Meta:
         verbose_name = 'Galereya kategoriyasi'
         verbose_name_plural = 'Galereya kategoriyalari'
@@ -425,11 +529,17 @@ class Gallery(models.Model):
     order = models.IntegerField('Tartib', default=0)
     
     created_at = models.DateTimeField('Qo\'shilgan', auto_now_add=True)
+    updated_at = models.DateTimeField('Yangilangan', auto_now=True)
     
     class Meta:
         verbose_name = 'Galereya rasmi'
         verbose_name_plural = 'Galereya rasmlari'
         ordering = ['-is_featured', 'order', '-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='front_gallery_created_idx'),
+            models.Index(fields=['category', '-created_at'], name='front_gallery_category_idx'),
+            models.Index(fields=['updated_at'], name='front_gallery_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title or f"Rasm #{self.id}"
@@ -474,6 +584,9 @@ class Contact(models.Model):
         verbose_name = 'Aloqa so\'rovi'
         verbose_name_plural = 'Aloqa so\'rovlari'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='front_contact_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.full_name} - {self.phone}"
@@ -527,6 +640,9 @@ class TeacherApplication(models.Model):
         verbose_name = 'O\'qituvchilikka ariza'
         verbose_name_plural = 'O\'qituvchilikka arizalar'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='front_teachapp_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.get_status_display()}"
@@ -558,22 +674,34 @@ class Testimonial(models.Model):
     order = models.IntegerField('Tartib', default=0)
     
     created_at = models.DateTimeField('Qo\'shilgan', auto_now_add=True)
+    updated_at = models.DateTimeField('Yangilangan', auto_now=True)
     
     class Meta:
         verbose_name = 'Sharh'
         verbose_name_plural = 'Sharhlar'
         ordering = ['-is_featured', 'order', '-created_at']
+        indexes = [
+            models.Index(fields=['-is_featured', 'order', '-created_at'], name='front_testim_featured_idx',
+                         condition=models.Q(is_approved=True, is_featured=True)),
+            models.Index(fields=['course', '-is_featured', 'order', '-created_at'],
+                         name='front_testim_course_idx', condition=models.Q(is_approved=True)),
+            models.Index(fields=['updated_at'], name='front_testim_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student_name} - {self.rating} yulduz"
 
 
 # ==================== FAQ ====================
-class FAQCategory(models.Model):
+class FAQCategory(CounterFieldsModel):
     """FAQ kategoriyalari"""
     name = models.CharField('Kategoriya', max_length=100)
     order = models.IntegerField('Tartib', default=0)
     
+    # Hisoblagich (front.denorm yangilaydi)
+    active_faqs_count = models.IntegerField('Faol savollar', default=0, editable=False)
+    COUNTER_FIELDS = ('active_faqs_count',)
+    
     class Meta:
         verbose_name = 'FAQ kategoriyasi'
         verbose_name_plural = 'FAQ kategoriyalari'
@@ -601,6 +729,9 @@ class FAQ(models.Model):
         verbose_name = 'FAQ'
         verbose_name_plural = 'FAQ'
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order'], name='front_faq_active_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return self.question
@@ -673,4 +804,63 @@ class SiteSettings(models.Model):
     @classmethod
     def load(cls):
         obj, created = cls.objects.get_or_create(pk=1)
-        return obj
\ No newline at end of file
+        return obj
+
+
+class SiteCounter(models.Model):
+    """Sayt bo'yicha umumiy hisoblagichlar (faol o'qituvchilar, kurslar) - front.denorm yangilaydi"""
+    key = models.CharField('Kalit', max_length=50, unique=True)
+    value = models.IntegerField('Qiymat', default=0)
+    
+    class Meta:
+        verbose_name = 'Hisoblagich'
+        verbose_name_plural = 'Hisoblagichlar'
+    
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+# ==================== FON VAZIFALARI ====================
+class Task(models.Model):
+    """Fon vazifalari navbati - front.tasks yozadi, `manage.py runworker` bajaradi"""
+    
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Navbatda'),
+        (RUNNING, 'Bajarilmoqda'),
+        (DONE, 'Bajarildi'),
+        (FAILED, 'Xato'),
+    ]
+    
+    name = models.CharField('Vazifa', max_length=200)
+    args = models.JSONField('Argumentlar', default=list, blank=True)
+    kwargs = models.JSONField('Nomli argumentlar', default=dict, blank=True)
+    priority = models.SmallIntegerField('Muhimlik', default=0, help_text='Kattasi oldin bajariladi')
+    
+    status = models.CharField('Holat', max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField('Urinishlar', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Maksimal urinishlar', default=3)
+    last_error = models.TextField('Oxirgi xato', blank=True)
+    
+    run_at = models.DateTimeField('Bajarish vaqti', default=timezone.now)
+    locked_by = models.CharField('Worker', max_length=100, blank=True)
+    locked_at = models.DateTimeField('Olingan', blank=True, null=True)
+    created_at = models.DateTimeField('Yaratilgan', auto_now_add=True)
+    finished_at = models.DateTimeField('Tugagan', blank=True, null=True)
+    
+    class Meta:
+        verbose_name = 'Fon vazifasi'
+        verbose_name_plural = 'Fon vazifalari'
+        ordering = ['-created_at']
+        indexes = [
+            # Worker navbatdan shu tartibda oladi: muhimlik, keyin vaqt
+            models.Index(fields=['-priority', 'run_at', 'id'], name='front_task_queue_idx',
+                         condition=models.Q(status='queued')),
+            models.Index(fields=['status', 'locked_at'], name='front_task_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
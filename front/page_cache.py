@@ -0,0 +1,192 @@
+"""
+PolyglotLC - To'liq sahifa keshi (anonim foydalanuvchilar uchun)
+Kalit: yo'l + normallashtirilgan query string + bog'liq modellar versiyalari.
+Model saqlansa faqat o'sha modelga bog'liq sahifalar eskiradi.
+"""
+import hashlib
+import threading
+from collections import Counter
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import metrics
+from .cache import bump_version, get_versions, versioned_key
+
+
+TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 600)
+ENABLED = getattr(settings, 'PAGE_CACHE_ENABLED', True)
+IGNORED_PARAMS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid')
+
+# Har bir sahifa sayt sozlamalariga bog'liq (header/footer)
+ALWAYS_DEPENDS_ON = ('front.sitesettings',)
+
+STATS_KEY = 'page_cache:stats'
+STATS_FLUSH_EVERY = 50
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def tag_namespace(label):
+    return f'page:{label}'
+
+
+def invalidate(label):
+    """Model (label) ga bog'liq barcha sahifalarni eskirtiradi"""
+    return bump_version(tag_namespace(label))
+
+
+def normalize_query(querydict):
+    """Bo'sh va kuzatuv (utm_*) parametrlarsiz, tartiblangan query string"""
+    items = sorted(
+        (key, value)
+        for key, values in querydict.lists() if key not in IGNORED_PARAMS
+        for value in values if value != ''
+    )
+    return urlencode(items)
+
+
+def dependency_stamp(labels):
+    """Modellar versiyalaridan qisqa satr: '3.1.7'"""
+    namespaces = [tag_namespace(label) for label in labels]
+    versions = get_versions(namespaces)
+    return '.'.join(str(versions[ns]) for ns in namespaces)
+
+
+def page_key(request, view_name, depends_on):
+    stamp = dependency_stamp(ALWAYS_DEPENDS_ON + tuple(depends_on))
+    digest = hashlib.md5(
+        f'{request.path}?{normalize_query(request.GET)}'.encode(), usedforsecurity=False
+    ).hexdigest()
+    return versioned_key('page', stamp, view_name, digest)
+
+
+def is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated:
+        return False
+    # Flash xabarlar bor - sahifa shu foydalanuvchiga xos
+    if len(messages.get_messages(request)):
+        return False
+    return True
+
+
+def _is_cacheable_response(request, response):
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    # Sahifada {% csrf_token %} ishlatilgan - token har foydalanuvchiga xos
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE') or request.META.get('CSRF_COOKIE_USED'):
+        return False
+    return True
+
+
+# ==================== STATISTIKA ====================
+def _record(view_name, event):
+    metrics.cache_event('page', view_name, event)
+    with _stats_lock:
+        _stats[(view_name, event)] += 1
+        pending = sum(_stats.values())
+    if pending >= STATS_FLUSH_EVERY:
+        flush_stats()
+
+
+def flush_stats():
+    """Jarayon ichidagi hisoblagichlarni umumiy keshga qo'shadi"""
+    with _stats_lock:
+        batch = dict(_stats)
+        _stats.clear()
+    if not batch:
+        return
+    totals = cache.get(STATS_KEY) or {}
+    for (view_name, event), count in batch.items():
+        entry = totals.setdefault(view_name, {'hit': 0, 'miss': 0, 'bypass': 0})
+        entry[event] += count
+    cache.set(STATS_KEY, totals, None)
+
+
+def stats():
+    """{view_name: {'hit', 'miss', 'bypass', 'hit_ratio'}}"""
+    flush_stats()
+    totals = cache.get(STATS_KEY) or {}
+    for entry in totals.values():
+        lookups = entry['hit'] + entry['miss']
+        entry['hit_ratio'] = round(entry['hit'] / lookups, 3) if lookups else 0.0
+    return totals
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+    cache.delete(STATS_KEY)
+
+
+# ==================== DEKORATOR ====================
+def _lookup(request, view_name, depends_on):
+    """(kesh kaliti, tayyor javob yoki None). Kalit None - so'rov keshlanmaydi."""
+    if not ENABLED or not is_cacheable_request(request):
+        _record(view_name, 'bypass')
+        return None, None
+    key = page_key(request, view_name, depends_on)
+    cached = cache.get(key)
+    if cached is None:
+        _record(view_name, 'miss')
+        return key, None
+    _record(view_name, 'hit')
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'HIT'
+    return key, response
+
+
+def _store(request, response, key, timeout):
+    if key is None:
+        response['X-Page-Cache'] = 'BYPASS'
+        return response
+    if hasattr(response, 'render') and callable(response.render):
+        response = response.render()
+    if _is_cacheable_response(request, response):
+        cache.set(key, (response.content, response['Content-Type']), timeout)
+    response['X-Page-Cache'] = 'MISS'
+    return response
+
+
+def cache_page(*depends_on, timeout=None):
+    """
+    Anonim foydalanuvchilar uchun sahifani keshlaydi.
+    depends_on - sahifa ko'rsatadigan modellar: @cache_page('front.course', 'front.subject')
+    Sync va async view larga birdek qo'llanadi.
+    """
+    timeout = TIMEOUT if timeout is None else timeout
+
+    def decorator(view):
+        view_name = view.__name__
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                # Sessiya/foydalanuvchi tekshiruvi bazaga murojaat qilishi mumkin
+                key, cached = await sync_to_async(_lookup)(request, view_name, depends_on)
+                if cached is not None:
+                    return cached
+                response = await view(request, *args, **kwargs)
+                return await sync_to_async(_store)(request, response, key, timeout)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key, cached = _lookup(request, view_name, depends_on)
+            if cached is not None:
+                return cached
+            response = view(request, *args, **kwargs)
+            return _store(request, response, key, timeout)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,258 @@
+"""
+PolyglotLC - Kursorli (keyset) sahifalash
+OFFSET o'rniga oxirgi ko'rsatilgan qatorning tartib qiymatlaridan keyingi
+qatorlar olinadi - istalgan chuqurlikdagi sahifa bir xil tezlikda ochiladi.
+Kursor - imzolangan, shaffof bo'lmagan token (?cursor=...).
+
+NULL qiymatlar eng kichik hisoblanadi (SQLite tartibi).
+"""
+import hashlib
+import json
+from decimal import Decimal
+from uuid import UUID
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection
+from django.db.models import Q
+
+from . import page_cache
+from .cache import versioned_key
+
+
+SALT = 'front.pagination'
+COUNT_TIMEOUT = 600
+FORWARD, BACKWARD = 'n', 'p'
+
+
+def encode_cursor(direction, values):
+    return signing.dumps([direction, values], salt=SALT, serializer=_Serializer, compress=True)
+
+
+def decode_cursor(token):
+    """(yo'nalish, qiymatlar) yoki yaroqsiz bo'lsa None"""
+    try:
+        direction, values = signing.loads(token, salt=SALT, serializer=_Serializer)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+    if direction not in (FORWARD, BACKWARD) or not isinstance(values, list):
+        return None
+    return direction, values
+
+
+def _jsonable(value):
+    # DjangoJSONEncoder mikrosekundlarni kesadi - kursor uchun to'liq qiymat kerak
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class _Serializer:
+    def dumps(self, obj):
+        direction, values = obj
+        return json.dumps([direction, [_jsonable(v) for v in values]], separators=(',', ':')).encode()
+
+    def loads(self, data):
+        return json.loads(data.decode())
+
+
+class CursorPaginator:
+    """
+    queryset tartibi (order_by yoki Meta.ordering) + pk bo'yicha sahifalaydi.
+    count: None - jami son hisoblanmaydi, 'cached' - aniq son keshdan,
+    'estimate' - filtrsiz querysetlar uchun ANALYZE statistikasidan taxminiy son.
+    """
+
+    def __init__(self, queryset, per_page, count=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_mode = count
+        self.model = queryset.model
+        self.fields = self._resolve_ordering()
+
+    def _resolve_ordering(self):
+        ordering = list(self.queryset.query.order_by or self.model._meta.ordering)
+        fields = []
+        for name in ordering:
+            if not isinstance(name, str):
+                raise ValueError('Kursorli sahifalash faqat maydon nomlari bilan ishlaydi')
+            desc = name.startswith('-')
+            name = name.lstrip('-')
+            if name in ('pk', self.model._meta.pk.name):
+                break
+            fields.append((self.model._meta.get_field(name), desc))
+        # Yagona tartib uchun pk har doim o'sish tartibida - indeks ichidagi rowid bilan mos
+        fields.append((self.model._meta.pk, False))
+        return fields
+
+    def _order_by(self, reverse=False):
+        return [
+            ('-' if desc != reverse else '') + field.attname
+            for field, desc in self.fields
+        ]
+
+    def _values(self, obj):
+        return [getattr(obj, field.attname) for field, _ in self.fields]
+
+    def _beyond(self, field, desc, value, nulls=True):
+        """Shu maydon bo'yicha qat'iy keyin keladigan qatorlar (None - hech qaysi)"""
+        name = field.attname
+        if desc:
+            if value is None:
+                return None
+            q = Q(**{f'{name}__lt': value})
+            return q | Q(**{f'{name}__isnull': True}) if field.null and nulls else q
+        if value is None:
+            return Q(**{f'{name}__isnull': False})
+        return Q(**{f'{name}__gt': value})
+
+    def _after(self, values, reverse=False, nulls=True):
+        """
+        (f1, f2, ...) > (v1, v2, ...) - har xil yo'nalishli maydonlar uchun OR zanjiri.
+        nulls=False - birinchi maydoni NULL bo'lgan qatorlar kiritilmaydi.
+        """
+        condition = None
+        equal = Q()
+        for index, ((field, desc), value) in enumerate(zip(self.fields, values)):
+            beyond = self._beyond(field, desc != reverse, value, nulls=nulls or index > 0)
+            if beyond is not None:
+                condition = equal & beyond if condition is None else condition | (equal & beyond)
+            equal &= Q(**{f'{field.attname}__isnull': True} if value is None else {field.attname: value})
+
+        # Birinchi maydon bo'yicha chegara - indeksda shu joydan boshlab o'qiladi
+        field, desc = self.fields[0]
+        first = values[0]
+        if first is not None and not (field.null and nulls and desc != reverse):
+            lookup = 'lte' if desc != reverse else 'gte'
+            condition = Q(**{f'{field.attname}__{lookup}': first}) & condition
+        return condition
+
+    def _fetch(self, values, reverse):
+        queryset = self.queryset.order_by(*self._order_by(reverse))
+        limit = self.per_page + 1
+        field, desc = self.fields[0]
+        if field.null and values[0] is not None and desc != reverse:
+            # NULL lar oxirida keladi: `OR IS NULL` indeksdan chegara bilan o'qishga
+            # xalal bermasligi uchun avval qiymatli qatorlar, yetmasa NULL lar olinadi
+            rows = list(queryset.filter(self._after(values, reverse, nulls=False))[:limit])
+            if len(rows) < limit:
+                rows += queryset.filter(**{f'{field.attname}__isnull': True})[:limit - len(rows)]
+            return rows
+        condition = self._after(values, reverse)
+        if condition is not None:
+            queryset = queryset.filter(condition)
+        return list(queryset[:limit])
+
+    def _parse(self, values):
+        if len(values) != len(self.fields):
+            return None
+        try:
+            return [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.fields, values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            return None
+
+    def get_page(self, cursor=None):
+        """Kursor bo'yicha sahifa. Yaroqsiz kursor - birinchi sahifa."""
+        decoded = decode_cursor(cursor) if cursor else None
+        values = self._parse(decoded[1]) if decoded else None
+        if values is None:
+            decoded = None
+
+        if decoded is None:
+            rows = list(self.queryset.order_by(*self._order_by())[:self.per_page + 1])
+            return CursorPage(self, rows[:self.per_page], has_next=len(rows) > self.per_page, has_previous=False)
+
+        reverse = decoded[0] == BACKWARD
+        rows = self._fetch(values, reverse)
+        extra = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if reverse:
+            rows.reverse()
+            return CursorPage(self, rows, has_next=True, has_previous=extra)
+        return CursorPage(self, rows, has_next=extra, has_previous=True)
+
+    # ==================== JAMI SON ====================
+    def _count_key(self):
+        sql, params = self.queryset.order_by().query.sql_with_params()
+        digest = hashlib.md5(f'{sql}|{params}'.encode(), usedforsecurity=False).hexdigest()
+        stamp = page_cache.dependency_stamp([self.model._meta.label_lower])
+        return versioned_key('count', stamp, digest)
+
+    def cached_count(self):
+        """Aniq son - model o'zgarmaguncha keshdan"""
+        key = self._count_key()
+        count = cache.get(key)
+        if count is None:
+            count = self.queryset.order_by().count()
+            cache.set(key, count, COUNT_TIMEOUT)
+        return count
+
+    def estimated_count(self):
+        """ANALYZE statistikasidan jadval qatorlari soni (faqat filtrsiz queryset uchun)"""
+        if self.queryset.query.where or connection.vendor != 'sqlite':
+            return None
+        try:
+            with connection.cursor() as c:
+                c.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [self.model._meta.db_table])
+                rows = [int(stat.split()[0]) for (stat,) in c.fetchall()]
+        except DatabaseError:
+            return None
+        return max(rows) if rows else None
+
+
+class CursorPage:
+    """Template uchun: for, has_next/has_previous, next_cursor/previous_cursor, count"""
+
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self._count = None
+        self._estimated = False
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.has_next or not self.object_list:
+            return None
+        return encode_cursor(FORWARD, self.paginator._values(self.object_list[-1]))
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous or not self.object_list:
+            return None
+        return encode_cursor(BACKWARD, self.paginator._values(self.object_list[0]))
+
+    @property
+    def count(self):
+        """Jami son (paginator count=None bo'lsa None)"""
+        if self._count is None and self.paginator.count_mode:
+            if self.paginator.count_mode == 'estimate':
+                self._count = self.paginator.estimated_count()
+                self._estimated = self._count is not None
+            if self._count is None:
+                self._count = self.paginator.cached_count()
+        return self._count
+
+    @property
+    def count_is_estimate(self):
+        return self.count is not None and self._estimated
@@ -0,0 +1,331 @@
+"""
+PolyglotLC - Profilash (flamegraph)
+Production da sekin sahifani ko'rish uchun: view cProfile va stek namunalovchi
+(sampling) profiler ostida bajariladi, natija PROFILE_ROOT ga yoziladi:
+  <id>.prof       - pstats (python -m pstats, snakeviz)
+  <id>.collapsed  - 'a;b;c 12' formatidagi steklar (flamegraph.pl, speedscope)
+  <id>.json       - URL, view, vaqt, namunalar soni
+
+Ishga tushirish:
+  1. ?_profile=<imzo> - admin dagi "Profilash" sahifasida xodim yaratgan, muddatli
+     va bitta URL nomiga bog'langan imzo;
+  2. tanlangan URL nomiga kelgan har N-chi so'rov (admin dan, cache orqali barcha
+     workerlarga, yoki PROFILE_SAMPLE sozlamasi).
+
+Faqat sync view lar profilanadi - middleware oxirida process_view dan view ni
+o'zi chaqiradi, boshqa middleware larning process_view lari allaqachon bajarilgan.
+Jarayonda bir vaqtda bitta profil yoziladi; qolgan so'rovlar odatdagidek bajariladi.
+"""
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from xml.sax.saxutils import escape, quoteattr
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+ROOT = str(getattr(settings, 'PROFILE_ROOT', settings.BASE_DIR / 'var' / 'profiles'))
+PARAM = '_profile'
+SALT = 'front.profiling'
+TOKEN_MAX_AGE = getattr(settings, 'PROFILE_TOKEN_MAX_AGE', 3600)
+INTERVAL = getattr(settings, 'PROFILE_INTERVAL', 0.002)
+KEEP = getattr(settings, 'PROFILE_KEEP', 200)
+# {'news_list': 100} - har 100-chi so'rov profilanadi
+SAMPLE = getattr(settings, 'PROFILE_SAMPLE', {})
+TARGETS_KEY = 'profiling_targets'
+TARGETS_REFRESH = 30
+MAX_DEPTH = 128
+
+_counters = {}
+_targets = (0.0, {})
+_lock = threading.Lock()
+# Bir vaqtda bitta profil: sys.setswitchinterval va cProfile (3.12+) butun jarayonga ta'sir qiladi
+_capture_lock = threading.Lock()
+_SITE_PACKAGES = os.sep + 'site-packages' + os.sep
+
+
+# ==================== IMZO ====================
+def make_token(view_name):
+    return signing.TimestampSigner(salt=SALT).sign(view_name)
+
+
+def check_token(token, view_name):
+    try:
+        return signing.TimestampSigner(salt=SALT).unsign(token, max_age=TOKEN_MAX_AGE) == view_name
+    except signing.BadSignature:
+        return False
+
+
+# ==================== NISHONLAR ====================
+def get_targets():
+    """{url_nomi: N} - sozlamalar + admin dan qo'shilganlar (jarayon ichida TARGETS_REFRESH s)"""
+    global _targets
+    loaded_at, targets = _targets
+    if time.monotonic() - loaded_at >= TARGETS_REFRESH:
+        targets = {**SAMPLE, **(cache.get(TARGETS_KEY) or {})}
+        _targets = (time.monotonic(), targets)
+    return targets
+
+
+def set_target(view_name, every, minutes):
+    targets = cache.get(TARGETS_KEY) or {}
+    targets[view_name] = every
+    # Muddat butun ro'yxatga - oxirgi qo'shilgan nishon bo'yicha
+    cache.set(TARGETS_KEY, targets, minutes * 60)
+    _expire_targets()
+
+
+def remove_target(view_name):
+    targets = cache.get(TARGETS_KEY) or {}
+    targets.pop(view_name, None)
+    if targets:
+        cache.set(TARGETS_KEY, targets, None)
+    else:
+        cache.delete(TARGETS_KEY)
+    _expire_targets()
+
+
+def _expire_targets():
+    global _targets
+    _targets = (0.0, {})
+
+
+def should_profile(request, view_func):
+    match = request.resolver_match
+    if match is None or iscoroutinefunction(view_func):
+        return False
+    token = request.GET.get(PARAM)
+    if token:
+        return check_token(token, match.view_name)
+    every = get_targets().get(match.view_name)
+    if not every:
+        return False
+    counter = _counters.get(match.view_name)
+    if counter is None:
+        with _lock:
+            counter = _counters.setdefault(match.view_name, itertools.count(1))
+    return next(counter) % every == 0
+
+
+# ==================== PROFILER ====================
+def _frame_label(code):
+    filename = code.co_filename
+    if _SITE_PACKAGES in filename:
+        filename = filename.split(_SITE_PACKAGES, 1)[1]
+    elif os.path.isabs(filename):
+        relative = os.path.relpath(filename, settings.BASE_DIR)
+        # Standart kutubxona: re/_compiler.py
+        filename = relative if not relative.startswith('..') else os.path.join(*filename.split(os.sep)[-2:])
+    # ';' collapsed formatida kadrlar ajratuvchisi (son oxirgi bo'shliqdan keyin)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class StackSampler(threading.Thread):
+    """Berilgan oqimning stekini har INTERVAL da yozib boradi (devor vaqti, DB kutishlar ham)"""
+
+    def __init__(self, thread_id, interval=INTERVAL):
+        super().__init__(name='profiling-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.labels = {}
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                # profile_view dan yuqoridagi (handler, middleware) kadrlar kerak emas
+                if code is _ROOT_CODE:
+                    break
+                label = self.labels.get(code)
+                if label is None:
+                    label = self.labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def profile_view(request, view_func, view_args, view_kwargs):
+    """
+    View ni profiler ostida bajaradi, javob va yozilgan profil id sini qaytaradi.
+    Boshqa profil ketayotgan bo'lsa None - view odatdagidek bajariladi.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        return None
+    try:
+        sampler = StackSampler(threading.get_ident())
+        profiler = cProfile.Profile()
+        # GIL odatda 5 ms da almashadi - namuna oluvchi oqim o'z vaqtida uyg'onsin
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, INTERVAL / 4))
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            profiler.enable()
+            response = view_func(request, *view_args, **view_kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+        finally:
+            profiler.disable()
+            sampler.stop()
+            sys.setswitchinterval(switch_interval)
+        duration = (time.perf_counter() - started) * 1000
+    finally:
+        _capture_lock.release()
+    profile_id = save(request, profiler, sampler.stacks, duration, response.status_code)
+    response['X-Profile-Id'] = profile_id
+    return response
+
+
+_ROOT_CODE = profile_view.__code__
+
+
+# ==================== SAQLASH ====================
+def file_path(profile_id, suffix):
+    if not profile_id or os.sep in profile_id or profile_id.startswith('.'):
+        raise FileNotFoundError(profile_id)
+    return os.path.join(ROOT, profile_id + suffix)
+
+
+def save(request, profiler, stacks, duration, status):
+    os.makedirs(ROOT, exist_ok=True)
+    view_name = request.resolver_match.view_name
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{view_name.replace(':', '.')}-{uuid.uuid4().hex[:6]}"
+    profiler.dump_stats(file_path(profile_id, '.prof'))
+    with open(file_path(profile_id, '.collapsed'), 'w', encoding='utf-8') as fh:
+        for stack, count in stacks.most_common():
+            fh.write(f'{stack} {count}\n')
+    meta = {
+        'id': profile_id, 'view': view_name, 'path': request.get_full_path(), 'method': request.method,
+        'status': status, 'duration': round(duration, 1), 'samples': sum(stacks.values()),
+        'time': round(time.time(), 3),
+        'trigger': 'token' if PARAM in request.GET else 'sample',
+    }
+    with open(file_path(profile_id, '.json'), 'w', encoding='utf-8') as fh:
+        json.dump(meta, fh, ensure_ascii=False)
+    prune()
+    return profile_id
+
+
+def prune(keep=KEEP):
+    for meta in list_profiles()[keep:]:
+        delete(meta['id'])
+
+
+def delete(profile_id):
+    for suffix in ('.json', '.prof', '.collapsed'):
+        try:
+            os.remove(file_path(profile_id, suffix))
+        except FileNotFoundError:
+            pass
+
+
+def list_profiles():
+    """Yangisi birinchi"""
+    try:
+        names = os.listdir(ROOT)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        if name.endswith('.json'):
+            try:
+                profiles.append(load_meta(name[:-5]))
+            except (OSError, ValueError):
+                continue
+    return sorted(profiles, key=lambda meta: meta['time'], reverse=True)
+
+
+def load_meta(profile_id):
+    with open(file_path(profile_id, '.json'), encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def load_collapsed(profile_id):
+    stacks = []
+    with open(file_path(profile_id, '.collapsed'), encoding='utf-8') as fh:
+        for line in fh:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks.append((stack.split(';'), int(count)))
+    return stacks
+
+
+def stats_text(profile_id, sort='cumulative', limit=60):
+    stream = io.StringIO()
+    stats = pstats.Stats(file_path(profile_id, '.prof'), stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+# ==================== FLAMEGRAPH ====================
+def _tree(stacks):
+    root = {'name': 'all', 'value': 0, 'children': {}}
+    for frames, count in stacks:
+        root['value'] += count
+        node = root
+        for frame in frames:
+            node = node['children'].setdefault(frame, {'name': frame, 'value': 0, 'children': {}})
+            node['value'] += count
+    return root
+
+
+def flamegraph_svg(stacks, width=1200, row_height=17, min_width=0.5):
+    """Collapsed steklardan SVG (ildiz pastda); min_width px dan tor bo'laklar chizilmaydi"""
+    root = _tree(stacks)
+    total = root['value'] or 1
+    rects, depth_max = [], 0
+    pending = [(root, 0.0, 0)]
+    while pending:
+        node, x, depth = pending.pop()
+        node_width = node['value'] / total * width
+        if node_width < min_width:
+            continue
+        depth_max = max(depth_max, depth)
+        rects.append((node, x, depth, node_width))
+        child_x = x
+        for child in sorted(node['children'].values(), key=lambda child: child['name']):
+            pending.append((child, child_x, depth + 1))
+            child_x += child['value'] / total * width
+
+    height = (depth_max + 1) * row_height
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 {width} {height}" '
+        f'font-family="monospace" font-size="11">'
+    ]
+    for node, x, depth, node_width in rects:
+        y = height - (depth + 1) * row_height
+        share = node['value'] / total * 100
+        title = escape(f"{node['name']} - {node['value']} namuna ({share:.1f}%)")
+        # Loyiha kodi iliqroq, kutubxonalar sovuqroq rangda
+        hue = 25 if '(front' in node['name'] or '(config' in node['name'] else 45
+        light = 55 + zlib.crc32(node['name'].encode()) % 20
+        label = escape(node['name'][:int(node_width / 6.5)]) if node_width > 30 else ''
+        parts.append(
+            f'<g><title>{title}</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{node_width:.2f}" height="{row_height - 1}" '
+            f'fill={quoteattr(f"hsl({hue}, 85%, {light}%)")} rx="2"/>'
+            f'<text x="{x + 3:.2f}" y="{y + row_height - 5}">{label}</text></g>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
@@ -0,0 +1,294 @@
+"""
+PolyglotLC - Sekin so'rovlar jurnali
+Har bir SQL so'rov barmoq iziga (fingerprint) keltiriladi: parametrlar, sonlar,
+satrlar va IN (...) ro'yxatlari '?' bilan almashtiriladi. Iz bo'yicha soni, umumiy
+va eng katta vaqt jarayon xotirasida yig'iladi va FLUSH_INTERVAL da bir marta
+faylga (JSON qatorlar, aylanuvchi) delta sifatida yoziladi - har bir worker o'z
+hissasini qo'shadi, admin sahifasi ularni birlashtiradi.
+
+SLOW_MS dan sekin so'rovlar uchun chaqiruv joyi (loyihadagi fayl:qator) va view
+nomi yoziladi. Bitta so'rov (request) ichida bir xil iz N_PLUS_ONE martadan ko'p
+bajarilsa - N+1 deb belgilanadi.
+
+RotatingFileHandler jarayonlar orasida xavfsiz emas - har bir jarayon o'z fayliga
+yozadi va uni o'zi aylantiradi: queries-<pid>.log. Admin sahifasi hammasini o'qiydi.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+ENABLED = getattr(settings, 'QUERY_LOG_ENABLED', True)
+PATH = str(getattr(settings, 'QUERY_LOG_PATH', settings.BASE_DIR / 'var' / 'log' / 'queries.log'))
+SLOW_MS = getattr(settings, 'QUERY_LOG_SLOW_MS', 100)
+N_PLUS_ONE = getattr(settings, 'QUERY_LOG_N_PLUS_ONE', 10)
+FLUSH_INTERVAL = getattr(settings, 'QUERY_LOG_FLUSH_INTERVAL', 60)
+MAX_BYTES = getattr(settings, 'QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024)
+BACKUP_COUNT = getattr(settings, 'QUERY_LOG_BACKUP_COUNT', 3)
+# Shuncha kun yozilmagan (to'xtagan jarayonlarning) fayllari o'chiriladi
+KEEP_DAYS = getattr(settings, 'QUERY_LOG_KEEP_DAYS', 7)
+
+_scope = ContextVar('querylog', default=None)
+_stats = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_logger = None
+
+
+def _after_fork():
+    """Fork qilingan worker ota-onaning fayli va yig'ilgan statistikasini olmaydi"""
+    global _stats, _lock, _last_flush, _logger
+    _stats = {}
+    _lock = threading.Lock()
+    _last_flush = time.monotonic()
+    _logger = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+_PROJECT_ROOT = os.path.abspath(str(settings.BASE_DIR)) + os.sep
+# Chaqiruv joyi qidirilganda o'tkazib yuboriladi: o'lchov qatlamlari va kutubxonalar
+_SKIP_FILES = tuple(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('querylog.py', 'instrumentation.py', 'middleware.py')
+) + (os.sep + 'site-packages' + os.sep,)
+
+
+# ==================== BARMOQ IZI ====================
+_STRINGS = re.compile(r"'(?:''|[^'])*'")
+_NUMBERS = re.compile(r'(?<![\w"$.])-?\d+(?:\.\d+)?\b')
+_PARAMS = re.compile(r'%s|\?')
+_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_VALUES = re.compile(r'(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+', re.I)
+_SPACES = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """SELECT ... WHERE id IN (%s, %s) LIMIT 21 -> SELECT ... WHERE id IN (...) LIMIT ?"""
+    sql = _STRINGS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _PARAMS.sub('?', sql)
+    sql = _LISTS.sub('(...)', sql)
+    sql = _VALUES.sub(r'\1', sql.replace('(?)', '(...)'))
+    return _SPACES.sub(' ', sql).strip()
+
+
+def call_site():
+    """Loyihadagi eng yaqin chaqiruvchi: 'front/admin.py:228 (courses_count)'"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PROJECT_ROOT) and not any(part in filename for part in _SKIP_FILES):
+            return f'{filename[len(_PROJECT_ROOT):]}:{frame.f_lineno} ({frame.f_code.co_name})'
+        frame = frame.f_back
+    return None
+
+
+# ==================== YIG'ISH ====================
+class Scope:
+    """Bitta HTTP so'rov: N+1 uchun izlar hisoblagichi"""
+
+    __slots__ = ('request', 'counts', 'sites')
+
+    def __init__(self, request):
+        self.request = request
+        self.counts = Counter()
+        self.sites = {}
+
+    @property
+    def view_name(self):
+        match = getattr(self.request, 'resolver_match', None)
+        return match.view_name if match else None
+
+
+def begin(request):
+    return _scope.set(Scope(request))
+
+
+def end(token):
+    scope = _scope.get()
+    _scope.reset(token)
+    if scope is not None:
+        for key, site in scope.sites.items():
+            write({'type': 'n+1', 'fingerprint': key, 'count': scope.counts[key],
+                   'view': scope.view_name, 'site': site})
+    maybe_flush()
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    began = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = (time.perf_counter() - began) * 1000
+        _observe(sql, elapsed)
+
+
+def _observe(sql, elapsed):
+    key = fingerprint(sql)
+    with _lock:
+        entry = _stats.get(key)
+        if entry is None:
+            entry = _stats[key] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+    scope = _scope.get()
+    if elapsed >= SLOW_MS:
+        write({'type': 'slow', 'fingerprint': key, 'ms': round(elapsed, 2),
+               'view': scope.view_name if scope else None, 'site': call_site()})
+    if scope is not None:
+        scope.counts[key] += 1
+        if scope.counts[key] == N_PLUS_ONE and key not in scope.sites:
+            scope.sites[key] = call_site()
+
+
+def _attach(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def install():
+    """FrontConfig.ready dan chaqiriladi"""
+    if not ENABLED:
+        return
+    connection_created.connect(_attach, dispatch_uid='front.querylog')
+    for connection in connections.all(initialized_only=True):
+        _attach(connection)
+    atexit.register(flush)
+
+
+# ==================== FAYL ====================
+def process_path(pid):
+    """var/log/queries.log -> var/log/queries-<pid>.log"""
+    stem, ext = os.path.splitext(PATH)
+    return f'{stem}-{pid}{ext}'
+
+
+def _all_paths():
+    stem, ext = os.path.splitext(PATH)
+    return glob.glob(f'{glob.escape(stem)}-*{ext}') + glob.glob(f'{glob.escape(stem)}-*{ext}.*')
+
+
+def _prune():
+    cutoff = time.time() - KEEP_DAYS * 86400
+    for path in _all_paths():
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            continue
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        with _lock:
+            if _logger is None:
+                os.makedirs(os.path.dirname(PATH), exist_ok=True)
+                _prune()
+                logger = logging.getLogger('front.querylog')
+                logger.propagate = False
+                logger.setLevel(logging.INFO)
+                # Fork dan oldin ochilgan (ota-onaning) fayli yopiladi
+                for handler in list(logger.handlers):
+                    logger.removeHandler(handler)
+                    handler.close()
+                handler = RotatingFileHandler(process_path(os.getpid()), maxBytes=MAX_BYTES,
+                                              backupCount=BACKUP_COUNT, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+
+def write(record):
+    record.setdefault('time', round(time.time(), 3))
+    record.setdefault('pid', os.getpid())
+    try:
+        _get_logger().info(json.dumps(record, ensure_ascii=False))
+    except OSError:
+        pass
+
+
+def flush():
+    """Yig'ilgan statistika faylga delta sifatida yoziladi va xotira tozalanadi"""
+    global _stats, _last_flush
+    with _lock:
+        stats, _stats = _stats, {}
+        _last_flush = time.monotonic()
+    if stats:
+        write({'type': 'stats', 'stats': {key: [count, round(total, 3), round(peak, 3)]
+                                          for key, (count, total, peak) in stats.items()}})
+
+
+def maybe_flush():
+    if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
+
+
+# ==================== O'QISH ====================
+def read_records():
+    """Barcha jarayonlarning joriy va aylantirilgan fayllaridagi yozuvlar - eskisidan yangisiga"""
+    records = []
+    for path in _all_paths():
+        try:
+            with open(path, encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
+    records.sort(key=lambda record: record.get('time', 0))
+    return records
+
+
+def report(limit=50):
+    """Admin sahifasi uchun: izlar umumiy vaqt bo'yicha, oxirgi sekin so'rovlar va N+1 lar"""
+    totals, slow, repeated = {}, [], {}
+    for record in read_records():
+        kind = record.get('type')
+        if kind == 'stats':
+            for key, (count, total, peak) in record['stats'].items():
+                entry = totals.setdefault(key, [0, 0.0, 0.0])
+                entry[0] += count
+                entry[1] += total
+                entry[2] = max(entry[2], peak)
+        elif kind == 'slow':
+            slow.append(record)
+        elif kind == 'n+1':
+            key = (record['fingerprint'], record.get('view'), record.get('site'))
+            entry = repeated.setdefault(key, {**record, 'requests': 0, 'max_count': 0})
+            entry['requests'] += 1
+            entry['max_count'] = max(entry['max_count'], record['count'])
+            entry['time'] = record['time']
+
+    fingerprints = sorted(
+        ({'fingerprint': key, 'count': count, 'total': total, 'max': peak, 'avg': total / count}
+         for key, (count, total, peak) in totals.items() if count),
+        key=lambda row: row['total'], reverse=True,
+    )
+    return {
+        'fingerprints': fingerprints[:limit],
+        'slow': slow[-limit:][::-1],
+        'n_plus_one': sorted(repeated.values(), key=lambda row: row['requests'] * row['max_count'], reverse=True)[:limit],
+    }
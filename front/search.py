@@ -0,0 +1,170 @@
+"""
+PolyglotLC - Qidiruv indeksi
+Har bir model uchun SQLite FTS5 virtual jadvali (front_search_<model>), rowid =
+obyekt pk si - yangilash va o'chirish rowid bo'yicha, indeksni to'liq o'qimaydi.
+Model signallari orqali yangilanadi, `manage.py rebuild_search_index` bilan to'liq
+qayta quriladi. Boshqa DB larda icontains ga qaytadi.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+TABLE_PREFIX = 'front_search_'
+
+# model label -> (sarlavha maydonlari, matn maydonlari, ko'rinish maydoni)
+REGISTRY = {
+    'front.course': (('title',), ('short_description', 'full_description'), 'is_active'),
+    'front.teacher': (('first_name', 'last_name'), ('education', 'bio'), 'is_active'),
+    'front.news': (('title',), ('short_description', 'content'), 'is_published'),
+    'front.faq': (('question',), ('answer',), 'is_active'),
+    'front.certificate': (('student_name', 'certificate_number'), ('score',), None),
+}
+
+# Ustunlar: visible, title, body - sarlavhadagi moslik matndagidan 10 barobar og'irroq
+BM25_WEIGHTS = '0, 10.0, 1.0'
+
+# o‘ / oʻ / o' / o` va tutuq belgisi (ma'lumot) - hammasi olib tashlanadi
+APOSTROPHES = re.compile('[\'`´‘’ʻʼ]')
+TOKEN = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Matnni indeks va so'rov uchun bir xil ko'rinishga keltiradi"""
+    return APOSTROPHES.sub('', str(text or '')).lower()
+
+
+def build_match(query):
+    """Foydalanuvchi so'rovidan FTS5 MATCH ifodasi (har bir so'z prefiks bilan)"""
+    tokens = TOKEN.findall(normalize(query))
+    return ' '.join(f'"{t}"*' for t in tokens)
+
+
+def is_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def table_for(label):
+    """'front.course' -> 'front_search_course'"""
+    return TABLE_PREFIX + label.split('.')[1]
+
+
+def document_for(obj):
+    """Obyektdan (sarlavha, matn, ko'rinadimi) qatorini yasaydi"""
+    title_fields, body_fields, visible_field = REGISTRY[_label(obj)]
+    title = ' '.join(normalize(getattr(obj, f)) for f in title_fields)
+    body = ' '.join(normalize(getattr(obj, f)) for f in body_fields)
+    visible = getattr(obj, visible_field) if visible_field else True
+    return title, body, int(bool(visible))
+
+
+# ==================== INDEKSNI YANGILASH ====================
+def index_object(obj):
+    if not is_enabled():
+        return
+    title, body, visible = document_for(obj)
+    table = table_for(_label(obj))
+    with connection.cursor() as c:
+        c.execute(f'DELETE FROM {table} WHERE rowid = %s', [obj.pk])
+        c.execute(
+            f'INSERT INTO {table} (rowid, title, body, visible) VALUES (%s, %s, %s, %s)',
+            [obj.pk, title, body, visible],
+        )
+
+
+def index_objects(objs):
+    """Ko'p obyektni bitta executemany bilan indekslaydi (bulk_create/bulk_update dan keyin)"""
+    if not is_enabled():
+        return
+    # {jadval: {pk: hujjat}} - bir obyekt ikki marta berilsa ham bitta qator
+    rows_by_table = {}
+    for obj in objs:
+        if obj.pk is not None:
+            rows_by_table.setdefault(table_for(_label(obj)), {})[obj.pk] = document_for(obj)
+    with connection.cursor() as c:
+        for table, rows in rows_by_table.items():
+            c.executemany(f'DELETE FROM {table} WHERE rowid = %s', [(pk,) for pk in rows])
+            c.executemany(
+                f'INSERT INTO {table} (rowid, title, body, visible) VALUES (%s, %s, %s, %s)',
+                [(pk, *document) for pk, document in rows.items()],
+            )
+
+
+def remove_object(obj):
+    if not is_enabled():
+        return
+    with connection.cursor() as c:
+        c.execute(f'DELETE FROM {table_for(_label(obj))} WHERE rowid = %s', [obj.pk])
+
+
+def rebuild(models=None, chunk_size=500, app_registry=apps):
+    """Indeksni noldan quradi. Har bir model uchun indekslangan qatorlar sonini qaytaradi."""
+    labels = models or list(REGISTRY)
+    counts = {}
+    with connection.cursor() as c:
+        for label in labels:
+            model = app_registry.get_model(label)
+            table = table_for(label)
+            c.execute(f'DELETE FROM {table}')
+            rows = []
+            for obj in model._default_manager.order_by().iterator(chunk_size=chunk_size):
+                rows.append((obj.pk, *document_for(obj)))
+            c.executemany(f'INSERT INTO {table} (rowid, title, body, visible) VALUES (%s, %s, %s, %s)', rows)
+            counts[label] = len(rows)
+    return counts
+
+
+# ==================== QIDIRUV ====================
+def _fallback_q(model, query):
+    title_fields, body_fields, _ = REGISTRY[_label(model)]
+    return reduce(or_, (Q(**{f'{f}__icontains': query}) for f in title_fields + body_fields))
+
+
+def filter_queryset(queryset, query):
+    """Querysetni qidiruv so'rovi bo'yicha filtrlaydi (bitta subquery)"""
+    match = build_match(query)
+    if not match:
+        return queryset
+    if not is_enabled():
+        return queryset.filter(_fallback_q(queryset.model, query))
+    table = table_for(_label(queryset.model))
+    return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', (match,)))
+
+
+def ranked(model, query, limit=5, queryset=None):
+    """Eng mos obyektlar ro'yxati (bm25 bo'yicha tartiblangan, faqat ko'rinadiganlari)"""
+    queryset = model._default_manager.all() if queryset is None else queryset
+    match = build_match(query)
+    if not match:
+        return []
+    if not is_enabled():
+        _, _, visible_field = REGISTRY[_label(model)]
+        qs = queryset.filter(_fallback_q(model, query))
+        if visible_field:
+            qs = qs.filter(**{visible_field: True})
+        return list(qs[:limit])
+
+    table = table_for(_label(model))
+    with connection.cursor() as c:
+        c.execute(
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s AND visible = 1 '
+            f'ORDER BY bm25({table}, {BM25_WEIGHTS}) LIMIT %s',
+            [match, limit],
+        )
+        ids = [row[0] for row in c.fetchall()]
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+def search(query, limit=5):
+    """Global qidiruv: {label: [obyektlar]}"""
+    return {label: ranked(apps.get_model(label), query, limit) for label in REGISTRY}
@@ -0,0 +1,66 @@
+"""
+PolyglotLC - Sertifikat raqamlari ketma-ketligi
+Har yil uchun CertificateSequence qatori oxirgi berilgan raqamni saqlaydi.
+Raqamlar `UPDATE ... SET last_value = last_value + n` bilan band qilinadi:
+bir vaqtdagi so'rovlar bir xil raqam olmaydi, jadval skan qilinmaydi va
+9999 dan keyin ham raqamlar to'g'ri o'sadi (PLC-2026-10000).
+Tranzaksiya qaytarilsa band qilingan raqamlar ham qaytadi - bo'shliq qolmaydi.
+"""
+import re
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+PREFIX = 'PLC'
+PATTERN = re.compile(rf'^{PREFIX}-(\d{{4}})-(\d+)$')
+
+
+def format_number(year, value):
+    return f'{PREFIX}-{year}-{value:04d}'
+
+
+def parse_number(number):
+    """'PLC-2026-0042' -> (2026, 42), mos kelmasa None"""
+    match = PATTERN.match(number or '')
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def existing_max(year, app_registry=apps):
+    """Shu yil uchun bazadagi eng katta raqam (satr emas, son bo'yicha)"""
+    Certificate = app_registry.get_model('front', 'Certificate')
+    numbers = Certificate.objects.filter(
+        certificate_number__startswith=f'{PREFIX}-{year}-',
+    ).values_list('certificate_number', flat=True)
+    return max((parsed[1] for parsed in map(parse_number, numbers) if parsed), default=0)
+
+
+def reserve(count=1, year=None):
+    """`count` ta ketma-ket raqamni band qiladi: range(birinchi, oxirgi + 1)"""
+    if count < 1:
+        return range(0)
+    year = year or timezone.localdate().year
+    Sequence = apps.get_model('front', 'CertificateSequence')
+    with transaction.atomic():
+        if not Sequence.objects.filter(year=year).update(last_value=F('last_value') + count):
+            # Yil uchun birinchi raqam: mavjud sertifikatlardan davom ettiramiz
+            try:
+                with transaction.atomic():
+                    Sequence.objects.create(year=year, last_value=existing_max(year) + count)
+            except IntegrityError:
+                Sequence.objects.filter(year=year).update(last_value=F('last_value') + count)
+        last = Sequence.objects.filter(year=year).values_list('last_value', flat=True).get()
+    return range(last - count + 1, last + 1)
+
+
+def next_number(year=None):
+    year = year or timezone.localdate().year
+    return format_number(year, reserve(1, year)[0])
+
+
+def reserve_numbers(count, year=None):
+    """Ommaviy berish uchun: bitta tranzaksiyada `count` ta raqam"""
+    year = year or timezone.localdate().year
+    return [format_number(year, value) for value in reserve(count, year)]
+
@@ -0,0 +1,125 @@
+"""
+PolyglotLC - Model signallari
+Ma'lumot o'zgarganda keshlar, qidiruv indeksi va rasm derivativlarini yangilash
+"""
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from import_export.signals import post_import
+
+from . import denorm, images, jobs, page_cache, search
+from .cache import invalidate_site_settings
+from .models import SiteSettings, Certificate, Course, CourseEnrollment, TeacherApplication, Contact
+from .utils import invalidate_badge_counts
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== SAYT SOZLAMALARI ====================
+@receiver(post_save, sender=SiteSettings, dispatch_uid='site_settings_saved')
+@receiver(post_delete, sender=SiteSettings, dispatch_uid='site_settings_deleted')
+def site_settings_changed(sender, **kwargs):
+    # Commitdan keyin - aks holda boshqa worker eski qatorni yangi versiya bilan keshlashi mumkin
+    transaction.on_commit(invalidate_site_settings)
+
+
+# ==================== QIDIRUV INDEKSI ====================
+def search_index_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_object(instance)
+
+
+def search_index_deleted(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+for label in search.REGISTRY:
+    model = apps.get_model(label)
+    post_save.connect(search_index_saved, sender=model, dispatch_uid=f'search_index_saved_{label}')
+    post_delete.connect(search_index_deleted, sender=model, dispatch_uid=f'search_index_deleted_{label}')
+
+
+# ==================== HISOBLAGICHLAR ====================
+denorm.connect()
+
+
+# ==================== RASM DERIVATIVLARI ====================
+def image_derivatives_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    label = sender._meta.label_lower
+    for field in images.IMAGE_FIELDS[label]:
+        images.ensure(getattr(instance, field))
+    if label in images.THUMBNAIL_FIELDS:
+        source_field, thumb_field = images.THUMBNAIL_FIELDS[label]
+        try:
+            images.make_thumbnail(instance, source_field, thumb_field)
+        except FileNotFoundError:
+            logger.warning('Thumbnail uchun rasm topilmadi: %s', instance)
+        except OSError:
+            logger.exception('Thumbnail yasab bo\'lmadi: %s', instance)
+
+
+for label in images.IMAGE_FIELDS:
+    post_save.connect(image_derivatives_saved, sender=apps.get_model(label),
+                      dispatch_uid=f'image_derivatives_saved_{label}')
+
+
+# ==================== SERTIFIKAT RASMI ====================
+@receiver(post_save, sender=Certificate, dispatch_uid='certificate_render_saved')
+def certificate_saved(sender, instance, raw=False, **kwargs):
+    # Rasmsiz saqlangan sertifikat kurs shablonidan chiziladi (rasm yozilishi save() siz)
+    if raw or instance.certificate_image:
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: jobs.render_certificates.delay([pk], processes=0))
+
+
+@receiver(post_import, dispatch_uid='certificate_render_imported')
+def certificates_imported(sender, model, **kwargs):
+    # Import bulk_create bilan yozadi - post_save yo'q, rasmsizlar birdaniga navbatga
+    if model is not Certificate:
+        return
+
+    def run():
+        ids = list(Certificate.objects.filter(certificate_image='').values_list('pk', flat=True))
+        if ids:
+            jobs.render_certificates.delay(ids)
+    transaction.on_commit(run)
+
+
+# ==================== SAHIFA KESHI ====================
+def _invalidate_pages(*labels):
+    def run():
+        for label in labels:
+            page_cache.invalidate(label)
+    transaction.on_commit(run)
+
+
+@receiver(post_save, dispatch_uid='page_cache_saved')
+@receiver(post_delete, dispatch_uid='page_cache_deleted')
+def page_cache_model_changed(sender, **kwargs):
+    if sender._meta.app_label == 'front':
+        _invalidate_pages(sender._meta.label_lower)
+
+
+@receiver(m2m_changed, dispatch_uid='page_cache_m2m_changed')
+def page_cache_m2m_changed(sender, instance, action, model, **kwargs):
+    if action.startswith('post_') and instance._meta.app_label == 'front':
+        _invalidate_pages(instance._meta.label_lower, model._meta.label_lower)
+
+
+# ==================== ADMIN BADGE LARI ====================
+@receiver(post_save, sender=Course, dispatch_uid='badges_course_saved')
+@receiver(post_delete, sender=Course, dispatch_uid='badges_course_deleted')
+@receiver(post_save, sender=CourseEnrollment, dispatch_uid='badges_enrollment_saved')
+@receiver(post_delete, sender=CourseEnrollment, dispatch_uid='badges_enrollment_deleted')
+@receiver(post_save, sender=TeacherApplication, dispatch_uid='badges_application_saved')
+@receiver(post_delete, sender=TeacherApplication, dispatch_uid='badges_application_deleted')
+@receiver(post_save, sender=Contact, dispatch_uid='badges_contact_saved')
+@receiver(post_delete, sender=Contact, dispatch_uid='badges_contact_deleted')
+def badge_counts_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_badge_counts)
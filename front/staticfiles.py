@@ -0,0 +1,217 @@
+"""
+PolyglotLC - Statik fayllar
+collectstatic uchun storage: CSS/JS minifikatsiya qilinadi, keyin nomiga
+kontent xeshi qo'shiladi (main.3f2a9c.css) va matnli fayllar yoniga .gz va .br
+nusxalar yoziladi. Xeshli fayllar o'zgarmaydi - ularni front.middleware
+`immutable` sarlavhasi bilan beradi.
+
+Minifikatorlar ehtiyotkor: faqat izohlar va ortiqcha bo'shliqlar olib tashlanadi,
+JS da qator oxirlari saqlanadi (ASI buzilmasin), satr/regex ichiga tegilmaydi.
+Faqat loyihaning o'z fayllari (STATICFILES_DIRS) minifikatsiya qilinadi - admin va
+paketlar fayllari o'zgarishsiz qoladi.
+"""
+import gzip
+import logging
+import os
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+MINIFY = ('.css', '.js')
+COMPRESS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map', '.ico')
+MIN_COMPRESS_SIZE = 256
+# Siqilgan nusxa kamida 5% kichik bo'lmasa yozilmaydi
+MIN_RATIO = 0.95
+
+
+# ==================== CSS ====================
+CSS_TOKENS = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*(?!!).*?\*/)''', re.S)
+CSS_SPACES = re.compile(r'\s*([{};,>])\s*')
+
+
+def _compact_css(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = CSS_SPACES.sub(r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}')
+
+
+def minify_css(source):
+    """Izohlar (/*! litsenziya */ dan tashqari) va bo'shliqlar olib tashlanadi"""
+    parts, position = [], 0
+    for match in CSS_TOKENS.finditer(source):
+        parts.append(_compact_css(source[position:match.start()]))
+        if match.group(1):
+            parts.append(match.group(1))
+        position = match.end()
+    parts.append(_compact_css(source[position:]))
+    return ''.join(parts).strip()
+
+
+# ==================== JS ====================
+REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = re.compile(r'(?:^|[^\w$])(?:return|typeof|case|do|else|in|of|new|delete|void|throw)$')
+
+
+def _skip_string(source, i, quote):
+    j = i + 1
+    while j < len(source) and source[j] != quote:
+        j += 2 if source[j] == '\\' else 1
+    return j + 1
+
+
+def _skip_regex(source, i):
+    j, in_class = i + 1, False
+    while j < len(source) and source[j] != '\n':
+        char = source[j]
+        if char == '\\':
+            j += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            return j + 1
+        j += 1
+    return j
+
+
+def minify_js(source):
+    """Izohlar, qator boshidagi/oxiridagi bo'shliqlar va bo'sh qatorlar olib tashlanadi"""
+    out = []
+    last = ''  # oxirgi bo'sh bo'lmagan belgi - '/' regexmi yoki bo'lishmi
+    i, length = 0, len(source)
+    while i < length:
+        char = source[i]
+        following = source[i + 1:i + 2]
+        if char in '\'"`':
+            end = _skip_string(source, i, char)
+            out.append(source[i:end])
+            last, i = char, end
+        elif char == '/' and following == '/':
+            end = source.find('\n', i)
+            i = length if end == -1 else end
+        elif char == '/' and following == '*':
+            end = source.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            if source.startswith('/*!', i):
+                out.append(source[i:end])
+            elif out and out[-1] not in (' ', '\n'):
+                out.append('\n' if '\n' in source[i:end] else ' ')
+            i = end
+        elif char == '/' and (not last or last in REGEX_AFTER or REGEX_KEYWORDS.search(''.join(out[-12:]).rstrip())):
+            end = _skip_regex(source, i)
+            out.append(source[i:end])
+            last, i = '/', end
+        elif char in ' \t\r\n':
+            end = i
+            while end < length and source[end] in ' \t\r\n':
+                end += 1
+            newline = '\n' in source[i:end]
+            if out and out[-1] == ' ':
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n' if newline else ' ')
+            i = end
+        else:
+            out.append(char)
+            last, i = char, i + 1
+    return ''.join(out).strip()
+
+
+def minify(name, content):
+    if name.endswith('.css'):
+        return minify_css(content)
+    if name.endswith('.js'):
+        return minify_js(content)
+    return content
+
+
+# ==================== SIQISH ====================
+@lru_cache(maxsize=1)
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        logger.warning("brotli o'rnatilmagan - .br fayllar yozilmaydi")
+        return None
+    return brotli
+
+
+def compressed_variants(data):
+    """{'.gz': bytes, '.br': bytes} - mtime=0, natija har safar bir xil"""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+# ==================== STORAGE ====================
+def project_roots():
+    return {
+        os.path.abspath(root[1] if isinstance(root, (list, tuple)) else root)
+        for root in settings.STATICFILES_DIRS
+    }
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Minifikatsiya -> xeshlash (Django) -> .gz/.br.
+    collectstatic ishga tushirilmagan muhitda (dev, testlar) asl nom qaytariladi.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            roots = project_roots()
+            for name, (storage, _) in paths.items():
+                location = getattr(storage, 'location', None)
+                if (name.endswith(MINIFY) and '.min.' not in name
+                        and location and os.path.abspath(location) in roots):
+                    self._minify(name)
+                    # Xesh va CSS url() almashtirish minifikatsiya qilingan nusxadan
+                    paths[name] = (self, name)
+
+        yield from super().post_process(paths, dry_run, **options)
+
+        if not dry_run:
+            names = set(paths) | set(self.hashed_files.values())
+            for name in sorted(names):
+                if name.endswith(COMPRESS):
+                    self._compress(name)
+
+    def _minify(self, name):
+        with self.open(name) as fh:
+            source = fh.read().decode('utf-8')
+        result = minify(name, source)
+        if result != source:
+            self._replace(name, result.encode('utf-8'))
+
+    def _compress(self, name):
+        with self.open(name) as fh:
+            data = fh.read()
+        for suffix, compressed in compressed_variants(data).items():
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            if len(data) >= MIN_COMPRESS_SIZE and len(compressed) < len(data) * MIN_RATIO:
+                self._save(target, ContentFile(compressed))
+
+    def _replace(self, name, data):
+        self.delete(name)
+        self._save(name, ContentFile(data))
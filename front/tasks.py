@@ -0,0 +1,310 @@
+"""
+PolyglotLC - Fon vazifalari navbati
+Sekin ishlar (fayllarni saqlash, admin ommaviy amallari) so'rov ichida emas,
+`manage.py runworker` jarayonida bajariladi. Navbat - oddiy Task jadvali:
+Redis yoki boshqa broker kerak emas, bitta serverda SQLite bilan ishlaydi.
+
+    @task(priority=10, max_attempts=5)
+    def attach_files(application_id): ...
+
+    attach_files.delay(application.pk)
+
+Vazifalar `<app>/jobs.py` modullarida e'lon qilinadi - worker ularni o'zi yuklaydi.
+Argumentlar JSON ga yoziladi: obyekt o'rniga uning pk sini bering.
+TASKS_EAGER=True bo'lsa vazifa navbatsiz, darhol bajariladi (test va dev uchun).
+"""
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+from uuid import uuid4
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.functional import LazyObject
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = {}
+
+MAX_BACKOFF = 3600
+# Worker bajarilayotgan vazifalarining locked_at ini shu oraliqda yangilab turadi
+HEARTBEAT_INTERVAL = getattr(settings, 'TASKS_HEARTBEAT_INTERVAL', 30)
+# locked_at shuncha vaqt yangilanmagan "running" vazifa - worker o'lgan, qayta navbatga
+LOCK_TIMEOUT = getattr(settings, 'TASKS_LOCK_TIMEOUT', 4 * HEARTBEAT_INTERVAL)
+# Bajarilgan vazifalar shuncha kun saqlanadi
+KEEP_DAYS = getattr(settings, 'TASKS_KEEP_DAYS', 7)
+MAINTENANCE_INTERVAL = 60
+
+
+def _task_model():
+    # Modul Django yuklanmasdan oldin ham import qilinadi (spawn qilingan jarayon)
+    return apps.get_model('front', 'Task')
+
+
+# ==================== E'LON QILISH ====================
+class TaskFunction:
+    """@task bilan o'ralgan funksiya: oddiy chaqirilsa - darhol, .delay() - navbat orqali"""
+
+    def __init__(self, func, name, priority, max_attempts, backoff):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, priority=None, countdown=0):
+        return enqueue(self.name, args, kwargs, priority=priority, countdown=countdown)
+
+    def retry_delay(self, attempts):
+        """Eksponensial kutish (+25% gacha tasodifiy) - bir vaqtda qulagan vazifalar birga qaytmasin"""
+        delay = min(MAX_BACKOFF, self.backoff * 2 ** max(0, attempts - 1))
+        return delay * (1 + random.random() / 4)
+
+
+def task(func=None, *, name=None, priority=0, max_attempts=3, backoff=10):
+    """Funksiyani fon vazifasi sifatida ro'yxatga oladi"""
+    def register(func):
+        wrapped = TaskFunction(func, name or f'{func.__module__}.{func.__qualname__}',
+                               priority, max_attempts, backoff)
+        REGISTRY[wrapped.name] = wrapped
+        return wrapped
+
+    return register(func) if func is not None else register
+
+
+def autodiscover():
+    autodiscover_modules('jobs')
+
+
+# ==================== NAVBATGA QO'YISH ====================
+def enqueue(name, args=(), kwargs=None, priority=None, countdown=0):
+    """
+    Vazifani navbatga qo'yadi. Qator joriy tranzaksiya ichida yoziladi - worker uni
+    faqat commitdan keyin ko'radi, rollback bo'lsa vazifa ham yo'qoladi.
+    """
+    func = REGISTRY.get(name)
+    if func is None:
+        raise LookupError(f"Ro'yxatdan o'tmagan vazifa: {name}")
+    args, kwargs = list(args), dict(kwargs or {})
+    if getattr(settings, 'TASKS_EAGER', False):
+        func(*args, **kwargs)
+        return None
+    return _task_model().objects.create(
+        name=name, args=args, kwargs=kwargs,
+        priority=func.priority if priority is None else priority,
+        max_attempts=func.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=countdown),
+    )
+
+
+# ==================== BAJARISH ====================
+def claim(worker_id, limit=1):
+    """
+    Navbatdan `limit` tagacha vazifani oladi (pk lar ro'yxati).
+    SELECT ... FOR UPDATE SKIP LOCKED o'rniga shartli UPDATE: boshqa worker
+    ulgurib olgan qator 0 qator yangilaydi va o'tkazib yuboriladi.
+    """
+    Task = _task_model()
+    now = timezone.now()
+    candidates = list(
+        Task.objects.filter(status=Task.QUEUED, run_at__lte=now)
+        .order_by('-priority', 'run_at', 'id')
+        .values_list('pk', flat=True)[:limit * 2]
+    )
+    claimed = []
+    for pk in candidates:
+        if len(claimed) == limit:
+            break
+        updated = Task.objects.filter(pk=pk, status=Task.QUEUED).update(
+            status=Task.RUNNING, locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def execute(pk):
+    """Olingan vazifani bajaradi. Muvaffaqiyatli bo'lsa True."""
+    Task = _task_model()
+    try:
+        task = Task.objects.get(pk=pk)
+        func = REGISTRY.get(task.name)
+        try:
+            if func is None:
+                raise LookupError(f"Ro'yxatdan o'tmagan vazifa: {task.name}")
+            func(*task.args, **task.kwargs)
+        except Exception:
+            logger.exception('Vazifa bajarilmadi: %s', task)
+            _fail(task, func, traceback.format_exc())
+            return False
+        Task.objects.filter(pk=pk).update(
+            status=Task.DONE, finished_at=timezone.now(), locked_by='', last_error='',
+        )
+        return True
+    finally:
+        close_old_connections()
+
+
+def _fail(task, func, error):
+    """Urinishlar qolgan bo'lsa kutish bilan qayta navbatga, aks holda failed"""
+    Task = _task_model()
+    now = timezone.now()
+    if func is not None and task.attempts < task.max_attempts:
+        changes = {'status': Task.QUEUED, 'run_at': now + timedelta(seconds=func.retry_delay(task.attempts))}
+    else:
+        changes = {'status': Task.FAILED, 'finished_at': now}
+    Task.objects.filter(pk=task.pk).update(locked_by='', last_error=error, **changes)
+
+
+def heartbeat(worker_id, pks):
+    """Worker hali ishlayotganini bildiradi - vazifalar requeue_stale ga tushmaydi"""
+    if not pks:
+        return 0
+    Task = _task_model()
+    return Task.objects.filter(pk__in=pks, status=Task.RUNNING, locked_by=worker_id).update(
+        locked_at=timezone.now(),
+    )
+
+
+def requeue_stale(timeout=LOCK_TIMEOUT):
+    """Heartbeat i to'xtagan (worker o'lgan) `running` vazifalarni qaytaradi"""
+    Task = _task_model()
+    now = timezone.now()
+    stale = Task.objects.filter(status=Task.RUNNING, locked_at__lt=now - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED, finished_at=now, locked_by='', last_error='Worker javob bermadi',
+    )
+    requeued = stale.update(status=Task.QUEUED, run_at=now, locked_by='')
+    return requeued, failed
+
+
+def purge(days=KEEP_DAYS):
+    """Eski bajarilgan vazifalarni o'chiradi (xatolar qoladi)"""
+    Task = _task_model()
+    return Task.objects.filter(
+        status=Task.DONE, finished_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()[0]
+
+
+def _init_process():
+    # spawn qilingan jarayon Django ni noldan yuklaydi
+    import django
+    django.setup()
+    autodiscover()
+
+
+class Worker:
+    """
+    Navbatni o'qib vazifalarni pool ga beradi.
+    processes=False - oqimlar (I/O ishlari uchun), True - alohida jarayonlar (CPU ishlari uchun).
+    burst=True - navbat bo'shaganda to'xtaydi.
+    """
+
+    def __init__(self, concurrency=2, processes=False, poll_interval=1.0, burst=False):
+        self.concurrency = concurrency
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.id = f'{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}'
+        self.stopping = False
+        self.processed = 0
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def _executor(self):
+        if self.processes:
+            # spawn: jarayonlar ota-onaning SQLite ulanishini meros qilib olmaydi
+            return ProcessPoolExecutor(self.concurrency, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_process)
+        return ThreadPoolExecutor(self.concurrency, thread_name_prefix='task')
+
+    def _maintenance(self):
+        requeued, failed = requeue_stale()
+        if requeued or failed:
+            logger.warning('Qotgan vazifalar: %s qayta navbatga, %s xato', requeued, failed)
+        purge()
+
+    def run(self):
+        autodiscover()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.stop)
+
+        running = {}  # future -> task pk
+        next_maintenance = next_heartbeat = 0
+        with self._executor() as executor:
+            while not self.stopping:
+                if time.monotonic() >= next_maintenance:
+                    self._maintenance()
+                    next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+                finished = [future for future in running if future.done()]
+                for future in finished:
+                    del running[future]
+                self.processed += len(finished)
+
+                # Faqat haqiqatan bajarilayotganlari: qulagan jarayondagi vazifa heartbeat siz qoladi
+                if running and time.monotonic() >= next_heartbeat:
+                    heartbeat(self.id, list(running.values()))
+                    next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+
+                free = self.concurrency - len(running)
+                claimed = claim(self.id, free) if free else []
+                for pk in claimed:
+                    running[executor.submit(execute, pk)] = pk
+                if claimed:
+                    continue
+                if self.burst and not running:
+                    break
+                if running:
+                    wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(self.poll_interval)
+            # To'xtash so'ralganda boshlangan vazifalar oxirigacha bajariladi (heartbeat davom etadi)
+            pending = set(running)
+            while pending:
+                _, pending = wait(pending, timeout=HEARTBEAT_INTERVAL)
+                heartbeat(self.id, [running[future] for future in pending])
+        self.processed += len(running)
+        return self.processed
+
+
+# ==================== FAYLLAR ====================
+class StagingStorage(LazyObject):
+    """
+    Yuklangan fayllar uchun vaqtinchalik joy (media dan tashqarida, ochiq emas).
+    So'rov faylni shu yerga ko'chiradi, worker esa asosiy storage ga saqlaydi.
+    """
+
+    def _setup(self):
+        location = getattr(settings, 'TASKS_STAGING_ROOT', settings.BASE_DIR / 'var' / 'staging')
+        self._wrapped = FileSystemStorage(location=location)
+
+
+staging_storage = StagingStorage()
+
+
+def stage_upload(uploaded_file):
+    """UploadedFile ni staging ga yozadi: (staging nomi, asl nomi)"""
+    _, ext = os.path.splitext(uploaded_file.name)
+    return staging_storage.save(f'{uuid4().hex}{ext.lower()}', uploaded_file), uploaded_file.name
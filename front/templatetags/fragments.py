@@ -0,0 +1,22 @@
+from django import template
+
+from front import page_cache
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def fragment_versions(context, *labels):
+    """
+    Bog'liq modellar versiyasi - fragment kesh kalitiga qo'shiladi.
+    Bir so'rov ichida bir marta hisoblanadi.
+    """
+    request = context.get('request')
+    memo = getattr(request, '_fragment_versions', None) if request is not None else None
+    if memo is None:
+        memo = {}
+        if request is not None:
+            request._fragment_versions = memo
+    if labels not in memo:
+        memo[labels] = page_cache.dependency_stamp(labels)
+    return memo[labels]
@@ -0,0 +1,46 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from front import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(image, alt='', sizes='100vw', css_class='', title='', loading='lazy', full=False):
+    """
+    <picture> + srcset (AVIF, WebP, JPEG/PNG).
+    Foydalanish: {% picture course.main_image course.title sizes="(max-width: 576px) 100vw, 400px" %}
+    """
+    if not image:
+        return ''
+    try:
+        found = images.variants(image)
+    except (OSError, ValueError):
+        found = {}
+
+    fallback = images.fallback_format(image.name)
+    extra = format_html(' class="{}"', css_class) if css_class else ''
+    if title:
+        extra = format_html('{} title="{}"', extra, title)
+    if full:
+        extra = format_html('{} data-full="{}"', extra, image.url)
+
+    if not found.get(fallback):
+        return format_html('<img src="{}" alt="{}" loading="{}"{}>', image.url, alt, loading, extra)
+
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}" sizes="{}">',
+        ((fmt, srcset(found[fmt]), sizes) for fmt in images.modern_formats() if found.get(fmt)),
+    )
+    fallback_set = found[fallback]
+    # srcset ni tushunmaydigan brauzerlar uchun o'rtacha o'lcham
+    src = next((url for width, url in reversed(fallback_set) if width <= 640), fallback_set[0][1])
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="{}" decoding="async"{}></picture>',
+        sources, src, srcset(fallback_set), sizes, alt, loading, extra,
+    )
+
+
+def srcset(entries):
+    return ', '.join(f'{url} {width}w' for width, url in entries)
@@ -1,3 +1,501 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import posixpath
+import shutil
+import tempfile
+import time
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from PIL import Image
+
+from . import cache as cache_layer, denorm, images, page_cache, pagination, search, tasks, verification
+from .models import (
+    User, Subject, Teacher, Course, CourseEnrollment, Certificate, News,
+    GalleryCategory, Gallery, TeacherApplication, Testimonial, FAQCategory, FAQ, Task,
+)
+
+
+class AdminChangelistQueryCountTests(TestCase):
+    """Changelist so'rovlar soni qatorlar soniga bog'liq bo'lmasligi kerak"""
+
+    CHANGELISTS = (
+        'front_subject', 'front_teacher', 'front_course', 'front_courseenrollment',
+        'front_certificate', 'front_news', 'front_gallerycategory', 'front_gallery',
+        'front_teacherapplication', 'front_testimonial', 'front_faqcategory', 'front_faq',
+    )
+
+    def setUp(self):
+        cache.clear()
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'parol12345')
+        self.client.force_login(admin)
+        self.author = User.objects.create(username='muallif', first_name='Muallif')
+        self.counter = 0
+
+    def create_rows(self, n):
+        for _ in range(n):
+            self.counter += 1
+            i = self.counter
+            subject = Subject.objects.create(name=f'Fan {i}')
+            teacher = Teacher.objects.create(
+                first_name=f'Ism{i}', last_name='Familiya', photo='teachers/t.jpg', phone='1',
+                education='TSUL', experience_years=3, bio='b', full_bio='fb',
+            )
+            teacher.specializations.add(subject)
+            course = Course.objects.create(
+                title=f'Kurs {i}', subject=subject, main_image='courses/c.jpg',
+                short_description='s', full_description='f', duration_months=3, price=100,
+                what_you_learn='w', target_audience='t',
+            )
+            course.teachers.add(teacher)
+            CourseEnrollment.objects.create(full_name=f'Talaba {i}', phone='1', course=course)
+            Certificate.objects.create(
+                student_name=f'Talaba {i}', course=course, teacher=teacher,
+                certificate_image='certificates/c.jpg', certificate_number=f'PLC-2026-{i:04d}',
+                issue_date=datetime.date(2026, 1, 1),
+            )
+            News.objects.create(
+                title=f'Yangilik {i}', main_image='news/n.jpg', short_description='s',
+                content='c', author=self.author,
+            )
+            category = GalleryCategory.objects.create(name=f'Kategoriya {i}')
+            Gallery.objects.create(image='gallery/g.jpg', category=category)
+            TeacherApplication.objects.create(
+                first_name='A', last_name='B', phone='1', email='a@example.com', education='e',
+                experience_years=1, subject=subject, cv_file='cv.pdf', about_me='a', why_teach='w',
+            )
+            Testimonial.objects.create(student_name=f'Talaba {i}', course=course, comment='c')
+            faq_category = FAQCategory.objects.create(name=f'FAQ {i}')
+            FAQ.objects.create(category=faq_category, question='Savol?', answer='Javob')
+
+    def count_queries(self, name):
+        url = reverse(f'admin:{name}_changelist')
+        # Sidebar badge keshi har so'rovda bir xil holatda bo'lsin
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, (name, response.get("Location")))
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        self.create_rows(2)
+        baseline = {name: self.count_queries(name) for name in self.CHANGELISTS}
+        self.create_rows(8)
+        for name in self.CHANGELISTS:
+            with self.subTest(changelist=name):
+                self.assertEqual(self.count_queries(name), baseline[name])
+
+
+class CertificateVerificationTests(TestCase):
+    """Bazadagi raqam qanday yozilgan bo'lsa, shunday topilishi kerak"""
+
+    NUMBERS = ('plc-2025-42', 'CERT 001', 'PLC-2024-7', 'PLC-2026-0005')
+
+    def setUp(self):
+        cache.clear()
+        verification._bloom = None
+        for number in self.NUMBERS:
+            Certificate.objects.create(
+                student_name=f'Talaba {number}', certificate_image='certificates/c.jpg',
+                certificate_number=number, issue_date=datetime.date(2026, 1, 1),
+            )
+
+    def verify_page(self, number):
+        return self.client.get(reverse('certificate_verify'), {'number': number}).context['certificate']
+
+    def verify_api(self, *numbers):
+        response = self.client.post(reverse('certificate_verify_api'), {'numbers': list(numbers)},
+                                    content_type='application/json')
+        return [(row['number'], row['valid']) for row in response.json()['results']]
+
+    def test_stored_numbers_are_found_as_is(self):
+        for number in self.NUMBERS:
+            self.assertEqual(self.verify_page(number).certificate_number, number)
+            self.assertEqual(self.verify_page(f'  {number} ').certificate_number, number)
+        self.assertEqual(self.verify_api(*self.NUMBERS), [(number, True) for number in self.NUMBERS])
+
+    def test_normalized_form_is_fallback(self):
+        self.assertEqual(self.verify_page('plc 2026 5').certificate_number, 'PLC-2026-0005')
+        self.assertEqual(self.verify_api('plc–2026–5', 'PLC-2025-0042', 'CERT-002'),
+                         [('PLC-2026-0005', True), ('PLC-2025-0042', False), ('CERT-002', False)])
+
+    def test_certificate_without_image_is_queued_for_render(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            certificate = Certificate.objects.create(
+                student_name='Talaba', certificate_number='PLC-2026-0100', issue_date=datetime.date(2026, 1, 1),
+            )
+        queued = Task.objects.get(name='front.jobs.render_certificates')
+        self.assertEqual(queued.args, [[certificate.pk]])
+        self.assertFalse(Task.objects.exclude(pk=queued.pk).exists())
+
+
+class DenormCountersTests(TestCase):
+    """Hisoblagichlar signallar bilan to'g'ri yuradi va oddiy save() ularni buzmaydi"""
+
+    def setUp(self):
+        self.subject = Subject.objects.create(name='IELTS')
+        self.other = Subject.objects.create(name='Matematika')
+        self.teacher = Teacher.objects.create(
+            first_name='Ism', last_name='Familiya', photo='teachers/t.jpg', phone='1',
+            education='TSUL', experience_years=3, bio='b', full_bio='fb',
+        )
+        self.course = Course.objects.create(
+            title='Kurs', subject=self.subject, main_image='courses/c.jpg',
+            short_description='s', full_description='f', duration_months=3, price=100,
+            what_you_learn='w', target_audience='t',
+        )
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        self.assertEqual({name: getattr(obj, name) for name in expected}, expected)
+
+    def assertNoDrift(self):
+        self.assertEqual(sum(denorm.reconcile(dry_run=True).values()), 0)
+
+    def test_fk_and_m2m_counts(self):
+        self.course.teachers.add(self.teacher)
+        self.teacher.specializations.add(self.subject)
+        self.assertCounts(self.subject, active_courses_count=1, active_teachers_count=1)
+        self.assertCounts(self.teacher, active_courses_count=1)
+
+        self.course.subject = self.other
+        self.course.save()
+        self.assertCounts(self.subject, active_courses_count=0)
+        self.assertCounts(self.other, active_courses_count=1)
+
+        self.course.is_active = False
+        self.course.save()
+        self.assertCounts(self.other, active_courses_count=0)
+        self.assertCounts(self.teacher, active_courses_count=0)
+        self.assertNoDrift()
+
+        self.course.delete()
+        self.teacher.delete()
+        self.assertCounts(self.subject, active_courses_count=0, active_teachers_count=0)
+        self.assertNoDrift()
+
+    def test_stale_instance_save_keeps_counters(self):
+        self.course.teachers.add(self.teacher)
+        self.assertEqual(self.teacher.active_courses_count, 0)  # xotiradagi nusxa eskirgan
+        self.teacher.is_active = False
+        self.teacher.save()
+        self.assertCounts(self.teacher, active_courses_count=1)
+
+        subject = Subject.objects.get(pk=self.subject.pk)
+        CourseEnrollment.objects.create(full_name='Talaba', phone='1', course=self.course)
+        subject.description = 'Yangi'
+        subject.save()
+        self.assertCounts(self.subject, active_courses_count=1)
+        self.assertCounts(self.course, enrollments_count=1)
+        self.assertNoDrift()
+
+    def test_reconcile_fixes_drift(self):
+        Course.objects.filter(pk=self.course.pk).update(is_active=False)
+        self.assertEqual(denorm.reconcile(dry_run=True)[denorm.TALLIES[1]], 1)
+        denorm.reconcile()
+        self.assertCounts(self.subject, active_courses_count=0)
+        self.assertNoDrift()
+
+
+class AdminBulkActionTests(TestCase):
+    """queryset.update() li amallar sahifa keshini eskirtirishi kerak"""
+
+    def setUp(self):
+        cache.clear()
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'parol12345')
+        self.client.force_login(admin)
+
+    def test_testimonial_approve_invalidates_pages(self):
+        testimonial = Testimonial.objects.create(student_name='Talaba', comment='c')
+        before = page_cache.dependency_stamp(['front.testimonial'])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('admin:front_testimonial_changelist'), {
+                'action': 'approve', '_selected_action': [testimonial.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Testimonial.objects.get(pk=testimonial.pk).is_approved)
+        self.assertNotEqual(page_cache.dependency_stamp(['front.testimonial']), before)
+
+
+class CacheVersionTests(TestCase):
+    """Versiyalar hech qachon orqaga qaytmasligi kerak"""
+
+    def test_versions_survive_cache_clear_and_loss(self):
+        namespace = 'test_versions'
+        first = cache_layer.get_version(namespace)
+        bumped = cache_layer.bump_version(namespace)
+        self.assertGreater(bumped, first)
+
+        cache.clear()
+        self.assertEqual(cache_layer.get_version(namespace), bumped)
+
+        # Kalit yo'qolsa ham yangi versiya eskisidan katta (vaqt bo'yicha)
+        time.sleep(0.005)
+        cache_layer.versions_cache.delete(cache_layer.version_key(namespace))
+        self.assertGreater(cache_layer.get_version(namespace), bumped)
+
+
+class TaskHeartbeatTests(TestCase):
+    """Faqat heartbeat i to'xtagan vazifalar qayta navbatga qo'yiladi"""
+
+    def test_requeue_only_expired_heartbeats(self):
+        started = timezone.now() - datetime.timedelta(seconds=tasks.LOCK_TIMEOUT * 3)
+        alive, dead = (
+            Task.objects.create(name='front.jobs.test', status=Task.RUNNING, attempts=1,
+                                locked_by=worker, locked_at=started)
+            for worker in ('worker-a', 'worker-b')
+        )
+        self.assertEqual(tasks.heartbeat('worker-a', [alive.pk, dead.pk]), 1)
+        self.assertEqual(tasks.requeue_stale(), (1, 0))
+        alive.refresh_from_db()
+        dead.refresh_from_db()
+        self.assertEqual((alive.status, alive.locked_by), (Task.RUNNING, 'worker-a'))
+        self.assertEqual((dead.status, dead.locked_by), (Task.QUEUED, ''))
+
+
+class SearchIndexTests(TestCase):
+    """Indeks signallar bilan yangilanadi: saqlash, ko'rinish va o'chirish"""
+
+    def test_index_follows_saves_and_deletes(self):
+        faq = FAQ.objects.create(question="Kurslar qachon boshlanadi?", answer="Har oy o'rtasida")
+        self.assertEqual(search.ranked(FAQ, 'boshlanadi'), [faq])
+        self.assertEqual(list(search.filter_queryset(FAQ.objects.all(), "o'rtasida")), [faq])
+
+        faq.question = 'Narxlar qanday?'
+        faq.save()
+        self.assertEqual(search.ranked(FAQ, 'boshlanadi'), [])
+        self.assertEqual(search.ranked(FAQ, 'narx'), [faq])
+
+        faq.is_active = False
+        faq.save()
+        self.assertEqual(search.ranked(FAQ, 'narx'), [])
+        self.assertEqual(list(search.filter_queryset(FAQ.objects.all(), 'narx')), [faq])
+
+        search.index_objects([faq, faq])
+        faq.delete()
+        self.assertEqual(list(search.filter_queryset(FAQ.objects.all(), 'narx')), [])
+        with connection.cursor() as c:
+            c.execute(f'SELECT COUNT(*) FROM {search.table_for("front.faq")}')
+            self.assertEqual(c.fetchone()[0], 0)
+
+
+class ConditionalPageTests(TestCase):
+    """304 faqat shu CSRF siri bilan yaratilgan sahifaga"""
+
+    def test_csrf_secret_changes_etag(self):
+        cache.clear()
+        subject = Subject.objects.create(name='IELTS')
+        course = Course.objects.create(
+            title='Kurs', subject=subject, main_image='courses/c.jpg', short_description='s',
+            full_description='f', duration_months=3, price=100, what_you_learn='w', target_audience='t',
+        )
+        url = course.get_absolute_url()
+        self.client.cookies['csrftoken'] = 'a' * 32
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+        self.client.cookies['csrftoken'] = 'b' * 32
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since_without_updated_at(self):
+        """FAQ da updated_at yo'q - faqat If-Modified-Since bilan eskirgan 304 berilmaydi"""
+        cache.clear()
+        url = reverse('faq')
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        since = http_date(time.time() + 60)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.create(category=FAQCategory.objects.create(name='Umumiy'), question='Savol?', answer='Javob')
+        response = self.client.get(url, headers={'If-Modified-Since': since})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Savol?')
+
+    def test_last_modified_with_updated_at(self):
+        cache.clear()
+        News.objects.create(title='Yangilik', main_image='news/n.jpg', short_description='s', content='c')
+        response = self.client.get(reverse('news_list'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+
+class ThumbnailTests(TestCase):
+    """Faqat o'zimiz yasagan thumbnail yangilanadi; qo'lda yuklangani saqlanadi"""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.subject = Subject.objects.create(name='IELTS')
+
+    def image(self, name):
+        buffer = io.BytesIO()
+        Image.new('RGB', (1200, 800), 'teal').save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def create_course(self, **fields):
+        return Course.objects.create(
+            title='Kurs', subject=self.subject, main_image=self.image('asosiy.png'), short_description='s',
+            full_description='f', duration_months=3, price=100, what_you_learn='w', target_audience='t', **fields,
+        )
+
+    def test_generated_thumbnail_follows_main_image(self):
+        course = Course.objects.get(pk=self.create_course().pk)
+        old = course.thumbnail.name
+        self.assertTrue(images.is_generated_thumbnail(old))
+
+        course.main_image = self.image('yangi.png')
+        course.save()
+        course.refresh_from_db()
+        self.assertTrue(posixpath.basename(course.thumbnail.name).startswith('yangi-thumb'))
+        self.assertFalse(course.thumbnail.storage.exists(old))
+
+    def test_manual_thumbnail_is_kept(self):
+        course = Course.objects.get(pk=self.create_course(thumbnail=self.image('qolda.png')).pk)
+        manual = course.thumbnail.name
+        course.main_image = self.image('yangi.png')
+        course.save()
+        course.refresh_from_db()
+        self.assertEqual(course.thumbnail.name, manual)
+        self.assertTrue(course.thumbnail.storage.exists(manual))
+
+
+class MediaServeTests(TestCase):
+    """Yopiq fayllar faqat ruxsati borlarga; Range va ETag to'g'ri ishlaydi"""
+
+    BODY = b'0123456789' * 10
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        media = posixpath.join(root, 'media')
+        os.makedirs(posixpath.join(media, 'teacher_applications'))
+        for name in ('media/public.txt', 'media/teacher_applications/cv.txt', 'secret.txt'):
+            with open(posixpath.join(root, name), 'wb') as fh:
+                fh.write(self.BODY)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def url(self, name):
+        return reverse('media', args=[name])
+
+    def staff(self, *permissions):
+        user = get_user_model().objects.create_user(f'xodim{len(permissions)}', password='parol12345', is_staff=True)
+        user.user_permissions.set(Permission.objects.filter(codename__in=permissions))
+        self.client.force_login(user)
+
+    def test_private_file_needs_permission(self):
+        private = self.url('teacher_applications/cv.txt')
+        self.assertEqual(self.client.get(private).status_code, 404)
+        self.staff()
+        self.assertEqual(self.client.get(private).status_code, 404)
+        self.staff('view_teacherapplication')
+        response = self.client.get(private)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.BODY)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_traversal_is_404(self):
+        for name in ('../secret.txt', 'teacher_applications/../../secret.txt', 'public/../../secret.txt'):
+            self.assertEqual(self.client.get('/media/' + name).status_code, 404, name)
+        self.assertEqual(self.client.get(self.url('public.txt')).status_code, 200)
+
+    def test_range_and_etag(self):
+        url = self.url('public.txt')
+        response = self.client.get(url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(b''.join(response.streaming_content), self.BODY[10:20])
+
+        response = self.client.get(url, headers={'Range': 'bytes=-5'})
+        self.assertEqual((response.status_code, b''.join(response.streaming_content)), (206, self.BODY[-5:]))
+
+        response = self.client.get(url, headers={'Range': 'bytes=100-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        # Fayl o'zgargan - If-Range mos kelmaydi, butun fayl
+        response = self.client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': '"eski"'})
+        self.assertEqual(response.status_code, 200)
+
+
+class CursorPaginationTests(TestCase):
+    """Kursor takroriy va NULL qiymatlarda qator yo'qotmaydi; yaroqsiz kursor - birinchi sahifa"""
+
+    SCORES = (None, 80, 80, 90, None, 80, 100, None, 90, 80, 110)
+
+    def setUp(self):
+        for index, score in enumerate(self.SCORES):
+            Teacher.objects.create(
+                first_name=f'Ism{index}', last_name='Familiya', photo='teachers/t.jpg', phone=str(index),
+                education='TSUL', experience_years=3, bio='b', full_bio='fb', toefl_score=score,
+            )
+
+    def walk(self, ordering):
+        paginator = pagination.CursorPaginator(Teacher.objects.order_by(ordering), 3)
+        pages = [paginator.get_page()]
+        while pages[-1].has_next:
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        forward = [[t.pk for t in page] for page in pages]
+
+        backward = [[t.pk for t in pages[-1]]]
+        page = pages[-1]
+        while page.has_previous:
+            page = paginator.get_page(page.previous_cursor)
+            backward.insert(0, [t.pk for t in page])
+        return forward, backward
+
+    def test_round_trip_over_duplicates_and_nulls(self):
+        for ordering in ('toefl_score', '-toefl_score'):
+            expected = list(Teacher.objects.order_by(ordering, 'pk').values_list('pk', flat=True))
+            forward, backward = self.walk(ordering)
+            self.assertEqual(sum(forward, []), expected, ordering)
+            self.assertEqual(backward, forward, ordering)
+
+    def test_invalid_cursor_is_first_page(self):
+        paginator = pagination.CursorPaginator(Teacher.objects.order_by('-toefl_score'), 3)
+        first = [t.pk for t in paginator.get_page()]
+        for cursor in (
+            'garbage',
+            signing.dumps(['n', [90, 1]], salt='boshqa'),
+            pagination.encode_cursor('n', ['yuz', 1]),
+            pagination.encode_cursor('n', [90]),
+            pagination.encode_cursor('x', [90, 1]),
+        ):
+            page = paginator.get_page(cursor)
+            self.assertEqual([t.pk for t in page], first, cursor)
+            self.assertFalse(page.has_previous)
+
+    def test_courses_list_sort_whitelist(self):
+        cache.clear()
+        subject = Subject.objects.create(name='IELTS')
+        for title, price in (('B', 300), ('A', 100), ('C', 200)):
+            Course.objects.create(
+                title=title, subject=subject, main_image='courses/c.jpg', short_description='s',
+                full_description='f', duration_months=3, price=price, what_you_learn='w', target_audience='t',
+            )
+        url = reverse('courses_list')
+        titles = lambda response: [course.title for course in response.context['courses']]
+        self.assertEqual(titles(self.client.get(url, {'sort': 'price'})), ['A', 'C', 'B'])
+        newest = titles(self.client.get(url))
+        self.assertEqual(newest, ['C', 'A', 'B'])
+        for sort in ('subject__name', 'views_count', '?', 'price; DROP TABLE'):
+            response = self.client.get(url, {'sort': sort, 'cursor': 'garbage'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(titles(response), newest, sort)
@@ -35,6 +35,7 @@ urlpatterns = [
     # Certificates
     path('sertifikatlar/', views.certificates, name='certificates'),
     path('sertifikat-tekshirish/', views.certificate_verify, name='certificate_verify'),
+    path('api/sertifikat-tekshirish/', views.certificate_verify_api, name='certificate_verify_api'),
     
     # Search
     path('qidiruv/', views.search, name='search'),
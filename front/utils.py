@@ -3,54 +3,77 @@ PolyglotLC - Utility Functions
 Admin panel badges va boshqa yordamchi funksiyalar
 """
 
+BADGE_CACHE_KEY = 'admin_badges'
+BADGE_CACHE_TIMEOUT = 30  # soniya
+
+
+def _badge_querysets():
+    from front.models import Course, CourseEnrollment, TeacherApplication, Contact
+    return {
+        'courses': Course.objects.filter(is_active=True),
+        'pending_enrollments': CourseEnrollment.objects.filter(status='pending'),
+        'pending_applications': TeacherApplication.objects.filter(status='pending'),
+        'new_messages': Contact.objects.filter(status='new'),
+    }
+
+
+def get_badge_counts(request=None):
+    """Barcha sidebar badge sonlari - bitta SQL so'rov, qisqa muddatli kesh"""
+    from django.core.cache import cache
+    from django.db import connection
+
+    counts = getattr(request, '_admin_badges', None)
+    if counts is not None:
+        return counts
+
+    counts = cache.get(BADGE_CACHE_KEY)
+    if counts is None:
+        querysets = _badge_querysets()
+        parts, params = [], []
+        for qs in querysets.values():
+            sql, qs_params = qs.order_by().values('pk').query.sql_with_params()
+            parts.append(f'(SELECT COUNT(*) FROM ({sql}) AS sub)')
+            params.extend(qs_params)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {", ".join(parts)}', params)
+            counts = dict(zip(querysets, cursor.fetchone()))
+        cache.set(BADGE_CACHE_KEY, counts, BADGE_CACHE_TIMEOUT)
+
+    if request is not None:
+        request._admin_badges = counts
+    return counts
+
+
+def invalidate_badge_counts():
+    """Badge keshini tozalaydi (ariza/xabar o'zgarganda)"""
+    from django.core.cache import cache
+    cache.delete(BADGE_CACHE_KEY)
+
+
 def get_courses_count(request):
     """Faol kurslar sonini qaytaradi"""
-    from front.models import Course
-    count = Course.objects.filter(is_active=True).count()
-    return count if count > 0 else None
+    return get_badge_counts(request)['courses'] or None
 
 
 def get_pending_enrollments(request):
     """Kutilayotgan ro'yxatdan o'tishlar sonini qaytaradi"""
-    from front.models import CourseEnrollment
-    count = CourseEnrollment.objects.filter(status='pending').count()
-    return count if count > 0 else None
+    return get_badge_counts(request)['pending_enrollments'] or None
 
 
 def get_pending_applications(request):
     """Kutilayotgan o'qituvchi arizalari sonini qaytaradi"""
-    from front.models import TeacherApplication
-    count = TeacherApplication.objects.filter(status='pending').count()
-    return count if count > 0 else None
+    return get_badge_counts(request)['pending_applications'] or None
 
 
 def get_new_messages(request):
     """Yangi xabarlar sonini qaytaradi"""
-    from front.models import Contact
-    count = Contact.objects.filter(status='new').count()
-    return count if count > 0 else None
+    return get_badge_counts(request)['new_messages'] or None
 
 
 def generate_certificate_number():
-    """Yangi sertifikat raqamini generatsiya qiladi"""
-    import datetime
-    from front.models import Certificate
-    
-    year = datetime.date.today().year
-    last_cert = Certificate.objects.filter(
-        certificate_number__startswith=f'PLC-{year}'
-    ).order_by('-certificate_number').first()
-    
-    if last_cert:
-        try:
-            last_num = int(last_cert.certificate_number.split('-')[-1])
-            new_num = last_num + 1
-        except:
-            new_num = 1
-    else:
-        new_num = 1
-    
-    return f'PLC-{year}-{new_num:04d}'
+    """Yangi sertifikat raqamini generatsiya qiladi (front.sequences dan band qilinadi)"""
+    from front.sequences import next_number
+    return next_number()
 
 
 def format_phone_number(phone):
@@ -68,12 +91,5 @@ def format_phone_number(phone):
 
 def get_site_settings():
     """Sayt sozlamalarini oladi (cached)"""
-    from django.core.cache import cache
-    from front.models import SiteSettings
-    
-    settings = cache.get('site_settings')
-    if not settings:
-        settings = SiteSettings.objects.first()
-        if settings:
-            cache.set('site_settings', settings, 3600)  # 1 soat cache
-    return settings
\ No newline at end of file
+    from front.cache import get_site_settings as cached_site_settings
+    return cached_site_settings()
@@ -0,0 +1,172 @@
+"""
+PolyglotLC - Sertifikatlarni tekshirish
+HTML sahifa (certificate_verify) va JSON API bitta qidiruvdan foydalanadi.
+certificate_number erkin matn - avval kiritilgan qiymat aynan (bo'shliqlarsiz)
+qidiriladi, keyin normallashtirilgan PLC-YYYY-NNNN shakli (zaxira). Bazadagi
+raqamlar o'zgartirilmagan holda Bloom filtrida turadi - tasodifiy/terib ko'rilgan
+raqamlar bazaga umuman tushmaydi. Topilganlar keshlanadi, qolganlari bitta IN so'rov.
+
+Keshlar sahifa keshi versiyalariga bog'langan (front.certificate, front.course,
+front.teacher): signal, ommaviy import yoki rasm yaratish ularni eskirtiradi.
+"""
+import hashlib
+import math
+import re
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import versioned_key
+from .page_cache import dependency_stamp
+from .sequences import format_number, parse_number
+
+MAX_BATCH = getattr(settings, 'CERTIFICATE_VERIFY_MAX_BATCH', 500)
+TIMEOUT = getattr(settings, 'CERTIFICATE_VERIFY_TIMEOUT', 3600)
+ERROR_RATE = 0.001
+# SQLite ning eski versiyalarida so'rovdagi parametrlar chegarasi 999
+LOOKUP_CHUNK = 900
+DEPENDS_ON = ('front.certificate', 'front.course', 'front.teacher')
+
+_DASHES = str.maketrans(dict.fromkeys('‐‑‒–—−_/', '-'))
+
+_bloom = None
+_bloom_lock = threading.Lock()
+
+
+# ==================== NORMALLASHTIRISH ====================
+def normalize(number):
+    """' plc–2026 42 ' -> 'PLC-2026-0042'. Yaroqsiz kiritish - bo'sh satr."""
+    number = str(number or '').strip().upper().translate(_DASHES)
+    number = re.sub(r'-+', '-', re.sub(r'\s+', '-', number))
+    if len(number) > 50:
+        return ''
+    parsed = parse_number(number)
+    return format_number(*parsed) if parsed else number
+
+
+def candidates(number):
+    """Qidiriladigan shakllar afzallik tartibida: kiritilgani, keyin normallashtirilgani"""
+    raw = str(number or '').strip()
+    if not raw or len(raw) > 50:
+        return []
+    return list(dict.fromkeys(filter(None, (raw, normalize(raw)))))
+
+
+# ==================== BLOOM FILTR ====================
+class BloomFilter:
+    """Bitlar massivi + k ta xesh (blake2b dan ikki karrali xeshlash)"""
+
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        capacity = max(capacity, 1000)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def build_filter():
+    Certificate = apps.get_model('front', 'Certificate')
+    numbers = Certificate.objects.values_list('certificate_number', flat=True)
+    bloom = BloomFilter(numbers.count())
+    for number in numbers.iterator(chunk_size=5000):
+        bloom.add(number)
+    return bloom
+
+
+def _filter(version):
+    """Filtr jarayon ichida (L1) va cache da (L2) saqlanadi, versiya o'zgarsa qayta quriladi"""
+    global _bloom
+    cached = _bloom
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    key = versioned_key('cert_bloom', version, 'raw')
+    bloom = cache.get(key)
+    if bloom is None:
+        bloom = build_filter()
+        cache.set(key, bloom, None)
+    with _bloom_lock:
+        _bloom = (version, bloom)
+    return bloom
+
+
+def probable(number):
+    """Bloom filtridan o'tgan shakllar; bo'sh ro'yxat - raqam aniq yo'q (bazaga so'rov kerak emas)"""
+    forms = candidates(number)
+    if not forms:
+        return []
+    bloom = _filter(dependency_stamp(DEPENDS_ON[:1]))
+    return [form for form in forms if form in bloom]
+
+
+# ==================== QIDIRUV ====================
+def _payload(row):
+    Certificate = apps.get_model('front', 'Certificate')
+    image = row['certificate_image']
+    teacher = ' '.join(filter(None, (row['teacher__first_name'], row['teacher__last_name'])))
+    return {
+        'number': row['certificate_number'],
+        'student_name': row['student_name'],
+        'course': row['course__title'],
+        'teacher': teacher or None,
+        'score': row['score'],
+        'issue_date': row['issue_date'].isoformat() if row['issue_date'] else None,
+        'image': Certificate._meta.get_field('certificate_image').storage.url(image) if image else None,
+    }
+
+
+def _load(numbers):
+    Certificate = apps.get_model('front', 'Certificate')
+    found = {}
+    queryset = Certificate.objects.order_by().values(
+        'certificate_number', 'student_name', 'course__title', 'teacher__first_name',
+        'teacher__last_name', 'score', 'issue_date', 'certificate_image',
+    )
+    for start in range(0, len(numbers), LOOKUP_CHUNK):
+        for row in queryset.filter(certificate_number__in=numbers[start:start + LOOKUP_CHUNK]):
+            found[row['certificate_number']] = _payload(row)
+    return found
+
+
+def _cache_key(stamp, number):
+    # Bazadagi raqamda bo'shliq va boshqa belgilar bo'lishi mumkin - kalitga xeshi
+    return versioned_key('cert', stamp, hashlib.md5(number.encode(), usedforsecurity=False).hexdigest())
+
+
+def verify_many(numbers):
+    """
+    [(kiritilgan, topilgan yoki normallashtirilgan raqam, ma'lumot yoki None)] - kiritilgan tartibda.
+    Bloom filtr -> cache.get_many -> bitta IN so'rov (faqat keshda yo'qlari uchun).
+    Filtrdan o'tib bazada topilmagan raqamlar ham (False) keshlanadi.
+    """
+    forms = [candidates(number) for number in numbers]
+    stamp = dependency_stamp(DEPENDS_ON)
+    bloom = _filter(stamp.split('.')[0])
+    lookup = list(dict.fromkeys(form for group in forms for form in group if form in bloom))
+
+    keys = {_cache_key(stamp, number): number for number in lookup}
+    cached = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    missing = [number for number in lookup if number not in cached]
+    if missing:
+        loaded = _load(missing)
+        fresh = {number: loaded.get(number, False) for number in missing}
+        cache.set_many({_cache_key(stamp, n): value for n, value in fresh.items()}, TIMEOUT)
+        cached.update(fresh)
+
+    results = []
+    for raw, group in zip(numbers, forms):
+        found = next((form for form in group if cached.get(form)), None)
+        results.append((raw, found or (group[-1] if group else ''), cached[found] if found else None))
+    return results
@@ -1,14 +1,29 @@
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
-from django.db.models import Q
 from .models import *
+from .cache import get_site_settings
+from . import aio, counters, denorm, jobs, verification
+from . import search as search_index
+from .conditional import conditional_page
+from .page_cache import cache_page
+from .pagination import CursorPaginator
+from .tasks import stage_upload
+
+# courses_list uchun ruxsat etilgan saralashlar (kursor faqat model maydonlari bilan ishlaydi)
+COURSE_SORTS = ('-created_at', 'created_at', 'price', '-price', 'title', '-title')
 
 
 # ==================== HOME ====================
-def home(request):
-    """Bosh sahifa"""
-    context = {
+@cache_page('front.course', 'front.teacher', 'front.subject', 'front.testimonial', 'front.news')
+async def home(request):
+    """Bosh sahifa (ASYNC_FANOUT da bloklar bir vaqtda yuklanadi - aio.gather)"""
+    context = await aio.gather({
         'popular_courses': Course.objects.filter(
             is_active=True, 
             is_popular=True
@@ -22,18 +37,20 @@ def home(request):
         'testimonials': Testimonial.objects.filter(
             is_approved=True, 
             is_featured=True
-        )[:6],
+        ).select_related('course')[:6],
         
         'latest_news': News.objects.filter(
             is_published=True
         ).order_by('-publish_date')[:3],
         
-        'settings': SiteSettings.load(),
-    }
-    return render(request, 'index.html', context)
+        'settings': get_site_settings,
+    })
+    return await aio.render(request, 'index.html', context)
 
 
 # ==================== COURSES ====================
+@conditional_page('front.course', 'front.subject', 'front.teacher')
+@cache_page('front.course', 'front.subject', 'front.teacher')
 def courses_list(request):
     """Barcha kurslar"""
     courses = Course.objects.filter(is_active=True).select_related('subject').prefetch_related('teachers')
@@ -41,11 +58,7 @@ def courses_list(request):
     # Search
     search = request.GET.get('search', '')
     if search:
-        courses = courses.filter(
-            Q(title__icontains=search) | 
-            Q(short_description__icontains=search) |
-            Q(full_description__icontains=search)
-        )
+        courses = search_index.filter_queryset(courses, search)
     
     # Filter by subject
     subject_slug = request.GET.get('subject', '')
@@ -59,12 +72,13 @@ def courses_list(request):
     
     # Sorting
     sort = request.GET.get('sort', '-created_at')
+    if sort not in COURSE_SORTS:
+        sort = '-created_at'
     courses = courses.order_by(sort)
     
     # Pagination
-    paginator = Paginator(courses, 12)
-    page = request.GET.get('page')
-    courses = paginator.get_page(page)
+    paginator = CursorPaginator(courses, 12, count='cached')
+    courses = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'courses': courses,
@@ -72,11 +86,16 @@ def courses_list(request):
         'search': search,
         'selected_subject': subject_slug,
         'selected_level': level,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'courses_list.html', context)
 
 
+@conditional_page(
+    'front.course', 'front.subject', 'front.teacher', 'front.testimonial',
+    lookup=lambda slug: Course.objects.filter(slug=slug, is_active=True),
+    on_not_modified=lambda pk: counters.increment(Course(pk=pk), 'views_count'),
+)
 def course_detail(request, slug):
     """Kurs detallari"""
     course = get_object_or_404(
@@ -86,8 +105,8 @@ def course_detail(request, slug):
     )
     
     # Views count
-    course.views_count += 1
-    course.save(update_fields=['views_count'])
+    counters.increment(course, 'views_count')
+    course.views_count = counters.get_count(course, 'views_count')
     
     # Related courses
     related_courses = Course.objects.filter(
@@ -105,7 +124,7 @@ def course_detail(request, slug):
         'course': course,
         'related_courses': related_courses,
         'testimonials': testimonials,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'course_detail.html', context)
 
@@ -129,9 +148,7 @@ def course_enroll(request, slug):
             message=message
         )
         
-        # Update course enrollments count
-        course.enrollments_count += 1
-        course.save(update_fields=['enrollments_count'])
+        # enrollments_count ni front.denorm signal orqali F() bilan oshiradi
         
         messages.success(request, 'Arizangiz qabul qilindi! Tez orada siz bilan bog\'lanamiz.')
         return redirect('course_detail', slug=course.slug)
@@ -140,6 +157,8 @@ def course_enroll(request, slug):
 
 
 # ==================== TEACHERS ====================
+@conditional_page('front.teacher', 'front.subject')
+@cache_page('front.teacher', 'front.subject')
 def teachers_list(request):
     """Barcha o'qituvchilar"""
     teachers = Teacher.objects.filter(is_active=True).prefetch_related('specializations')
@@ -147,11 +166,7 @@ def teachers_list(request):
     # Search
     search = request.GET.get('search', '')
     if search:
-        teachers = teachers.filter(
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(education__icontains=search)
-        )
+        teachers = search_index.filter_queryset(teachers, search)
     
     # Filter by specialization
     subject_slug = request.GET.get('subject', '')
@@ -168,11 +183,15 @@ def teachers_list(request):
         'subjects': Subject.objects.filter(is_active=True),
         'search': search,
         'selected_subject': subject_slug,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'teachers_list.html', context)
 
 
+@conditional_page(
+    'front.teacher', 'front.course', 'front.subject',
+    lookup=lambda slug: Teacher.objects.filter(slug=slug, is_active=True),
+)
 def teacher_detail(request, slug):
     """O'qituvchi detallari"""
     teacher = get_object_or_404(
@@ -190,7 +209,7 @@ def teacher_detail(request, slug):
     context = {
         'teacher': teacher,
         'courses': courses,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'teacher_detail.html', context)
 
@@ -222,24 +241,21 @@ def teacher_apply(request):
             why_teach=why_teach
         )
         
-        # Handle file uploads
-        if 'cv_file' in request.FILES:
-            application.cv_file = request.FILES['cv_file']
-        
-        if 'certificates' in request.FILES:
-            application.certificates = request.FILES['certificates']
-        
-        if 'photo' in request.FILES:
-            application.photo = request.FILES['photo']
-        
-        application.save()
+        # Handle file uploads - fayllar staging ga ko'chiriladi, storage ga worker saqlaydi
+        files = {
+            field: stage_upload(request.FILES[field])
+            for field in ('cv_file', 'certificates', 'photo')
+            if field in request.FILES
+        }
+        if files:
+            jobs.attach_application_files.delay(application.pk, files)
         
         messages.success(request, 'Arizangiz muvaffaqiyatli yuborildi! Tez orada siz bilan bog\'lanamiz.')
         return redirect('teacher_apply_success')
     
     context = {
         'subjects': Subject.objects.filter(is_active=True),
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'teacher_apply.html', context)
 
@@ -247,29 +263,25 @@ def teacher_apply(request):
 def teacher_apply_success(request):
     """Ariza muvaffaqiyatli yuborildi"""
     context = {
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'teacher_apply_success.html', context)
 
 
 # ==================== NEWS ====================
+@conditional_page('front.news')
 def news_list(request):
     """Barcha yangiliklar"""
-    news = News.objects.filter(is_published=True).order_by('-publish_date')
+    news = News.objects.filter(is_published=True).order_by('-publish_date', '-created_at')
     
     # Search
     search = request.GET.get('search', '')
     if search:
-        news = news.filter(
-            Q(title__icontains=search) |
-            Q(short_description__icontains=search) |
-            Q(content__icontains=search)
-        )
+        news = search_index.filter_queryset(news, search)
     
     # Pagination
-    paginator = Paginator(news, 9)
-    page = request.GET.get('page')
-    news = paginator.get_page(page)
+    paginator = CursorPaginator(news, 9, count='cached')
+    news = paginator.get_page(request.GET.get('cursor'))
     
     # Featured news
     featured_news = News.objects.filter(
@@ -281,11 +293,16 @@ def news_list(request):
         'news': news,
         'featured_news': featured_news,
         'search': search,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'news_list.html', context)
 
 
+@conditional_page(
+    'front.news', 'front.newsgalleryimage',
+    lookup=lambda slug: News.objects.filter(slug=slug, is_published=True),
+    on_not_modified=lambda pk: counters.increment(News(pk=pk), 'views_count'),
+)
 def news_detail(request, slug):
     """Yangilik detallari"""
     news = get_object_or_404(
@@ -295,8 +312,8 @@ def news_detail(request, slug):
     )
     
     # Views count
-    news.views_count += 1
-    news.save(update_fields=['views_count'])
+    counters.increment(news, 'views_count')
+    news.views_count = counters.get_count(news, 'views_count')
     
     # Related news
     related_news = News.objects.filter(
@@ -306,12 +323,14 @@ def news_detail(request, slug):
     context = {
         'news': news,
         'related_news': related_news,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'news_detail.html', context)
 
 
 # ==================== GALLERY ====================
+@conditional_page('front.gallery', 'front.gallerycategory')
+@cache_page('front.gallery', 'front.gallerycategory')
 def gallery(request):
     """Galereya"""
     images = Gallery.objects.select_related('category').order_by('-created_at')
@@ -322,33 +341,35 @@ def gallery(request):
         images = images.filter(category__slug=category_slug)
     
     # Pagination
-    paginator = Paginator(images, 24)
-    page = request.GET.get('page')
-    images = paginator.get_page(page)
+    paginator = CursorPaginator(images, 24, count='estimate')
+    images = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'images': images,
         'categories': GalleryCategory.objects.all(),
         'selected_category': category_slug,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'gallery.html', context)
 
 
 # ==================== ABOUT ====================
-def about(request):
+@cache_page('front.teacher', 'front.course', 'front.testimonial')
+async def about(request):
     """Biz haqimizda"""
-    context = {
-        'teachers_count': Teacher.objects.filter(is_active=True).count(),
-        'courses_count': Course.objects.filter(is_active=True).count(),
-        'students_count': 500,  # or from settings
+    context = await aio.gather({
+        'counters': denorm.aget_counters('active_teachers', 'active_courses'),
         'testimonials': Testimonial.objects.filter(
             is_approved=True,
             is_featured=True
-        )[:4],
-        'settings': SiteSettings.load(),
-    }
-    return render(request, 'about.html', context)
+        ).select_related('course')[:4],
+        'settings': get_site_settings,
+    })
+    counts = context.pop('counters')
+    context['teachers_count'] = counts['active_teachers']
+    context['courses_count'] = counts['active_courses']
+    context['students_count'] = 500  # or from settings
+    return await aio.render(request, 'about.html', context)
 
 
 # ==================== CONTACT ====================
@@ -375,12 +396,14 @@ def contact(request):
         return redirect('contact')
     
     context = {
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'contact.html', context)
 
 
 # ==================== FAQ ====================
+@conditional_page('front.faq', 'front.faqcategory')
+@cache_page('front.faq', 'front.faqcategory')
 def faq(request):
     """FAQ sahifasi"""
     faqs = FAQ.objects.filter(is_active=True).select_related('category')
@@ -391,12 +414,13 @@ def faq(request):
     context = {
         'faqs': faqs,
         'categories': categories,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'faq.html', context)
 
 
 # ==================== CERTIFICATES ====================
+@conditional_page('front.certificate', 'front.course', 'front.teacher')
 def certificates(request):
     """Sertifikatlar"""
     certificates = Certificate.objects.select_related(
@@ -411,21 +435,17 @@ def certificates(request):
     # Search by name or certificate number
     search = request.GET.get('search', '')
     if search:
-        certificates = certificates.filter(
-            Q(student_name__icontains=search) |
-            Q(certificate_number__icontains=search)
-        )
+        certificates = search_index.filter_queryset(certificates, search)
     
     # Pagination
-    paginator = Paginator(certificates, 12)
-    page = request.GET.get('page')
-    certificates = paginator.get_page(page)
+    paginator = CursorPaginator(certificates, 12, count='estimate')
+    certificates = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'certificates': certificates,
         'courses': Course.objects.filter(is_active=True),
         'search': search,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'certificates.html', context)
 
@@ -434,56 +454,78 @@ def certificate_verify(request):
     """Sertifikat tekshirish"""
     certificate = None
     
-    if request.method == 'POST':
-        certificate_number = request.POST.get('certificate_number')
-        try:
-            certificate = Certificate.objects.get(certificate_number=certificate_number)
-        except Certificate.DoesNotExist:
+    # GET ?number= - sertifikatdagi QR kod shu manzilga olib keladi
+    raw = request.POST.get('certificate_number') if request.method == 'POST' else request.GET.get('number')
+    if raw:
+        # Bloom filtrda yo'q raqam bazaga so'ralmaydi; aynan kiritilgani normallashtirilganidan oldin
+        numbers = verification.probable(raw)
+        if numbers:
+            found = {c.certificate_number: c for c in Certificate.objects.select_related('course', 'teacher').filter(
+                certificate_number__in=numbers)}
+            certificate = next((found[number] for number in numbers if number in found), None)
+        if certificate is None:
             messages.error(request, 'Sertifikat topilmadi!')
     
     context = {
         'certificate': certificate,
-        'settings': SiteSettings.load(),
+        'settings': get_site_settings(),
     }
     return render(request, 'certificate_verify.html', context)
 
 
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def certificate_verify_api(request):
+    """
+    Sertifikatlarni JSON orqali tekshirish (tashkilotlar uchun).
+    GET ?number=A&number=B yoki ?numbers=A,B; POST {"numbers": [...]}
+    """
+    if request.method == 'POST':
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': "Noto'g'ri JSON"}, status=400)
+        numbers = payload.get('numbers') if isinstance(payload, dict) else payload
+    else:
+        numbers = request.GET.getlist('number') + [
+            number for value in request.GET.getlist('numbers') for number in value.split(',')
+        ]
+
+    if not isinstance(numbers, list) or not numbers:
+        return JsonResponse({'error': 'Sertifikat raqamlari berilmagan'}, status=400)
+    if len(numbers) > verification.MAX_BATCH:
+        return JsonResponse({'error': f'Bir so\'rovda ko\'pi bilan {verification.MAX_BATCH} ta raqam'}, status=400)
+
+    results = [
+        {'query': str(raw), 'number': number, 'valid': data is not None, 'certificate': data}
+        for raw, number, data in verification.verify_many(numbers)
+    ]
+    return JsonResponse({'count': len(results), 'valid': sum(r['valid'] for r in results), 'results': results})
+
+
 # ==================== SEARCH ====================
 def search(request):
     """Global qidiruv"""
     query = request.GET.get('q', '')
     
     if query:
-        # Search in courses
-        courses = Course.objects.filter(
-            Q(title__icontains=query) |
-            Q(short_description__icontains=query),
-            is_active=True
-        )[:5]
-        
-        # Search in teachers
-        teachers = Teacher.objects.filter(
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query),
-            is_active=True
-        )[:5]
-        
-        # Search in news
-        news = News.objects.filter(
-            Q(title__icontains=query) |
-            Q(short_description__icontains=query),
-            is_published=True
-        )[:5]
+        # Ranked full-text search (FTS5)
+        courses = search_index.ranked(Course, query, 5)
+        teachers = search_index.ranked(Teacher, query, 5)
+        news = search_index.ranked(News, query, 5)
+        faqs = search_index.ranked(FAQ, query, 5)
     else:
         courses = []
         teachers = []
         news = []
+        faqs = []
     
     context = {
         'query': query,
         'courses': courses,
         'teachers': teachers,
         'news': news,
-        'settings': SiteSettings.load(),
+        'faqs': faqs,
+        'settings': get_site_settings(),
     }
     return render(request, 'search.html', context)
\ No newline at end of file
@@ -455,7 +455,7 @@ function initGalleryLightbox() {
             lightbox.innerHTML = `
                 <div class="lightbox-backdrop"></div>
                 <div class="lightbox-content">
-                    <img src="${img.src}" alt="${img.alt || ''}">
+                    <img src="${img.dataset.full || img.src}" alt="${img.alt || ''}">
                     <button class="lightbox-close"><i class="fas fa-times"></i></button>
                 </div>
             `;